@@ -0,0 +1,7 @@
+import os
+import sys
+
+# vulcain is a namespace package imported from the python directory, like in the DCCs.
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PYTHON_DIR not in sys.path:
+    sys.path.insert(0, PYTHON_DIR)
@@ -0,0 +1,32 @@
+from vulcain.procedure.shared import Procedure
+
+
+class NoOpProcedure(Procedure):
+    """Procedure doing nothing, the tests override the phases they need."""
+
+    def pre_check(self):
+        pass
+
+    def check(self):
+        pass
+
+    def post_check(self):
+        pass
+
+    def pre_execute(self):
+        pass
+
+    def execute(self):
+        pass
+
+    def post_execute(self):
+        pass
+
+    def pre_revert(self):
+        pass
+
+    def revert(self):
+        pass
+
+    def post_revert(self):
+        pass
@@ -0,0 +1,87 @@
+import asyncio
+
+from vulcain.context import VulcainContext
+from vulcain.procedure.shared import ProcedureContext, ProcedureStatus
+
+from procedures import NoOpProcedure
+
+
+class SleepProcedure(NoOpProcedure):
+    reverted = False
+
+    async def execute(self):
+        await asyncio.sleep(self.context.input_args["sleep"])
+        self.context.return_value = "done"
+
+    def revert(self):
+        self.reverted = True
+
+
+class TimedSleepProcedure(SleepProcedure):
+    phase_timeouts = {"execute": 0.05}
+
+
+def make_context(sleep):
+    return ProcedureContext(VulcainContext("shots", shot="sh010"), input_args={"sleep": sleep})
+
+
+def test_arun_awaits_coroutine_phases():
+    procedure = SleepProcedure(make_context(0.0))
+    assert asyncio.run(procedure.alaunch()) == "done"
+    assert procedure.status == ProcedureStatus.SUCCESS
+
+
+def test_phase_timeout_fails_and_reverts():
+    procedure = TimedSleepProcedure(make_context(1.0))
+    asyncio.run(procedure.alaunch())
+
+    assert procedure.status == ProcedureStatus.EXECUTE_FAIL
+    assert procedure.reverted
+
+
+def test_timeouts_argument_overrides_class_ones():
+    procedure = TimedSleepProcedure(make_context(0.1))
+    asyncio.run(procedure.alaunch(timeouts={"execute": 5.0}))
+    assert procedure.status == ProcedureStatus.SUCCESS
+
+
+def test_phase_timeouts_are_not_shared():
+    assert SleepProcedure.phase_timeouts is None
+    assert TimedSleepProcedure.phase_timeouts == {"execute": 0.05}
+
+
+def test_cancel_reverts():
+    async def cancel():
+        procedure = SleepProcedure(make_context(5.0))
+        task = asyncio.ensure_future(procedure.alaunch())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return procedure
+
+    procedure = asyncio.run(cancel())
+    assert procedure.status == ProcedureStatus.CANCELLED
+    assert procedure.reverted
+
+
+class LegacyCancelledError(asyncio.CancelledError, Exception):
+    """CancelledError as it is before Python 3.8, a subclass of Exception."""
+
+
+class LegacyCancelledProcedure(SleepProcedure):
+    async def execute(self):
+        raise LegacyCancelledError()
+
+
+def test_cancelled_error_deriving_from_exception_is_not_a_failure():
+    procedure = LegacyCancelledProcedure(make_context(0.0))
+    try:
+        asyncio.run(procedure.alaunch())
+    except asyncio.CancelledError:
+        pass
+
+    assert procedure.status == ProcedureStatus.CANCELLED
+    assert procedure.reverted
@@ -0,0 +1,86 @@
+import time
+
+from vulcain.procedure.shared import BatchLauncher, ProcedureStatus, Software
+
+from procedures import NoOpProcedure
+
+
+class SlowSoftware(Software):
+    """Software taking 'delay' seconds to start and stop, and 'reset_delay' to reset."""
+
+    def __init__(self, delay=0.0, reset_delay=0.0, fail_reset_at=None):
+        self.delay = delay
+        self.reset_delay = reset_delay
+        self.fail_reset_at = fail_reset_at
+        self.calls = []
+
+    def start(self):
+        self.calls.append("start")
+        time.sleep(self.delay)
+
+    def stop(self):
+        self.calls.append("stop")
+        time.sleep(self.delay)
+
+    def reset(self):
+        self.calls.append("reset")
+        time.sleep(self.reset_delay)
+        if self.calls.count("reset") == self.fail_reset_at:
+            raise RuntimeError("Reset failed.")
+
+
+class ShotProcedure(NoOpProcedure):
+    def check(self):
+        if self.context == "wrong":
+            raise self.CheckFailed("Wrong shot.", ["shot"])
+
+    def execute(self):
+        if self.context == "fail":
+            raise RuntimeError("Export failed.")
+
+    def end_launch(self):
+        super().end_launch()
+        if self.context == "raise":
+            raise RuntimeError("Broken UI.")
+
+
+def test_status_per_context():
+    dcc = SlowSoftware()
+    results = []
+    report = BatchLauncher(ShotProcedure, dcc=dcc).launch(["sh010", "wrong", "fail", "raise", "sh020"],
+                                                           on_result=lambda index, result: results.append(index))
+
+    assert [result.status for result in report.results] == [
+        ProcedureStatus.SUCCESS, ProcedureStatus.CHECK_FAIL, ProcedureStatus.EXECUTE_FAIL,
+        ProcedureStatus.EXECUTE_FAIL, ProcedureStatus.SUCCESS]
+    assert "Broken UI." in report.results[3].error
+    assert results == [0, 1, 2, 3, 4]
+    assert dcc.calls == ["start"] + ["reset"] * 4 + ["stop"]
+    assert report.status_counts() == {ProcedureStatus.SUCCESS: 2, ProcedureStatus.CHECK_FAIL: 1,
+                                      ProcedureStatus.EXECUTE_FAIL: 2}
+
+
+def test_failed_reset_fails_its_context_only():
+    dcc = SlowSoftware(fail_reset_at=1)
+    report = BatchLauncher(ShotProcedure, dcc=dcc).launch(["sh010", "sh020", "sh030"])
+
+    assert [result.status for result in report.results] == [
+        ProcedureStatus.SUCCESS, ProcedureStatus.EXECUTE_FAIL, ProcedureStatus.SUCCESS]
+    assert "Reset failed." in report.results[1].error
+    assert report.results[1].metrics is None
+
+
+def test_saved_duration_subtracts_resets():
+    report = BatchLauncher(ShotProcedure, dcc=SlowSoftware(delay=0.05, reset_delay=0.02)).launch(["a", "b", "c"])
+
+    restarts = (report.start_duration + report.stop_duration) * 2
+    assert report.start_duration >= 0.05
+    assert report.reset_duration >= 0.04
+    assert report.results[0].reset_duration == 0.0
+    assert abs(report.saved_duration - (restarts - report.reset_duration)) < 1e-9
+    assert report.saved_duration < restarts
+
+
+def test_empty_batch():
+    report = BatchLauncher(ShotProcedure, dcc=SlowSoftware()).launch([])
+    assert report.results == [] and report.saved_duration == 0.0
@@ -0,0 +1,118 @@
+import os
+
+from vulcain.context import VulcainContext
+from vulcain.procedure.shared import (CachedResult, FileFingerprinter, ProcedureContext, ProcedureInputs,
+                                      ProcedureStatus, ResultStore, Software, fingerprint)
+
+from procedures import NoOpProcedure
+
+
+def make_context(shot="sh010", **input_args):
+    return ProcedureContext(VulcainContext("shots", shot=shot), input_args=input_args)
+
+
+def test_fingerprint_depends_on_inputs(tmp_path):
+    file_path = tmp_path / "scene.ma"
+    file_path.write_text("first")
+    inputs = ProcedureInputs(files=[str(file_path)])
+    fingerprinter = FileFingerprinter()
+
+    first = fingerprint("Export", inputs, make_context(), fingerprinter)
+    assert fingerprint("Export", inputs, make_context(), fingerprinter) == first
+    assert fingerprint("Render", inputs, make_context(), fingerprinter) != first
+    assert fingerprint("Export", inputs, make_context("sh020"), fingerprinter) != first
+    assert fingerprint("Export", ProcedureInputs([str(file_path)], extra=2), make_context(), fingerprinter) != first
+
+    file_path.write_text("second, longer")
+    assert fingerprint("Export", inputs, make_context(), fingerprinter) != first
+
+
+def test_fingerprint_ignores_return_value():
+    inputs = ProcedureInputs()
+    context = make_context()
+    before = fingerprint("Export", inputs, context)
+    context.return_value = "/publish/sh010_v0001.ma"
+    assert fingerprint("Export", inputs, context) == before
+
+
+def test_fingerprint_without_context():
+    inputs = ProcedureInputs(context=False)
+    assert fingerprint("Export", inputs, make_context("sh010")) == fingerprint("Export", inputs, make_context("sh020"))
+
+
+def test_store_hit_and_miss():
+    store = ResultStore()
+    assert store.get("abc") is None
+    store.put(CachedResult("abc", "Export", 42))
+
+    assert store.get("abc").return_value == 42
+    assert (store.hits, store.misses) == (1, 1)
+
+
+def test_store_evicts_least_recently_used():
+    store = ResultStore(max_entries=2)
+    for key in ("a", "b"):
+        store.put(CachedResult(key, "Export"))
+    store.get("a")
+    store.put(CachedResult("c", "Export"))
+
+    assert "a" in store and "c" in store
+    assert "b" not in store
+
+
+def test_store_directory_is_shared(tmp_path):
+    directory = str(tmp_path / "results")
+    first = ResultStore(directory)
+    second = ResultStore(directory)
+    first.put(CachedResult("abc", "Export", [1, 2]))
+
+    assert second.get("abc").return_value == [1, 2]
+    assert ResultStore(directory).get("abc").return_value == [1, 2]
+    assert os.listdir(directory) == ["abc.result"]
+
+
+class CountingProcedure(NoOpProcedure):
+    result_store = ResultStore()
+    executions = 0
+
+    def inputs(self):
+        return ProcedureInputs(extra=self.context.input_args.get("version"))
+
+    def execute(self):
+        type(self).executions += 1
+        self.context.return_value = self.context.context.shot
+
+
+def test_procedure_reuses_stored_result():
+    first = CountingProcedure(make_context(version=1))
+    assert first.launch() == "sh010"
+    assert not first.cached
+
+    second = CountingProcedure(make_context(version=1))
+    assert second.launch() == "sh010"
+    assert second.cached
+    assert second.status == ProcedureStatus.SUCCESS
+
+    CountingProcedure(make_context(version=2)).launch()
+    assert CountingProcedure.executions == 2
+
+
+class CountingSoftware(Software):
+    starts = 0
+
+    def start(self):
+        type(self).starts += 1
+
+    def stop(self):
+        pass
+
+
+def test_stored_result_does_not_start_the_dcc():
+    CountingProcedure(make_context(version=3), dcc=CountingSoftware()).launch()
+    assert CountingSoftware.starts == 1
+
+    procedure = CountingProcedure(make_context(version=3), dcc=CountingSoftware())
+    assert procedure.launch() == "sh010"
+    assert procedure.cached
+    assert CountingSoftware.starts == 1
+    assert [phase.phase for phase in procedure.metrics.phases] == ["fingerprint", "end_launch"]
@@ -0,0 +1,103 @@
+import os
+import pickle
+import threading
+import time
+
+from vulcain.procedure.shared import Checkpoint, CheckpointStore, ProcedureStatus
+from vulcain.procedure.shared.checkpoint import CHECKPOINT_SUFFIX
+
+from procedures import NoOpProcedure
+
+
+class Cleanup(NoOpProcedure):
+    """Run the 'clean' then 'bake' steps, fail after 'clean' while fail_bake is set."""
+    fail_bake = False
+
+    def __init__(self, context):
+        super().__init__(context)
+        self.steps = []
+
+    def execute(self):
+        if self.reached("clean"):
+            scene = self.checkpoint_state("clean")["scene"]
+        else:
+            self.steps.append("clean")
+            scene = "clean.ma"
+            self.checkpoint("clean", {"scene": scene})
+        if self.fail_bake:
+            raise RuntimeError("Bake failed.")
+        self.steps.append(f"bake {scene}")
+
+
+def checkpoint_files(directory):
+    return [name for name in os.listdir(directory) if name.endswith(CHECKPOINT_SUFFIX)]
+
+
+def test_failed_run_resumes_after_its_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(Cleanup, "checkpoint_store", CheckpointStore(str(tmp_path)))
+    monkeypatch.setattr(Cleanup, "fail_bake", True)
+    failed = Cleanup({"shot": "sh010"})
+    failed.run()
+    assert failed.status == ProcedureStatus.EXECUTE_FAIL
+    assert len(checkpoint_files(tmp_path)) == 1
+
+    monkeypatch.setattr(Cleanup, "fail_bake", False)
+    resumed = Cleanup({"shot": "sh010"})
+    resumed.run()
+    assert resumed.status == ProcedureStatus.SUCCESS
+    assert resumed.steps == ["bake clean.ma"]
+    # Removed once the run succeeded, the next run starts over.
+    assert checkpoint_files(tmp_path) == []
+
+
+def test_checkpoints_are_per_context(tmp_path, monkeypatch):
+    monkeypatch.setattr(Cleanup, "checkpoint_store", CheckpointStore(str(tmp_path)))
+    monkeypatch.setattr(Cleanup, "fail_bake", True)
+    Cleanup({"shot": "sh010"}).run()
+
+    monkeypatch.setattr(Cleanup, "fail_bake", False)
+    other = Cleanup({"shot": "sh020"})
+    other.run()
+    assert other.steps == ["clean", "bake clean.ma"]
+    assert len(checkpoint_files(tmp_path)) == 1
+
+
+def test_without_store_checkpoints_do_nothing():
+    procedure = Cleanup({"shot": "sh010"})
+    procedure.run()
+    assert procedure.steps == ["clean", "bake clean.ma"]
+    assert not procedure.reached("clean")
+
+
+def test_old_checkpoint_is_not_resumed(tmp_path):
+    store = CheckpointStore(str(tmp_path), max_age=60)
+    store.save("key", Checkpoint("Cleanup", {"clean": None}))
+    assert store.load("key").last == "clean"
+
+    checkpoint = store.load("key")
+    checkpoint.updated = time.time() - 120
+    with open(os.path.join(str(tmp_path), f"key{CHECKPOINT_SUFFIX}"), "wb") as f:
+        pickle.dump(checkpoint, f)
+    assert store.load("key") is None
+    assert checkpoint_files(tmp_path) == []
+
+
+def test_corrupted_checkpoint_starts_over(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    with open(os.path.join(str(tmp_path), f"key{CHECKPOINT_SUFFIX}"), "wb") as f:
+        f.write(b"not a pickle")
+    assert store.load("key") is None
+    assert checkpoint_files(tmp_path) == []
+
+
+def test_unpicklable_state_fails_the_run(tmp_path, monkeypatch):
+    class LockState(Cleanup):
+        def execute(self):
+            self.checkpoint("clean", threading.Lock())
+
+    monkeypatch.setattr(LockState, "checkpoint_store", CheckpointStore(str(tmp_path)))
+    procedure = LockState({"shot": "sh010"})
+    procedure.run()
+    assert procedure.status == ProcedureStatus.EXECUTE_FAIL
+    # Never a partial checkpoint to resume from.
+    assert os.listdir(tmp_path) == []
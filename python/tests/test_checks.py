@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+from vulcain.procedure.shared import CheckLevel, CheckRunner
+from vulcain.procedure.shared.checks import INLINE, PROCESS, THREAD
+
+
+def has_shot(context):
+    return bool(context.get("shot"))
+
+
+@pytest.mark.parametrize("value, level, message", [
+    (None, CheckLevel.OK, ""),
+    (True, CheckLevel.OK, ""),
+    (False, CheckLevel.ERROR, ""),
+    ("Scene is not saved.", CheckLevel.ERROR, "Scene is not saved."),
+    ((CheckLevel.WARNING, "Old rig version."), CheckLevel.WARNING, "Old rig version."),
+    (3, CheckLevel.ERROR, "Check returned an unexpected value : 3."),
+    ([CheckLevel.OK, ""], CheckLevel.ERROR, "Check returned an unexpected value : [<CheckLevel.OK: 'ok'>, '']."),
+    ((CheckLevel.OK, "", "extra"), CheckLevel.ERROR,
+     "Check returned an unexpected value : (<CheckLevel.OK: 'ok'>, '', 'extra')."),
+    (("ok", ""), CheckLevel.ERROR, "Check returned an unexpected value : ('ok', '')."),
+])
+@pytest.mark.parametrize("pool", [INLINE, THREAD])
+def test_check_values(value, level, message, pool):
+    runner = CheckRunner()
+    runner.register("check", lambda context: value, pool=pool)
+    result, = runner.run().results
+
+    assert (result.level, result.message) == (level, message)
+
+
+def test_raising_check_is_an_error():
+    runner = CheckRunner()
+    runner.register("check", lambda context: 1 / 0, pool=INLINE)
+    assert runner.run().errors[0].message == "ZeroDivisionError: division by zero"
+
+
+def test_pools_report_in_registration_order():
+    runner = CheckRunner(max_processes=1)
+    runner.register("inline", has_shot, pool=INLINE)
+    runner.register("thread", has_shot, pool=THREAD)
+    runner.register("process", has_shot, pool=PROCESS)
+    report = runner.run({"shot": "sh010"})
+
+    assert [result.name for result in report.results] == ["inline", "thread", "process"]
+    assert report.ok
+
+
+def test_fail_fast_cancels_remaining_checks():
+    runner = CheckRunner(fail_fast=True, max_threads=1)
+    runner.register("slow", lambda context: time.sleep(0.2), cost=10)
+    runner.register("never", lambda context: None, cost=1)
+    runner.register("wrong", lambda context: False, pool=INLINE)
+    report = runner.run()
+
+    assert [result.name for result in report.errors] == ["wrong"]
+    assert "never" in report.cancelled
+
+
+def test_register_errors():
+    runner = CheckRunner()
+    runner.register("check", has_shot)
+    with pytest.raises(ValueError, match="already registered"):
+        runner.register("check", has_shot)
+    with pytest.raises(ValueError, match="pool"):
+        runner.register("other", has_shot, pool="gpu")
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from vulcain.procedure.cli import EXIT_CODES, USAGE_EXIT_CODE, build_context, main
+from vulcain.procedure.shared import ProcedureStatus, Software
+
+from procedures import NoOpProcedure
+
+
+class ShotProcedure(NoOpProcedure):
+    def check(self):
+        if self.context.context.shot == "wrong":
+            raise self.CheckFailed("Wrong shot.", ["shot"])
+
+    def execute(self):
+        if self.context.context.shot == "fail":
+            raise RuntimeError("Export failed.")
+
+
+class BrokenSoftware(Software):
+    def start(self):
+        raise RuntimeError("No license.")
+
+    def stop(self):
+        pass
+
+
+def run(capsys, *argv):
+    exit_code = main(["test_cli:ShotProcedure", "--events", "jsonl", *argv])
+    events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    return exit_code, events
+
+
+def shots(*names):
+    return [argument for name in names for argument in ("--context", "section=shots", f"shot={name}")]
+
+
+def test_jsonl_events(capsys):
+    exit_code, events = run(capsys, *shots("sh010", "sh020"))
+
+    assert exit_code == 0
+    assert [event["event"] for event in events] == ["start", "result", "result", "end"]
+    assert events[0]["total"] == 2
+    assert [event["context"]["context"]["shot"] for event in events[1:3]] == ["sh010", "sh020"]
+    assert events[-1]["status"] == "SUCCESS" and events[-1]["exit_code"] == 0
+
+
+@pytest.mark.parametrize("names, status", [
+    (("sh010", "wrong"), ProcedureStatus.CHECK_FAIL),
+    (("wrong", "fail"), ProcedureStatus.EXECUTE_FAIL),
+])
+def test_exit_code_of_the_most_severe_status(capsys, names, status):
+    exit_code, events = run(capsys, *shots(*names))
+    assert exit_code == EXIT_CODES[status]
+    assert events[-1]["status"] == status.name
+
+
+def test_contexts_file(capsys, tmp_path):
+    contexts_file = tmp_path / "contexts.jsonl"
+    contexts_file.write_text('{"section": "shots", "shot": "sh010"}\n\n{"section": "shots", "shot": "fail"}\n')
+    exit_code, events = run(capsys, "--contexts-file", str(contexts_file))
+
+    assert exit_code == EXIT_CODES[ProcedureStatus.EXECUTE_FAIL]
+    assert [event["status"] for event in events[1:3]] == ["SUCCESS", "EXECUTE_FAIL"]
+
+
+@pytest.mark.parametrize("argv", [
+    [],
+    ["--context", "shot=sh010"],
+    ["--context", "section"],
+    ["--contexts-file", "missing.jsonl"],
+    ["--software", "unknown"],
+    ["--import", "vulcain.no_such_module", "--context", "section=shots"],
+])
+def test_usage_errors(capsys, argv):
+    assert main(["test_cli:ShotProcedure", *argv]) == USAGE_EXIT_CODE
+    assert "Error" in capsys.readouterr().err
+
+
+def test_unknown_procedure(capsys):
+    assert main(["unknown_procedure", "--context", "section=shots"]) == USAGE_EXIT_CODE
+
+
+def test_software_failing_to_start(capsys):
+    exit_code, events = run(capsys, "--software", "test_cli:BrokenSoftware", *shots("sh010"))
+
+    assert exit_code == EXIT_CODES[ProcedureStatus.EXECUTE_FAIL]
+    assert events[-1]["status"] == "EXECUTE_FAIL"
+    assert "No license." in events[-1]["error"]
+
+
+def test_build_context():
+    context = build_context({"section": "assets", "asset": "chair", "version": "3", "labels": "a,b",
+                             "force": "1", "input_args": {"frames": [1, 2]}})
+    assert context.context.version == 3
+    assert context.context.labels == ["a", "b"]
+    assert context.input_args == {"frames": [1, 2], "force": "1"}
@@ -0,0 +1,45 @@
+import json
+
+from vulcain.parametric.snapshot import compile_snapshot, load_snapshot
+
+
+def write_json(file_path, data):
+    with open(file_path, "w") as f:
+        json.dump(data, f)
+    return str(file_path)
+
+
+def make_sources(tmp_path):
+    studio = write_json(tmp_path / "studio_params.json", {"fps": 24, "renderer": "arnold"})
+    project = write_json(tmp_path / "project_params.json", {"fps": 25})
+    return {"params": [studio, project], "path": [], "config": []}
+
+
+def test_snapshot_merges_sources(tmp_path):
+    sources = make_sources(tmp_path)
+    output_path = str(tmp_path / "snapshot.json")
+    compile_snapshot(sources, output_path)
+
+    snapshot = load_snapshot(output_path, sources)
+    assert snapshot.params == {"fps": 25, "renderer": "arnold"}
+
+
+def test_snapshot_discarded_when_source_changes(tmp_path):
+    sources = make_sources(tmp_path)
+    output_path = str(tmp_path / "snapshot.json")
+    compile_snapshot(sources, output_path)
+
+    write_json(sources["params"][1], {"fps": 30, "renderer": "vray"})
+    assert load_snapshot(output_path, sources) is None
+
+
+def test_snapshot_discarded_for_other_sources(tmp_path):
+    sources = make_sources(tmp_path)
+    output_path = str(tmp_path / "snapshot.json")
+    compile_snapshot(sources, output_path)
+
+    other_project = write_json(tmp_path / "other_params.json", {"fps": 25})
+    assert load_snapshot(output_path, {"params": [sources["params"][0], other_project]}) is None
+
+    sources["config"].append(str(tmp_path / "new_config.json"))
+    assert load_snapshot(output_path, sources) is None
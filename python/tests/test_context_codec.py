@@ -0,0 +1,74 @@
+import pickle
+
+import pytest
+
+from vulcain.context import VulcainContext
+from vulcain.procedure.shared.context_codec import (ContextCodecError, content_hash, context_to_dict, decode,
+                                                     decode_json, decode_many, encode, encode_json, encode_many)
+from vulcain.procedure.shared.procedure import ProcedureContext
+
+CONTEXTS = [
+    VulcainContext("assets"),
+    VulcainContext("shots", episode="ep01", sequence="sq010", shot="sh0010", step="anim", version=3,
+                   labels=["final", "client"]),
+    VulcainContext("assets", asset="chair", task="modeling", version=0, software="maya", extra="é"),
+    ProcedureContext(VulcainContext("assets", asset="chair"), input_args={"frames": [1, 100]},
+                     any_context={"user": "anna"}, return_value={"published": True}),
+    ProcedureContext(),
+]
+FALSY_RETURN_VALUES = [0, 0.0, False, "", [], {}]
+
+
+@pytest.mark.parametrize("context", CONTEXTS)
+def test_round_trips(context):
+    assert decode_json(encode_json(context)) == context
+    assert decode(encode(context)) == context
+    assert pickle.loads(pickle.dumps(context)) == context
+
+
+def test_many_round_trips():
+    contexts = CONTEXTS * 100
+    assert decode_many(encode_many(contexts)) == contexts
+    assert decode_json(encode_json(contexts)) == contexts
+
+
+@pytest.mark.parametrize("return_value", FALSY_RETURN_VALUES)
+def test_falsy_return_values(return_value):
+    context = ProcedureContext(VulcainContext("assets"), return_value=return_value)
+
+    assert context_to_dict(context)["return_value"] == return_value
+    for decoded in (decode_json(encode_json(context)), decode(encode(context))):
+        assert decoded.return_value == return_value
+        assert type(decoded.return_value) is type(return_value)
+
+
+def test_none_return_value_not_encoded():
+    assert "return_value" not in context_to_dict(ProcedureContext())
+    assert decode(encode(ProcedureContext())).return_value is None
+
+
+def test_content_hash():
+    context = ProcedureContext(VulcainContext("assets", asset="chair"), input_args={"b": 1, "a": 2})
+    same = ProcedureContext(VulcainContext("assets", asset="chair"), input_args={"a": 2, "b": 1}, return_value=0)
+
+    assert content_hash(context) == content_hash(same)
+    assert content_hash(context) != content_hash(VulcainContext("assets", asset="chair"))
+    assert content_hash(VulcainContext("assets")) == content_hash(decode(encode(VulcainContext("assets"))))
+
+
+def test_slots():
+    context = VulcainContext("assets")
+    with pytest.raises(AttributeError):
+        context.unknown = 1
+    assert not hasattr(ProcedureContext(), "__dict__")
+
+
+def test_errors():
+    with pytest.raises(ContextCodecError):
+        encode_json({"section": "assets"})
+    with pytest.raises(ContextCodecError):
+        encode(ProcedureContext(return_value=object()))
+    with pytest.raises(ContextCodecError):
+        decode(b"nope")
+    with pytest.raises(ContextCodecError):
+        decode(encode(CONTEXTS[1])[:-1])
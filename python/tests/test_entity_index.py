@@ -0,0 +1,107 @@
+import json
+import os
+
+import pytest
+
+import vulcain.configs.vulcain as configs_path
+from vulcain.filesystem import EntityIndex
+from vulcain.procedure.shared import VulcainPath, VulcainPathQuery
+from vulcain.procedure.shared.vulcain_path import select
+from vulcain.templates import PathParser, PathTemplates
+
+PATH_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(configs_path.__file__)), "path.json")
+
+FILES = [
+    "props/chair/modeling/work/chair_modeling_v0012.ma",
+    "props/chair/modeling/work/chair_modeling_v0011.ma",
+    "props/chair/modeling/publish/chair_modeling_v0003.ma",
+    "props/chair/modeling/publish/chair_modeling_v0002.ma",
+    "props/chair/modeling/publish/chair_modeling_v0004.reserved",
+    "props/table/modeling/publish/table_modeling_v0001.ma",
+    "props/table/rigging/publish/table_rigging_v0007.ma",
+    "chars/hero/modeling/publish/hero_modeling_v0005.ma",
+]
+
+
+@pytest.fixture
+def project(tmp_path):
+    with open(PATH_FILE_PATH) as f:
+        templates = PathTemplates(json.load(f))
+    project_path = str(tmp_path).replace("\\", "/")
+    parser = PathParser(templates, project_path=project_path, exec_env="work")
+    root_path = f"{project_path}/work"
+    for file_path in FILES:
+        path = os.path.join(root_path, "assets", file_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write("")
+    return root_path, parser
+
+
+def query(index, pattern, **kwargs):
+    return sorted(str(path) for path in select(pattern, index, **kwargs))
+
+
+def test_scan_reuses_unchanged_directories(project, tmp_path):
+    root_path, parser = project
+    index_file_path = str(tmp_path / "index.json")
+    index = EntityIndex(root_path, parser, index_file_path)
+    first = index.scan()
+    assert first.listed == len(index) and first.reused == 0
+
+    # Back dated past the racy delay, as a listing made long after the last change.
+    for directory, _, _ in os.walk(root_path):
+        os.utime(directory, ns=(10**18, 10**18))
+    index.scan()
+    second = EntityIndex(root_path, parser, index_file_path).scan()
+    assert second.listed == 0 and second.reused == len(index)
+
+    os.makedirs(os.path.join(root_path, "assets", "props", "lamp"))
+    third = EntityIndex(root_path, parser, index_file_path).scan()
+    assert third.listed == 2
+
+
+def test_entities_and_versions(project):
+    root_path, parser = project
+    index = EntityIndex(root_path, parser)
+    index.scan(save=False)
+
+    tasks = sorted((parsed.inputs["entity_name"], parsed.inputs["task"])
+                   for parsed in index.entities("task_dir_path", entity_type="props"))
+    assert tasks == [("chair", "modeling"), ("table", "modeling"), ("table", "rigging")]
+    # Reserved versions are not published yet.
+    assert sorted(parsed.version for parsed in index.versions("step_dir_path", entity_name="chair")) == [2, 3, 11, 12]
+
+
+def test_latest_selects_the_publish_step(project):
+    root_path, parser = project
+    index = EntityIndex(root_path, parser)
+    index.scan(save=False)
+
+    assert query(index, "asset~props/*/modeling/latest") == ["asset~props/chair/modeling/v0003",
+                                                             "asset~props/table/modeling/v0001"]
+    assert query(index, "asset~props/chair/modeling/latest", step="work") == ["asset~props/chair/modeling/v0012"]
+    assert query(index, "asset~props/chair/modeling/latest", step=None) == ["asset~props/chair/modeling/v0012"]
+    assert query(index, "asset~props/chair/modeling/v000*") == ["asset~props/chair/modeling/v0002",
+                                                                "asset~props/chair/modeling/v0003"]
+
+
+def test_select_entities(project):
+    root_path, parser = project
+    index = EntityIndex(root_path, parser)
+    index.scan(save=False)
+
+    assert query(index, "asset~*") == ["asset~chars", "asset~props"]
+    assert query(index, "asset~props/ta*/*") == ["asset~props/table/modeling", "asset~props/table/rigging"]
+    assert query(index, "asset~*/hero/modeling/latest") == ["asset~chars/hero/modeling/v0005"]
+
+
+def test_query_matches():
+    query = VulcainPathQuery("asset~props/*/modeling/latest")
+    assert query.matches(VulcainPath("asset~props/chair/modeling/v0003"))
+    assert not query.matches(VulcainPath("asset~props/chair/rigging/v0003"))
+    assert not query.matches(VulcainPath("asset~props/chair/modeling"))
+
+    for pattern in ("shot~sq010/sh010", "asset~props/latest", "asset~a/b/c/d/e", "asset"):
+        with pytest.raises(ValueError):
+            VulcainPathQuery(pattern)
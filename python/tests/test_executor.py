@@ -0,0 +1,107 @@
+import os
+import signal
+
+import pytest
+
+from vulcain.context import VulcainContext
+from vulcain.procedure.shared import (Executor, FieldExpander, Process, ProcedureContext, ProcedureStatus,
+                                      ProcessExecutor)
+
+
+class RecordProcess(Process):
+    """Append '<name>.<phase>' to the context calls, fail or kill the worker on the shots it is given."""
+
+    def __init__(self, label, fail_check=(), fail_execute=(), crash=()):
+        self.label = label
+        self.fail_check = fail_check
+        self.fail_execute = fail_execute
+        self.crash = crash
+
+    def record(self, context, phase):
+        context.any_context.setdefault("calls", []).append(f"{self.label}.{phase}")
+        return context
+
+    def check(self, context):
+        if context.context.shot in self.fail_check:
+            raise ValueError("Wrong shot.")
+        return self.record(context, "check")
+
+    def execute(self, context):
+        shot = context.context.shot
+        if shot in self.crash:
+            os.kill(os.getpid(), signal.SIGKILL)
+        self.record(context, "execute")
+        if shot in self.fail_execute:
+            raise RuntimeError("Export failed.")
+        context.return_value = shot
+        return context
+
+    def revert(self, context):
+        return self.record(context, "revert")
+
+
+def make_context(shot="sh010"):
+    return ProcedureContext(VulcainContext("shots", sequence="sq010", shot=shot), any_context={"user": "anna"})
+
+
+def calls(result):
+    return result.context.any_context["calls"]
+
+
+def test_field_expander():
+    context = make_context("")
+    children = FieldExpander("shot", lambda context: ["sh010", "sh020"]).expand(context)
+
+    assert [child.context.shot for child in children] == ["sh010", "sh020"]
+    assert all(child.context.sequence == "sq010" for child in children)
+    children[0].any_context["user"] = "ben"
+    assert children[1].any_context["user"] == "anna"
+    assert context.context.shot == ""
+    with pytest.raises(ValueError):
+        FieldExpander("shot", ["sh010"]).expand(ProcedureContext())
+
+
+def test_processes_run_in_order():
+    result, = Executor([RecordProcess("a"), RecordProcess("b")]).execute(make_context()).results
+
+    assert result.status == ProcedureStatus.SUCCESS
+    assert calls(result) == ["a.check", "b.check", "a.execute", "b.execute"]
+
+
+def test_failed_execute_reverts_in_reverse_order():
+    processes = [RecordProcess("a"), RecordProcess("b", fail_execute=("sh010",)), RecordProcess("c")]
+    result, = Executor(processes).execute(make_context()).results
+
+    assert result.status == ProcedureStatus.EXECUTE_FAIL
+    assert result.failed_process == "RecordProcess"
+    assert calls(result)[-2:] == ["b.revert", "a.revert"]
+
+
+def test_failed_check_executes_nothing():
+    result, = Executor([RecordProcess("a"), RecordProcess("b", fail_check=("sh010",))]).execute(make_context()).results
+
+    assert result.status == ProcedureStatus.CHECK_FAIL
+    assert calls(result) == ["a.check"]
+
+
+def test_process_executor_keeps_children_order():
+    shots = [f"sh{index:03d}0" for index in range(6)]
+    executor = ProcessExecutor([RecordProcess("a", fail_execute=("sh0030",))], FieldExpander("shot", shots),
+                               max_workers=2)
+    report = executor.execute(make_context())
+
+    assert [result.context.context.shot for result in report.results] == shots
+    assert [result.context.context.shot for result in report.failed] == ["sh0030"]
+    assert report.status == ProcedureStatus.EXECUTE_FAIL
+
+
+def test_process_executor_worker_death_fails_its_context_only():
+    shots = ["sh0010", "sh0020", "sh0030", "sh0040"]
+    executor = ProcessExecutor([RecordProcess("a", crash=("sh0020",))], FieldExpander("shot", shots),
+                               max_workers=2)
+    report = executor.execute(make_context())
+
+    assert [result.status for result in report.results] == [ProcedureStatus.SUCCESS, ProcedureStatus.EXECUTE_FAIL,
+                                                             ProcedureStatus.SUCCESS, ProcedureStatus.SUCCESS]
+    assert report.results[1].error == "The worker process running the context died."
+    assert report.results[3].context.return_value == "sh0040"
@@ -0,0 +1,50 @@
+import pytest
+
+from vulcain.procedure.shared import MetricsAggregate, ProcedureMetrics
+
+
+def test_measure_records_phases():
+    metrics = ProcedureMetrics("Export")
+    with metrics.measure("check"):
+        pass
+    with pytest.raises(RuntimeError):
+        with metrics.measure("execute"):
+            raise RuntimeError()
+
+    assert [phase.phase for phase in metrics.phases] == ["check", "execute"]
+    assert metrics.phase("execute").failed
+    assert not metrics.phase("check").failed
+    with pytest.raises(ValueError):
+        metrics.phase("revert")
+
+
+def test_peak_rss_growth_of_a_phase():
+    metrics = ProcedureMetrics("Export")
+    with metrics.measure("allocate"):
+        data = bytearray(64 * 2**20)
+        data[::4096] = b"x" * len(data[::4096])
+    del data
+    # The process peak is already reached, allocating as much again does not raise it.
+    with metrics.measure("allocate_again"):
+        data = bytearray(16 * 2**20)
+        data[::4096] = b"x" * len(data[::4096])
+
+    first, second = metrics.phases
+    assert first.peak_rss_growth >= 32 * 2**20
+    assert second.peak_rss_growth == 0
+    assert second.process_peak_rss == first.process_peak_rss == metrics.process_peak_rss
+
+
+def test_aggregate_by_procedure_and_phase():
+    runs = []
+    for _ in range(3):
+        metrics = ProcedureMetrics("Export")
+        with metrics.measure("execute"):
+            pass
+        runs.append(metrics)
+
+    aggregate = MetricsAggregate(runs)
+    stats = aggregate.stats[("Export", "execute")]
+    assert aggregate.runs == 3
+    assert stats.count == 3
+    assert aggregate.slowest(1) == [stats]
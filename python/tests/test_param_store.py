@@ -0,0 +1,65 @@
+import json
+import os
+
+from vulcain.parametric.store import ParamLayer, ParamStore
+
+
+def write_params(file_path, values, mtime_ns):
+    with open(file_path, "w") as f:
+        json.dump(values, f)
+    # Explicit mtimes, two writes in the same filesystem tick would keep the same one.
+    os.utime(file_path, ns=(mtime_ns, mtime_ns))
+
+
+def test_layer_reloads_when_file_changes(tmp_path):
+    file_path = str(tmp_path / "params.json")
+    write_params(file_path, {"fps": 24}, 1_000_000_000)
+    layer = ParamLayer(file_path)
+
+    assert layer.refresh()
+    assert not layer.refresh()
+    assert layer.data == {"fps": 24}
+
+    write_params(file_path, {"fps": 25}, 2_000_000_000)
+    assert layer.refresh()
+    assert layer.data == {"fps": 25}
+    assert layer.generation == 2
+
+
+def test_optional_layer_missing_file_is_empty(tmp_path):
+    layer = ParamLayer(str(tmp_path / "missing.json"), required=False)
+    assert layer.data == {}
+
+
+def test_store_last_layer_overrides(tmp_path):
+    studio = str(tmp_path / "studio.json")
+    project = str(tmp_path / "project.json")
+    write_params(studio, {"fps": 24, "renderer": "arnold"}, 1_000_000_000)
+    write_params(project, {"fps": 25}, 1_000_000_000)
+
+    store = ParamStore([ParamLayer(studio), ParamLayer(project)], check_interval=0.0)
+    assert store.get("fps") == 25
+    assert store.get("renderer") == "arnold"
+
+
+def test_store_invalidated_by_mtime(tmp_path):
+    file_path = str(tmp_path / "params.json")
+    write_params(file_path, {"fps": 24}, 1_000_000_000)
+    store = ParamStore([ParamLayer(file_path)], check_interval=0.0)
+    assert store.get("fps") == 24
+
+    write_params(file_path, {"fps": 30}, 2_000_000_000)
+    assert store.get("fps") == 30
+
+
+def test_store_checks_files_once_per_interval(tmp_path):
+    file_path = str(tmp_path / "params.json")
+    write_params(file_path, {"fps": 24}, 1_000_000_000)
+    store = ParamStore([ParamLayer(file_path)], check_interval=3600.0)
+    assert store.get("fps") == 24
+
+    write_params(file_path, {"fps": 30}, 2_000_000_000)
+    assert store.get("fps") == 24
+
+    store.invalidate()
+    assert store.get("fps") == 30
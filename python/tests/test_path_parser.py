@@ -0,0 +1,46 @@
+import json
+import os
+
+import pytest
+
+import vulcain.configs.vulcain as configs_path
+from vulcain.context import VulcainContext
+from vulcain.templates import PathParser, PathTemplates
+
+PATH_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(configs_path.__file__)), "path.json")
+
+INPUTS = {"project_path": "/prod/project", "exec_env": "work", "entity_type": "props",
+          "entity_name": "chair", "task": "modeling", "step": "publish"}
+
+
+@pytest.fixture(scope="module")
+def templates():
+    with open(PATH_FILE_PATH) as f:
+        return PathTemplates(json.load(f))
+
+
+def test_every_shipped_template_round_trips(templates):
+    parser = PathParser(templates, project_path=INPUTS["project_path"], exec_env=INPUTS["exec_env"])
+    for template in templates:
+        path = templates.resolve(template.name, INPUTS)
+        parsed = parser.parse(path)
+
+        assert parsed is not None, path
+        assert parsed.template == template.name
+        assert parsed.inputs == {name: INPUTS[name] for name in template.inputs}
+
+
+def test_file_parse_gives_context(templates):
+    parser = PathParser(templates, project_path=INPUTS["project_path"], exec_env=INPUTS["exec_env"])
+    directory = templates.resolve("step_dir_path", INPUTS)
+    parsed = parser.parse_file(f"{directory}/chair_modeling_v0003.ma")
+
+    assert parsed.version == 3
+    assert parsed.file_name == "chair_modeling_v0003.ma"
+    assert parsed.to_context() == VulcainContext("assets", asset="chair", task="modeling", step="publish",
+                                                 version=3, extra="props")
+
+
+def test_unknown_path_is_not_parsed(templates):
+    parser = PathParser(templates, project_path=INPUTS["project_path"], exec_env=INPUTS["exec_env"])
+    assert parser.parse("/other/project/work/assets") is None
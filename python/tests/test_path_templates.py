@@ -0,0 +1,48 @@
+import json
+import os
+
+import pytest
+
+import vulcain.configs.vulcain as configs_path
+from vulcain.context import VulcainContext
+from vulcain.templates import PathTemplateError, PathTemplates, context_inputs
+
+PATH_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(configs_path.__file__)), "path.json")
+
+INPUTS = {"project_path": "/prod/project", "exec_env": "work", "entity_type": "props",
+          "entity_name": "chair", "task": "modeling", "step": "publish"}
+
+
+@pytest.fixture(scope="module")
+def templates():
+    with open(PATH_FILE_PATH) as f:
+        return PathTemplates(json.load(f))
+
+
+def test_references_are_inlined(templates):
+    assert templates.resolve("step_dir_path", INPUTS) == "/prod/project/work/assets/props/chair/modeling/publish"
+    assert templates["step_dir_path"].inputs == ("project_path", "exec_env", "entity_type", "entity_name",
+                                                 "task", "step")
+
+
+def test_resolve_many_from_contexts(templates):
+    contexts = [VulcainContext("assets", asset=name, task="modeling", extra="props") for name in ("chair", "table")]
+    paths = templates.resolve_many("task_dir_path", contexts, project_path="/prod/project", exec_env="work")
+
+    assert paths == ["/prod/project/work/assets/props/chair/modeling", "/prod/project/work/assets/props/table/modeling"]
+    assert context_inputs(contexts[0])["entity_name"] == "chair"
+
+
+@pytest.mark.parametrize("templates_data", [
+    {"A": {"a": "${b}", "b": "${a}"}},
+    {"A": {"a": "${missing}/x"}},
+    {"A": {"a": "x"}, "B": {"a": "y"}},
+])
+def test_invalid_templates(templates_data):
+    with pytest.raises(PathTemplateError):
+        PathTemplates(templates_data)
+
+
+def test_missing_input(templates):
+    with pytest.raises(PathTemplateError, match="entity_type"):
+        templates.resolve("entity_type_dir_path", project_path="/prod/project", exec_env="work")
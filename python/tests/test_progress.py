@@ -0,0 +1,75 @@
+from vulcain.procedure.shared import NullUI, ProcedureUI, ProgressReporter
+
+from procedures import NoOpProcedure
+
+
+class RecordingUI(ProcedureUI):
+    def __init__(self):
+        self.updates = []
+
+    def show_end_success_message(self, procedure_name):
+        pass
+
+    def show_end_fail_message(self, procedure_name, message=""):
+        pass
+
+    def show_progress(self, procedure_name, stage, done, total=None, message=""):
+        self.updates.append((stage, done, total, message))
+
+
+def test_updates_are_coalesced():
+    ui = RecordingUI()
+    progress = ProgressReporter(ui, "Export", interval=60.0)
+    progress.update("export", total=100)
+    for _ in range(50):
+        progress.advance()
+    progress.update(message="chair")
+
+    # Only the first update is sent within the interval.
+    assert ui.updates == [("export", 0, 100, "")]
+    progress.flush()
+    assert ui.updates[-1] == ("export", 50, 100, "chair")
+    progress.flush()
+    assert len(ui.updates) == 2
+
+
+def test_stage_change_and_last_item_are_sent_right_away():
+    ui = RecordingUI()
+    progress = ProgressReporter(ui, "Export", interval=60.0)
+    progress.update("export", total=3)
+    progress.advance(3)
+    progress.update("publish", total=None)
+    progress.advance()
+
+    assert ui.updates == [("export", 0, 3, ""), ("export", 3, 3, ""), ("publish", 0, None, "")]
+    assert progress.sent == 3
+
+
+def test_updates_without_ui_are_dropped():
+    progress = ProgressReporter(None, "Export", interval=0.0)
+    progress.update("export", total=2)
+    progress.advance()
+    progress.flush()
+    assert progress.sent == 0
+
+    progress = ProgressReporter(NullUI(), "Export", interval=0.0)
+    progress.update("export", total=2)
+    progress.advance()
+    assert progress.sent == 2
+
+
+class LoopProcedure(NoOpProcedure):
+    def execute(self):
+        self.progress.update("export", total=None)
+        for _ in range(10000):
+            self.progress.advance()
+
+
+def test_procedure_flushes_its_last_progress():
+    ui = RecordingUI()
+    procedure = LoopProcedure({"shot": "sh010"}, ui=ui)
+    procedure.run()
+
+    assert len(ui.updates) < 100
+    assert ui.updates[-1] == ("export", 10000, None, "")
+    assert procedure.progress is procedure.progress
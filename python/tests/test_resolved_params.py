@@ -0,0 +1,30 @@
+import pytest
+
+from vulcain.parametric.store import ResolvedParams
+
+
+def test_prefix_queries():
+    params = ResolvedParams({"project.fps": 24, "project.resolution.width": 1920,
+                             "project.resolution.height": 1080, "maya.up_axis": "Y"})
+
+    assert params.keys("project.resolution") == ["project.resolution.width", "project.resolution.height"]
+    assert params.get_prefix("maya") == {"maya.up_axis": "Y"}
+    assert params.get_tree("project") == {"fps": 24, "resolution": {"width": 1920, "height": 1080}}
+    assert params.get_many(["project.fps", "maya.up_axis"]) == {"project.fps": 24, "maya.up_axis": "Y"}
+    with pytest.raises(ValueError):
+        params.get_many(["project.missing"])
+
+
+def test_tree_keeps_dict_values():
+    params = ResolvedParams({"project.resolution": {"width": 1920}})
+    assert params.get_tree() == {"project": {"resolution": {"width": 1920}}}
+
+
+@pytest.mark.parametrize("values", [
+    {"project.fps": 24, "project.fps.ntsc": True},
+    {"project.fps.ntsc": True, "project.fps": 24},
+    {"project.fps": {"ntsc": False}, "project.fps.ntsc": True},
+])
+def test_tree_key_clash(values):
+    with pytest.raises(ValueError, match="'project.fps' is also the prefix of 'project.fps.ntsc'"):
+        ResolvedParams(values).get_tree()
@@ -0,0 +1,90 @@
+import os
+import signal
+
+import pytest
+
+from vulcain.context import VulcainContext
+from vulcain.procedure.shared import ProcedureContext, ProcedureScheduler, ProcedureStatus, ScheduleError
+
+from procedures import NoOpProcedure
+
+
+class ShotProcedure(NoOpProcedure):
+    """Fail on the 'fail' shot, kill its worker on the 'crash' shot, else return the shot."""
+
+    def execute(self):
+        shot = self.context.context.shot
+        if shot == "fail":
+            raise RuntimeError("Export failed.")
+        if shot == "crash":
+            os.kill(os.getpid(), signal.SIGKILL)
+        self.context.return_value = shot
+
+
+def make_context(shot):
+    return ProcedureContext(VulcainContext("shots", shot=shot))
+
+
+def test_dependencies_run_in_order():
+    scheduler = ProcedureScheduler(max_workers=2)
+    scheduler.add("layout", ShotProcedure, make_context("sh010"))
+    scheduler.add("anim", ShotProcedure, make_context("sh010"), depends_on=["layout"])
+    scheduler.add("render", ShotProcedure, make_context("sh010"), depends_on=["anim"])
+    report = scheduler.run()
+
+    assert report.status == ProcedureStatus.SUCCESS
+    runs = report.runs
+    assert runs["layout"].end <= runs["anim"].start
+    assert runs["anim"].end <= runs["render"].start
+
+
+def test_failed_node_skips_its_dependents():
+    scheduler = ProcedureScheduler(max_workers=2)
+    scheduler.add("layout", ShotProcedure, make_context("fail"))
+    scheduler.add("anim", ShotProcedure, make_context("sh010"), depends_on=["layout"])
+    scheduler.add("render", ShotProcedure, make_context("sh010"), depends_on=["anim"])
+    scheduler.add("other", ShotProcedure, make_context("sh020"))
+    report = scheduler.run()
+
+    assert report.runs["layout"].status == ProcedureStatus.EXECUTE_FAIL
+    assert sorted(report.skipped) == ["anim", "render"]
+    assert report.runs["other"].return_value == "sh020"
+
+
+def test_crashed_worker_fails_its_node_only():
+    scheduler = ProcedureScheduler(max_workers=1)
+    # The highest cost runs first, on the single worker.
+    scheduler.add("crash", ShotProcedure, make_context("crash"), cost=10)
+    scheduler.add("after_crash", ShotProcedure, make_context("sh010"), depends_on=["crash"])
+    scheduler.add("other", ShotProcedure, make_context("sh020"), cost=1)
+    report = scheduler.run()
+
+    assert report.runs["crash"].status == ProcedureStatus.EXECUTE_FAIL
+    assert "died" in report.runs["crash"].error
+    assert report.skipped == ["after_crash"]
+    assert report.runs["other"].status == ProcedureStatus.SUCCESS
+
+
+def test_critical_path_first():
+    scheduler = ProcedureScheduler()
+    scheduler.add("a", ShotProcedure, None, cost=1)
+    scheduler.add("b", ShotProcedure, None, depends_on=["a"], cost=5)
+    scheduler.add("c", ShotProcedure, None, cost=2)
+
+    assert scheduler.critical_path_costs() == {"a": 6, "b": 5, "c": 2}
+
+
+def test_invalid_graphs():
+    scheduler = ProcedureScheduler()
+    scheduler.add("a", ShotProcedure, None, depends_on=["b"])
+    scheduler.add("b", ShotProcedure, None, depends_on=["a"])
+    with pytest.raises(ScheduleError, match="cycle"):
+        scheduler.topological_order()
+
+    with pytest.raises(ScheduleError, match="already exists"):
+        scheduler.add("a", ShotProcedure, None)
+
+    scheduler = ProcedureScheduler()
+    scheduler.add("a", ShotProcedure, None, depends_on=["missing"])
+    with pytest.raises(ScheduleError, match="unknown"):
+        scheduler.run()
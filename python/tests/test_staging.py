@@ -0,0 +1,134 @@
+import os
+import time
+
+import pytest
+
+from vulcain.procedure.shared import (CheckpointStore, ProcedureStatus, StagedOutputs, StagingError,
+                                      remove_stale_staging)
+from vulcain.procedure.shared.staging import STAGING_PREFIX, STALE_STAGING_AGE
+
+from procedures import NoOpProcedure
+
+
+def write(path, content):
+    with open(path, "w") as write_file:
+        write_file.write(content)
+
+
+def read(path):
+    with open(path) as read_file:
+        return read_file.read()
+
+
+def staging_dirs(directory):
+    return [name for name in os.listdir(directory) if name.startswith(STAGING_PREFIX)]
+
+
+def test_commit_moves_staged_files(tmp_path):
+    target = tmp_path / "publish" / "chair_v001.ma"
+    other = tmp_path / "cache" / "chair_v001.abc"
+    outputs = StagedOutputs("publish")
+    write(outputs.path(target), "new")
+    write(outputs.path(other), "cache")
+
+    assert not target.exists()
+    assert outputs.commit() == [str(target), str(other)]
+    assert read(target) == "new"
+    assert read(other) == "cache"
+    assert not outputs
+    assert staging_dirs(tmp_path / "publish") == []
+
+
+def test_discard_leaves_targets(tmp_path):
+    target = tmp_path / "chair_v001.ma"
+    write(target, "old")
+    outputs = StagedOutputs("publish")
+    write(outputs.path(target), "new")
+    outputs.discard()
+
+    assert read(target) == "old"
+    assert staging_dirs(tmp_path) == []
+
+
+def test_missing_staged_file_commits_nothing(tmp_path):
+    outputs = StagedOutputs("publish")
+    write(outputs.path(tmp_path / "a.ma"), "a")
+    outputs.path(tmp_path / "b.ma")
+
+    with pytest.raises(StagingError, match="were not written") as error:
+        outputs.commit()
+    assert error.value.committed == []
+    assert error.value.pending == [str(tmp_path / "a.ma"), str(tmp_path / "b.ma")]
+    assert not (tmp_path / "a.ma").exists()
+
+
+def test_partial_commit_lists_committed_and_pending(tmp_path, monkeypatch):
+    targets = [str(tmp_path / f"{name}.ma") for name in "abc"]
+    outputs = StagedOutputs("publish")
+    for target in targets:
+        write(outputs.path(target), target)
+
+    replace = os.replace
+
+    def failing_replace(source, destination):
+        if destination == targets[1]:
+            raise PermissionError(13, "Permission denied")
+        replace(source, destination)
+
+    monkeypatch.setattr(os, "replace", failing_replace)
+    with pytest.raises(StagingError, match="could not be committed") as error:
+        outputs.commit()
+    assert error.value.committed == targets[:1]
+    assert error.value.pending == targets[1:]
+    assert outputs.targets == targets[1:]
+
+    monkeypatch.setattr(os, "replace", replace)
+    assert outputs.commit() == targets[1:]
+    assert [read(target) for target in targets] == targets
+
+
+def test_stale_staging_removed_with_new_staging(tmp_path):
+    stale = tmp_path / f"{STAGING_PREFIX}dead_process"
+    recent = tmp_path / f"{STAGING_PREFIX}running_process"
+    stale.mkdir()
+    recent.mkdir()
+    old = time.time() - STALE_STAGING_AGE - 60
+    os.utime(stale, (old, old))
+
+    assert remove_stale_staging(tmp_path / "missing") == []
+    outputs = StagedOutputs("publish")
+    outputs.path(tmp_path / "chair_v001.ma")
+
+    assert not stale.exists()
+    assert recent.exists()
+    outputs.discard()
+
+
+class CleanupAndExport(NoOpProcedure):
+    fail_export = True
+
+    def execute(self):
+        directory = self.context["directory"]
+        if not self.reached("cleanup"):
+            write(self.outputs.path(os.path.join(directory, "clean.ma")), "clean")
+            self.checkpoint("cleanup")
+        write(self.outputs.path(os.path.join(directory, "anim.abc")), "anim")
+        if self.fail_export:
+            raise RuntimeError("Export failed.")
+
+
+def test_outputs_staged_before_a_checkpoint_survive_a_failure(tmp_path, monkeypatch):
+    monkeypatch.setattr(CleanupAndExport, "checkpoint_store", CheckpointStore(str(tmp_path / "checkpoints")))
+    context = {"directory": str(tmp_path / "publish")}
+
+    procedure = CleanupAndExport(context)
+    procedure.run()
+    assert procedure.status == ProcedureStatus.EXECUTE_FAIL
+    assert os.listdir(tmp_path / "publish") == ["clean.ma"]
+
+    monkeypatch.setattr(CleanupAndExport, "fail_export", False)
+    procedure = CleanupAndExport(context)
+    procedure.run()
+    assert procedure.status == ProcedureStatus.SUCCESS
+    assert sorted(os.listdir(tmp_path / "publish")) == ["anim.abc", "clean.ma"]
+    assert read(tmp_path / "publish" / "clean.ma") == "clean"
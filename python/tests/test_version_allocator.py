@@ -0,0 +1,121 @@
+import multiprocessing
+import os
+from collections import Counter
+
+from vulcain.filesystem import VersionAllocator
+from vulcain.filesystem.version_allocator import advance_hint, read_hint
+
+
+def allocate_versions(directory, name, count):
+    allocator = VersionAllocator(directory, name)
+    return [allocator.allocate().version for _ in range(count)]
+
+
+def publish(reservation, extension="ma"):
+    with open(reservation.file_path(extension), "w") as f:
+        f.write("published")
+
+
+def test_parallel_reservations_are_unique(tmp_path):
+    directory = str(tmp_path)
+    with multiprocessing.Pool(4) as pool:
+        results = pool.starmap(allocate_versions, [(directory, "chair_modeling", 10)] * 16)
+
+    allocated = [version for result in results for version in result]
+    assert not [version for version, count in Counter(allocated).items() if count > 1]
+    assert sorted(allocated) == list(range(1, len(allocated) + 1))
+
+
+def test_publish_names_have_their_own_versions(tmp_path):
+    directory = str(tmp_path)
+    chair = VersionAllocator(directory, "chair")
+    table = VersionAllocator(directory, "table")
+
+    assert [chair.allocate().version, table.allocate().version, chair.allocate().version,
+            table.allocate().version] == [1, 1, 2, 2]
+    assert read_hint(directory, "chair") == 3
+
+
+def test_first_version_follows_existing_publishes(tmp_path):
+    directory = str(tmp_path)
+    for file_name in ("chair_v0004.ma", "table_v0010.ma"):
+        (tmp_path / file_name).write_text("published")
+
+    assert VersionAllocator(directory, "chair").allocate().version == 5
+
+
+def test_hint_never_moves_backward(tmp_path):
+    directory = str(tmp_path)
+    assert advance_hint(directory, "chair", 7)
+    assert advance_hint(directory, "chair", 3)
+    assert read_hint(directory, "chair") == 7
+
+
+def test_commit_removes_marker(tmp_path):
+    directory = str(tmp_path)
+    allocator = VersionAllocator(directory, "chair")
+    reservation = allocator.allocate()
+    publish(reservation)
+    reservation.commit()
+
+    assert not os.path.exists(reservation.marker_path)
+    # Another allocator, without any memory of the first one, never hands the version out again.
+    assert VersionAllocator(directory, "chair").allocate().version == 2
+
+
+def test_release_gives_version_back(tmp_path):
+    directory = str(tmp_path)
+    allocator = VersionAllocator(directory, "chair")
+    allocator.allocate().release()
+
+    assert sorted(os.listdir(directory)) == [".vulcain_next_version.chair"]
+
+
+def test_remove_published_markers(tmp_path):
+    directory = str(tmp_path)
+    allocator = VersionAllocator(directory, "chair")
+    published = allocator.allocate()
+    pending = allocator.allocate()
+    publish(published)
+
+    assert allocator.remove_published_markers() == [1]
+    assert not os.path.exists(published.marker_path)
+    assert os.path.exists(pending.marker_path)
+    assert VersionAllocator(directory, "chair").allocate().version == 3
+
+
+def test_version_published_behind_the_hint_is_skipped(tmp_path):
+    directory = str(tmp_path)
+    allocator = VersionAllocator(directory, "chair")
+    publish(allocator.allocate())
+    # Published without an allocator, or by one committing after this hint was read.
+    (tmp_path / "chair_v0002.ma").write_text("published")
+    (tmp_path / "chair_v0003.abc").write_text("published")
+    advance_hint(directory, "chair", 2)
+
+    reservation = VersionAllocator(directory, "chair").allocate()
+    assert reservation.version == 4
+    assert not os.path.exists(str(tmp_path / "chair_v0002.reserved"))
+
+
+def allocate_publish_commit(directory, name, count):
+    allocator = VersionAllocator(directory, name)
+    versions = []
+    for _ in range(count):
+        reservation = allocator.allocate()
+        # Exclusive create, a version handed out twice fails here.
+        with open(reservation.file_path("ma"), "x") as f:
+            f.write(str(os.getpid()))
+        reservation.commit()
+        versions.append(reservation.version)
+    return versions
+
+
+def test_parallel_publishes_are_unique(tmp_path):
+    directory = str(tmp_path)
+    with multiprocessing.Pool(4) as pool:
+        results = pool.starmap(allocate_publish_commit, [(directory, "chair", 10)] * 16)
+
+    published = sorted(version for result in results for version in result)
+    assert published == list(range(1, len(published) + 1))
+    assert not [file_name for file_name in os.listdir(directory) if file_name.endswith(".reserved")]
@@ -0,0 +1,76 @@
+import os
+import time
+
+from vulcain.filesystem import VersionEntry, VersionIndex, get_version_index
+
+OLD_MTIME_NS = 1_000_000_000
+
+
+def publish(directory, *file_names, mtime_ns=OLD_MTIME_NS):
+    for file_name in file_names:
+        with open(os.path.join(directory, file_name), "w") as f:
+            f.write("")
+    # Explicit folder mtime, older than the racy delay so the listing is cached.
+    os.utime(directory, ns=(mtime_ns, mtime_ns))
+
+
+def test_latest_and_queries(tmp_path):
+    directory = str(tmp_path)
+    publish(directory, "chair_v0001.ma", "chair_v0003.ma", "chair_v0010.ma", "notes.txt")
+    index = VersionIndex(directory)
+
+    assert index.latest() == VersionEntry(10, "chair_v0010.ma")
+    assert index.next_version() == 11
+    assert len(index) == 3
+    assert 3 in index and 2 not in index
+    assert index.get(3) == VersionEntry(3, "chair_v0003.ma")
+    assert index.get(2) is None
+    assert [entry.version for entry in index.range(2, 10)] == [3]
+    assert [entry.version for entry in index.range(start=3)] == [3, 10]
+
+
+def test_empty_or_missing_folder(tmp_path):
+    index = VersionIndex(str(tmp_path / "missing"))
+    assert index.latest() is None
+    assert index.next_version() == 1
+
+
+def test_listing_is_cached_until_the_folder_mtime_changes(tmp_path):
+    directory = str(tmp_path)
+    publish(directory, "chair_v0001.ma")
+    index = VersionIndex(directory)
+    assert index.latest().version == 1
+
+    # Same folder mtime : the cached listing is still used.
+    publish(directory, "chair_v0002.ma")
+    assert index.latest().version == 1
+
+    publish(directory, "chair_v0003.ma", mtime_ns=OLD_MTIME_NS + 1)
+    assert index.latest().version == 3
+
+    index.add("chair_v0004.ma")
+    assert index.latest() == VersionEntry(4, "chair_v0004.ma")
+
+
+def test_recent_folder_is_listed_again(tmp_path):
+    directory = str(tmp_path)
+    publish(directory, "chair_v0001.ma", mtime_ns=time.time_ns())
+    index = VersionIndex(directory)
+    assert index.latest().version == 1
+
+    # Written within the racy delay of the listing, with the same folder mtime.
+    mtime_ns = os.stat(directory).st_mtime_ns
+    publish(directory, "chair_v0002.ma", mtime_ns=mtime_ns)
+    assert index.latest().version == 2
+
+
+def test_filters(tmp_path):
+    directory = str(tmp_path)
+    publish(directory, "chair_v0001.ma", "chair_v0002.abc", "table_v0007.ma", "chair_v0003.reserved")
+
+    assert VersionIndex(directory, extensions=(".ma",)).latest().version == 7
+    assert VersionIndex(directory, name="chair").latest().version == 3
+    assert VersionIndex(directory, name="chair", ignored_suffixes=(".reserved",)).latest().version == 2
+    assert get_version_index(directory).latest().version == 7
+    assert get_version_index(directory) is get_version_index(directory + "/")
+    assert [entry.version for entry in get_version_index(directory, (".abc",)).range()] == [2]
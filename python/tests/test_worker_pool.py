@@ -0,0 +1,63 @@
+import os
+import signal
+import time
+
+from vulcain.context import VulcainContext
+from vulcain.procedure.shared import DefaultSoftware, ProcedureContext, ProcedureStatus, WorkerPool
+
+from procedures import NoOpProcedure
+
+
+class EchoProcedure(NoOpProcedure):
+    """Return the shot of its context, or kill its worker on the 'die' shot."""
+
+    def execute(self):
+        if self.context.context.shot == "die":
+            os.kill(os.getpid(), signal.SIGKILL)
+        self.context.return_value = self.context.context.shot
+
+
+class SlowStartSoftware(DefaultSoftware):
+    """Start slower than the job timeout, so a dead worker job also times out while it is replaced."""
+
+    def start(self):
+        time.sleep(0.3)
+
+
+def make_contexts(*shots):
+    return [ProcedureContext(VulcainContext("shots", shot=shot)) for shot in shots]
+
+
+def test_launch_returns_results_in_order():
+    with WorkerPool(size=2) as pool:
+        report = pool.launch(EchoProcedure, make_contexts("sh010", "sh020", "sh030"))
+
+    assert [result.return_value for result in report.results] == ["sh010", "sh020", "sh030"]
+    assert not report.failed
+
+
+def test_worker_dying_during_job_with_timeout():
+    with WorkerPool(SlowStartSoftware, size=1, job_timeout=0.1) as pool:
+        report = pool.launch(EchoProcedure, make_contexts("sh010", "die", "sh030"))
+
+        assert report.results[0].status == ProcedureStatus.SUCCESS
+        assert report.results[1].status == ProcedureStatus.EXECUTE_FAIL
+        assert "died" in report.results[1].error
+        assert report.results[2].status == ProcedureStatus.SUCCESS
+        assert report.results[2].return_value == "sh030"
+        assert pool.replaced_count == 1
+        assert len(pool.workers) == 1
+
+
+def test_submit_to_worker_dying_after_alive_check(monkeypatch):
+    with WorkerPool(size=1) as pool:
+        worker = pool.workers[0]
+
+        def broken_submit(*args, **kwargs):
+            raise BrokenPipeError()
+
+        monkeypatch.setattr(worker, "submit", broken_submit)
+        report = pool.launch(EchoProcedure, make_contexts("sh010", "sh020"))
+
+        assert [result.return_value for result in report.results] == ["sh010", "sh020"]
+        assert pool.replaced_count == 1
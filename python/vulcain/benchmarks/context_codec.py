@@ -0,0 +1,101 @@
+"""
+Context dispatch : size and time to ship contexts to worker processes, pickling the former dict based
+dataclasses, the slotted ones, and the JSON and binary codecs. Also times the context content hash.
+
+Batches encode every context at once. Workers receive one context per job, encoded on its own.
+
+Usage :
+    python -m vulcain.benchmarks.context_codec [--count 10000] [--repeat 5]
+"""
+import argparse
+import pickle
+from dataclasses import dataclass, field
+
+from vulcain.context import VulcainContext
+from vulcain.procedure.shared import ProcedureContext
+from vulcain.procedure.shared.context_codec import (content_hash, decode, decode_json, decode_many, encode,
+                                                    encode_json, encode_many)
+from vulcain.benchmarks.timing import format_duration, measure
+
+
+@dataclass
+class LegacyVulcainContext:
+    section: str
+    episode: str = ""
+    sequence: str = ""
+    shot: str = ""
+    asset: str = ""
+    step: str = ""
+    task: str = ""
+    version: int = None
+    software: str = ""
+    extra: str = ""
+    labels: list = field(default_factory=list)
+
+
+@dataclass
+class LegacyProcedureContext:
+    context: LegacyVulcainContext = None
+    input_args: dict = field(default_factory=dict)
+    any_context: dict = field(default_factory=dict)
+    return_value: object = None
+
+
+def make_contexts(count: int, context_type=VulcainContext, procedure_type=ProcedureContext):
+    """Shot contexts of a batch, sharing their section, episode and task like a real one."""
+    return [procedure_type(context_type("shots", episode=f"e{index // 500:02}", sequence=f"sq{index // 50:03}",
+                                        shot=f"sh{index:05}", step="anim", task="publish", version=index % 7 + 1,
+                                        software="maya"),
+                           input_args={"frame_range": [1001, 1100]})
+            for index in range(count)]
+
+
+def run(count=10000, repeat=5):
+    legacy = make_contexts(count, LegacyVulcainContext, LegacyProcedureContext)
+    contexts = make_contexts(count)
+
+    pickled_legacy = pickle.dumps(legacy, pickle.HIGHEST_PROTOCOL)
+    pickled = pickle.dumps(contexts, pickle.HIGHEST_PROTOCOL)
+    json_data = encode_json(contexts)
+    binary = encode_many(contexts)
+
+    pickled_jobs = [pickle.dumps(context, pickle.HIGHEST_PROTOCOL) for context in contexts]
+    binary_jobs = [encode(context) for context in contexts]
+
+    scenarios = (
+        ("pickle legacy dataclasses", len(pickled_legacy),
+         lambda: pickle.dumps(legacy, pickle.HIGHEST_PROTOCOL), lambda: pickle.loads(pickled_legacy)),
+        ("pickle slotted dataclasses", len(pickled),
+         lambda: pickle.dumps(contexts, pickle.HIGHEST_PROTOCOL), lambda: pickle.loads(pickled)),
+        ("json codec", len(json_data.encode("utf-8")),
+         lambda: encode_json(contexts), lambda: decode_json(json_data)),
+        ("binary codec", len(binary),
+         lambda: encode_many(contexts), lambda: decode_many(binary)),
+        ("pickle slotted, per job", sum(map(len, pickled_jobs)),
+         lambda: [pickle.dumps(context, pickle.HIGHEST_PROTOCOL) for context in contexts],
+         lambda: [pickle.loads(data) for data in pickled_jobs]),
+        ("binary codec, per job", sum(map(len, binary_jobs)),
+         lambda: [encode(context) for context in contexts], lambda: [decode(data) for data in binary_jobs]),
+    )
+
+    print(f"{count} procedure contexts")
+    for name, size, encode_func, decode_func in scenarios:
+        encode_duration = measure(encode_func, number=1, repeat=repeat)
+        decode_duration = measure(decode_func, number=1, repeat=repeat)
+        print(f"    {name:<28} {size:>10} bytes, {size / count:>6.1f} per context, "
+              f"encode {format_duration(encode_duration):>12}, decode {format_duration(decode_duration):>12}")
+
+    hash_duration = measure(lambda: [content_hash(context) for context in contexts], number=1, repeat=repeat)
+    print(f"    content hash {format_duration(hash_duration / count):>12} per context")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m vulcain.benchmarks.context_codec")
+    parser.add_argument("--count", type=int, default=10000, help="Number of contexts in the batch.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measure, the fastest one is kept.")
+    args = parser.parse_args(argv)
+    run(args.count, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Per lookup cost of vulcain.parametric : json parsing on every call against the cached ParamStore.
+
+Usage :
+    python -m vulcain.benchmarks.params
+"""
+import os
+import tempfile
+
+import vulcain.helpers.json as json_helpers
+from vulcain.parametric.main import VULCAIN_PARAMS_FILE_PATH
+from vulcain.parametric.store import ParamLayer, ParamStore
+from vulcain.benchmarks.timing import measure, print_comparison
+
+
+def legacy_param(key, vulcain_params_file_path, project_params_file_path):
+    """Lookup as done before ParamStore : both files are parsed on every call."""
+    vulcain_params = json_helpers.load_data(vulcain_params_file_path)
+    project_params = json_helpers.load_data(project_params_file_path)
+
+    if key in project_params:
+        return project_params.get(key)
+    elif key in vulcain_params:
+        return vulcain_params.get(key)
+    else:
+        raise ValueError(f"Param key : '{key}' does not exists.")
+
+
+def run(number=2000):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        project_params_file_path = os.path.join(tmp_dir, "params.json")
+        json_helpers.dump_data(project_params_file_path, {"project.fps": 25})
+
+        store = ParamStore([
+            ParamLayer(VULCAIN_PARAMS_FILE_PATH),
+            ParamLayer(project_params_file_path)
+        ])
+
+        before = measure(lambda: legacy_param("maya.up_axis", VULCAIN_PARAMS_FILE_PATH, project_params_file_path),
+                         number=number)
+        after = measure(lambda: store.get("maya.up_axis"), number=number * 100)
+        print_comparison("param('maya.up_axis') per lookup", before, after)
+
+        # Worst case for the store : a stat of every layer on each lookup.
+        store.check_interval = 0.0
+        after_stat = measure(lambda: store.get("maya.up_axis"), number=number * 10)
+        print_comparison("param('maya.up_axis') per lookup, check_interval=0", before, after_stat)
+
+        maya_keys = store.keys("maya")
+        before = measure(lambda: [legacy_param(key, VULCAIN_PARAMS_FILE_PATH, project_params_file_path)
+                                  for key in maya_keys], number=number // 10)
+        after = measure(lambda: store.get_prefix("maya"), number=number * 10)
+        print_comparison(f"every 'maya.*' param ({len(maya_keys)} keys)", before, after)
+
+
+if __name__ == "__main__":
+    run()
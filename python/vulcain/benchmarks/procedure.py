@@ -0,0 +1,250 @@
+"""
+Overhead of the procedure framework itself : Procedure construction, launch() and run() dispatch,
+ProcedureContext handling and UI callbacks, with DefaultSoftware and a stub UI, at 1, 1k and 100k
+launches. Batch and parallel scenarios run the same procedures through BatchLauncher, WorkerPool and
+ProcessExecutor.
+
+Results are saved as JSON to compare the core loop between releases.
+
+Usage :
+    python -m vulcain.benchmarks.procedure [--counts 1 1000 100000] [--parallel-count 1000] [--repeat 3]
+                                           [--output results.json] [--compare previous.json]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from vulcain.context import VulcainContext
+from vulcain.procedure.shared import (BatchLauncher, DefaultSoftware, Process, ProcessExecutor, Procedure,
+                                      ProcedureContext, ProcedureUI, WorkerPool, FieldExpander)
+from vulcain.benchmarks.timing import format_duration
+
+RESULTS_FORMAT_VERSION = 1
+
+# A scenario slower than the compared one by more than this ratio is reported as a regression.
+REGRESSION_RATIO = 1.2
+
+
+class StubUI(ProcedureUI):
+    """UI counting its callbacks, without printing anything."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def show_end_success_message(self, procedure_name: str) -> None:
+        self.calls += 1
+
+    def show_end_fail_message(self, procedure_name: str, message: str = "") -> None:
+        self.calls += 1
+
+
+class NoOpProcedure(Procedure):
+    def pre_check(self):
+        pass
+
+    def check(self):
+        pass
+
+    def post_check(self):
+        pass
+
+    def pre_execute(self):
+        pass
+
+    def execute(self):
+        pass
+
+    def post_execute(self):
+        pass
+
+    def pre_revert(self):
+        pass
+
+    def revert(self):
+        pass
+
+    def post_revert(self):
+        pass
+
+
+class SyntheticProcedure(NoOpProcedure):
+    """Reads and returns a new ProcedureContext from check, and sets a return value, like a real procedure."""
+
+    def check(self):
+        return ProcedureContext(self.context.context, dict(self.context.input_args), self.context.any_context)
+
+    def execute(self):
+        self.context.any_context["asset"] = self.context.context.asset
+        self.context.return_value = len(self.context.input_args)
+
+
+class NoOpProcess(Process):
+    def check(self, context):
+        pass
+
+    def execute(self, context):
+        context.return_value = context.context.shot
+        return context
+
+    def revert(self, context):
+        pass
+
+
+def make_context(index: int = 0) -> ProcedureContext:
+    return ProcedureContext(VulcainContext("assets", asset=f"asset{index:05d}", task="modeling"),
+                            input_args={"index": index})
+
+
+def timed(function, count: int, repeat: int = 1) -> float:
+    """Return the best duration of repeat calls of function(count)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(count)
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return best
+
+
+def construct(count: int) -> None:
+    context = make_context()
+    for _ in range(count):
+        NoOpProcedure(context)
+
+
+def launch_noop(count: int) -> None:
+    context = make_context()
+    ui = StubUI()
+    for _ in range(count):
+        NoOpProcedure(context, ui).launch()
+
+
+def run_noop(count: int) -> None:
+    context = make_context()
+    dcc = DefaultSoftware()
+    for _ in range(count):
+        NoOpProcedure(context, dcc=dcc).run()
+
+
+def launch_synthetic(count: int) -> None:
+    ui = StubUI()
+    for index in range(count):
+        SyntheticProcedure(make_context(index), ui).launch()
+
+
+def batch_synthetic(count: int) -> None:
+    BatchLauncher(SyntheticProcedure, ui=StubUI()).launch(make_context(index) for index in range(count))
+
+
+def worker_pool_synthetic(count: int) -> None:
+    with WorkerPool(DefaultSoftware, max_jobs_per_worker=None) as pool:
+        pool.launch(SyntheticProcedure, [make_context(index) for index in range(count)])
+
+
+def process_executor_noop(count: int) -> None:
+    context = ProcedureContext(VulcainContext("shots", sequence="sq010"))
+    expander = FieldExpander("shot", [f"sh{index:04d}" for index in range(count)])
+    ProcessExecutor([NoOpProcess()], expander).execute(context)
+
+
+SCENARIOS = (
+    ("construct", construct),
+    ("launch_noop", launch_noop),
+    ("run_noop", run_noop),
+    ("launch_synthetic", launch_synthetic),
+    ("batch_synthetic", batch_synthetic),
+)
+
+PARALLEL_SCENARIOS = (
+    ("worker_pool_synthetic", worker_pool_synthetic),
+    ("process_executor_noop", process_executor_noop),
+)
+
+
+def result(name: str, count: int, duration: float) -> dict:
+    return {
+        "scenario": name,
+        "count": count,
+        "duration": duration,
+        "per_launch": duration / count,
+        "launches_per_second": count / duration if duration else None
+    }
+
+
+def run(counts=(1, 1000, 100000), parallel_count=1000, repeat=3) -> dict:
+    """
+    Returns:
+        results (dict) : Machine and Python description, and one result per scenario and count.
+    """
+    results = []
+    for name, function in SCENARIOS:
+        for count in counts:
+            results.append(result(name, count, timed(function, count, repeat)))
+
+    if parallel_count:
+        for name, function in PARALLEL_SCENARIOS:
+            results.append(result(name, parallel_count, timed(function, parallel_count, repeat)))
+
+    return {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "time": time.time(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+        "results": results
+    }
+
+
+def compare(results: dict, previous: dict) -> list:
+    """
+    Returns:
+        regressions (list) : (scenario, count, ratio) of the scenarios slower than the previous ones.
+    """
+    previous_durations = {(item["scenario"], item["count"]): item["per_launch"] for item in previous["results"]}
+    regressions = []
+    for item in results["results"]:
+        before = previous_durations.get((item["scenario"], item["count"]))
+        if not before:
+            continue
+        ratio = item["per_launch"] / before
+        print(f"{item['scenario']:<24} x{item['count']:<7} {format_duration(before):>12} -> "
+              f"{format_duration(item['per_launch']):>12}  x{ratio:.2f}")
+        if ratio > REGRESSION_RATIO:
+            regressions.append((item["scenario"], item["count"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m vulcain.benchmarks.procedure")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 1000, 100000],
+                        help="Launches of every in process scenario.")
+    parser.add_argument("--parallel-count", type=int, default=1000,
+                        help="Launches of the worker pool and process executor scenarios, 0 to skip them.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of every scenario, the fastest one is kept.")
+    parser.add_argument("--output", default=None, help="JSON file where the results are saved.")
+    parser.add_argument("--compare", default=None, help="JSON results of a previous run to compare with.")
+    args = parser.parse_args(argv)
+
+    results = run(args.counts, args.parallel_count, args.repeat)
+    for item in results["results"]:
+        print(f"{item['scenario']:<24} x{item['count']:<7} total {format_duration(item['duration']):>12}, "
+              f"per launch {format_duration(item['per_launch']):>12}")
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=4)
+
+    if args.compare:
+        with open(args.compare, "r") as previous_file:
+            regressions = compare(results, json.load(previous_file))
+        if regressions:
+            raise SystemExit(f"Regressions over x{REGRESSION_RATIO} : {regressions}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Progress updates : one UI call per item against the coalescing ProgressReporter, for 1M progress ticks.
+
+Usage :
+    python -m vulcain.benchmarks.progress [--ticks 1000000] [--interval 0.1]
+"""
+import argparse
+import os
+import time
+
+from vulcain.procedure.shared.ui import NullUI, ProgressReporter, TerminalUI
+from vulcain.benchmarks.timing import format_duration
+
+
+class CountingUI(NullUI):
+    """UI doing a little work per update, like building a Qt progress text."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def show_progress(self, procedure_name, stage, done, total=None, message=""):
+        self.calls += 1
+        self.text = f"{procedure_name} [{stage}] {done}/{total}"
+
+
+def naive(ui, ticks: int) -> int:
+    for done in range(1, ticks + 1):
+        ui.show_progress("Benchmark", "export", done, ticks)
+    return ticks
+
+
+def coalesced(ui, ticks: int, interval: float) -> int:
+    reporter = ProgressReporter(ui, "Benchmark", interval)
+    reporter.update("export", total=ticks)
+    for _ in range(ticks):
+        reporter.advance()
+    reporter.flush()
+    return reporter.sent
+
+
+def run(ticks=1000000, interval=0.1):
+    with open(os.devnull, "w") as devnull:
+        for name, make_ui in (("null ui", NullUI), ("counting ui", CountingUI),
+                              ("terminal ui", lambda: TerminalUI(devnull))):
+            for mode, function in (("naive", lambda ui: naive(ui, ticks)),
+                                   ("coalesced", lambda ui: coalesced(ui, ticks, interval))):
+                ui = make_ui()
+                start = time.perf_counter()
+                sent = function(ui)
+                duration = time.perf_counter() - start
+                print(f"{name:<12} {mode:<10} {ticks} ticks in {format_duration(duration):>12}, "
+                      f"{format_duration(duration / ticks):>10} per tick, {sent} ui updates")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m vulcain.benchmarks.progress")
+    parser.add_argument("--ticks", type=int, default=1000000, help="Number of progress ticks.")
+    parser.add_argument("--interval", type=float, default=0.1, help="Reporter interval in seconds.")
+    args = parser.parse_args(argv)
+    run(args.ticks, args.interval)
+
+
+if __name__ == "__main__":
+    main()
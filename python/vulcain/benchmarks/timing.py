@@ -0,0 +1,39 @@
+import time
+
+
+def measure(func, number: int = 1000, repeat: int = 5) -> float:
+    """
+    Time 'func' and return the best per call duration.
+
+    Args :
+        func (callable) : Function to call without arguments.
+        number (int) : Number of calls per run.
+        repeat (int) : Number of runs, the fastest one is kept.
+
+    Returns:
+        per_call (float) : Best duration of a single call in seconds.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best / number
+
+
+def format_duration(seconds: float) -> str:
+    for unit, factor in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= factor:
+            return f"{seconds / factor:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def print_comparison(title: str, before: float, after: float) -> None:
+    print(f"{title}")
+    print(f"    before : {format_duration(before)}")
+    print(f"    after  : {format_duration(after)}")
+    print(f"    speedup : x{before / after:.1f}")
@@ -0,0 +1,69 @@
+"""
+Stress test of VersionAllocator : hundreds of allocators reserving versions of the same
+publish concurrently from a process pool. Checks that no version is handed out twice
+and measures the reservations throughput.
+
+Usage :
+    python -m vulcain.benchmarks.version_allocator [--allocators 400] [--processes 32] [--versions 5]
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import Counter
+
+from vulcain.filesystem import VersionAllocator
+
+
+def allocate_versions(directory, name, count):
+    allocator = VersionAllocator(directory, name)
+    return [allocator.allocate().version for _ in range(count)]
+
+
+def run(allocators=400, processes=32, versions=5, directory=None):
+    """
+    Returns:
+        result (dict) : Reservations count, duplicated versions and throughput.
+    """
+    with tempfile.TemporaryDirectory(dir=directory) as tmp_dir:
+        start = time.perf_counter()
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.starmap(allocate_versions, [(tmp_dir, "chair_modeling", versions)] * allocators)
+        duration = time.perf_counter() - start
+
+        allocated = [version for result in results for version in result]
+        duplicates = sorted(version for version, count in Counter(allocated).items() if count > 1)
+        markers = len(os.listdir(tmp_dir))
+
+    return {
+        "allocators": allocators,
+        "processes": processes,
+        "reservations": len(allocated),
+        "markers": markers,
+        "duplicates": duplicates,
+        "contiguous": sorted(allocated) == list(range(1, len(allocated) + 1)),
+        "duration": duration,
+        "reservations_per_second": len(allocated) / duration
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m vulcain.benchmarks.version_allocator")
+    parser.add_argument("--allocators", type=int, default=400, help="Number of concurrent allocators.")
+    parser.add_argument("--processes", type=int, default=32, help="Size of the process pool.")
+    parser.add_argument("--versions", type=int, default=5, help="Versions reserved by each allocator.")
+    parser.add_argument("--directory", default=None,
+                        help="Where to create the publish folder, like a network share. Default to the temp dir.")
+    args = parser.parse_args(argv)
+
+    result = run(args.allocators, args.processes, args.versions, args.directory)
+    for key, value in result.items():
+        print(f"{key} : {value}")
+
+    if result["duplicates"]:
+        raise SystemExit("Duplicated versions were handed out.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+VulcainPath : the previous class, splitting its string in every accessor, against the slotted
+pre-parsed VulcainPath and the columnar parse_many.
+
+Usage :
+    python -m vulcain.benchmarks.vulcain_path [--count 1000000]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from vulcain.procedure.shared.vulcain_path import VulcainPath, parse_many
+from vulcain.benchmarks.timing import format_duration, measure, print_comparison
+
+
+class LegacyVulcainPath():
+    """VulcainPath as it was before being parsed once."""
+
+    def __init__(self, param):
+        self.param = param
+        self.entity = self.param.split("~")[1]
+
+    def is_asset(self):
+        return self.param.split("~")[0] == "asset"
+
+    def is_asset_task(self):
+        return len(self.entity.split("/")) >= 3
+
+    def is_asset_version(self):
+        return len(self.entity.split("/")) >= 4
+
+    def get_entity_type(self):
+        if self.is_asset():
+            return self.entity.split("/")[0]
+        return None
+
+    def get_entity_version(self):
+        if self.is_asset() and self.is_asset_version():
+            return self.entity.split("/")[3]
+        return None
+
+
+def make_params(count):
+    entity_types = ("props", "chars", "sets", "vehicles")
+    tasks = ("modeling", "rigging", "lookdev", "groom")
+    return [f"asset~{entity_types[index % 4]}/asset{index % 5000:04d}/{tasks[index % 3]}/v{index % 40:04d}"
+            for index in range(count)]
+
+
+def traced(build):
+    """Return (result, allocated bytes, duration) of build(). Memory is traced on a second build."""
+    gc.collect()
+    start = time.perf_counter()
+    build()
+    duration = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, allocated, duration
+
+
+def run(count=1000000):
+    params = make_params(count)
+
+    legacy = LegacyVulcainPath(params[0])
+    path = VulcainPath(params[0])
+    print_comparison("get_entity_version() per call",
+                     measure(legacy.get_entity_version, number=100000),
+                     measure(path.get_entity_version, number=100000))
+
+    results = dict()
+    for name, build in (("legacy objects", lambda: [LegacyVulcainPath(param) for param in params]),
+                        ("slotted objects", lambda: [VulcainPath(param) for param in params]),
+                        ("parse_many columns", lambda: parse_many(params))):
+        result, allocated, duration = traced(build)
+        results[name] = result
+        print(f"{name} x{count} : {allocated / 2**20:.1f} MiB, built in {format_duration(duration)}")
+
+    for name, query in (("legacy objects", lambda: [item.get_entity_type() for item in results["legacy objects"]]),
+                        ("slotted objects", lambda: [item.get_entity_type() for item in results["slotted objects"]]),
+                        ("parse_many columns", lambda: results["parse_many columns"].column("entity_type"))):
+        start = time.perf_counter()
+        query()
+        print(f"every entity type from {name} : {format_duration(time.perf_counter() - start)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m vulcain.benchmarks.vulcain_path")
+    parser.add_argument("--count", type=int, default=1000000, help="Number of entity strings.")
+    args = parser.parse_args(argv)
+    run(args.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 from dataclasses import dataclass, field
 
+from vulcain.helpers.slots import add_slots
 
+
+@add_slots
 @dataclass
 class VulcainContext:
     section: str
@@ -10,7 +13,12 @@ class VulcainContext:
     asset: str = ""
     step: str = ""
     task: str = ""
-    version: int = field(default_factory=None)
+    version: int = None
     software: str = ""
     extra: str = ""
-    labels: list = field(default_factory=list)   
+    labels: list = field(default_factory=list)
+
+    def __reduce__(self):
+        # Positional arguments pickle smaller and faster than the slots state of the dataclass.
+        return (self.__class__, (self.section, self.episode, self.sequence, self.shot, self.asset, self.step,
+                                 self.task, self.version, self.software, self.extra, self.labels))
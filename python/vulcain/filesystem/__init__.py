@@ -0,0 +1,20 @@
+from .entity_index import EntityIndex, ScanStats
+from .version_index import VersionEntry, VersionIndex, get_version_index, format_version
+from .version_allocator import VersionAllocationError, VersionReservation, VersionAllocator
+
+__all__ = [
+    # entity_index
+    "EntityIndex",
+    "ScanStats",
+
+    # version_index
+    "VersionEntry",
+    "VersionIndex",
+    "get_version_index",
+    "format_version",
+
+    # version_allocator
+    "VersionAllocationError",
+    "VersionReservation",
+    "VersionAllocator"
+]
@@ -0,0 +1,236 @@
+import json
+import os
+import time
+from dataclasses import dataclass
+
+import vulcain.helpers.json as json_helpers
+from vulcain.logger import Logger
+from vulcain.templates import PathParser, ParsedPath, parse_version
+from vulcain.templates.parser import normalize_path
+from .version_index import RACY_MTIME_DELAY_NS, RESERVATION_SUFFIX
+
+logger = Logger(name="Entity Index")
+
+# Increment when the index file layout changes, older index files are then ignored.
+INDEX_FORMAT_VERSION = 1
+
+
+@dataclass
+class ScanStats:
+    listed: int = 0
+    reused: int = 0
+    removed: int = 0
+    duration: float = 0.0
+
+
+class EntityIndex():
+    """
+    Index of the entities, tasks, steps and versions directories of a project tree.
+
+    Only directories matching a path template are visited. A directory is listed again
+    only if its mtime changed since the previous scan, other ones reuse their indexed listing.
+
+    Args :
+        root_path (str) : Directory to scan, like the env root directory of the project.
+        parser (PathParser) : Parser used to classify the directories.
+        index_file_path (str) : Optional file where the index is persisted between processes.
+    """
+
+    def __init__(self, root_path: str, parser: PathParser, index_file_path: str = None) -> None:
+        self.root_path = normalize_path(root_path)
+        self.parser = parser
+        self.index_file_path = index_file_path
+        # Directory path -> (mtime_ns, sub directories names, files names).
+        self._directories = dict()
+        self._parsed = dict()
+
+        if index_file_path:
+            self.load()
+
+    def load(self) -> bool:
+        """Load the persisted index. Returns False if there is no valid index file."""
+        try:
+            data = json_helpers.load_data(self.index_file_path)
+        except FileNotFoundError:
+            return False
+        except ValueError:
+            logger.warning(f"Entity index : '{self.index_file_path}' is corrupted. A full scan is needed.")
+            return False
+
+        if data.get("format_version") != INDEX_FORMAT_VERSION or data.get("root_path") != self.root_path:
+            return False
+
+        self._directories = {self._absolute(relative_path): (mtime_ns, dirs, files)
+                             for relative_path, (mtime_ns, dirs, files) in data["directories"].items()}
+        self._parsed = {path: self.parser.parse(path) for path in self._directories}
+        return True
+
+    def save(self) -> None:
+        if not self.index_file_path:
+            return
+
+        root_length = len(self.root_path)
+        data = {"format_version": INDEX_FORMAT_VERSION,
+                "root_path": self.root_path,
+                "directories": {path[root_length:]: listing for path, listing in self._directories.items()}}
+
+        # Written aside then renamed, so readers never load a partial index.
+        tmp_path = f"{self.index_file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as write_file:
+            json.dump(data, write_file)
+        os.replace(tmp_path, self.index_file_path)
+
+    def _absolute(self, relative_path: str) -> str:
+        return self.root_path + relative_path
+
+    def scan(self, save: bool = True) -> ScanStats:
+        """
+        Update the index from the filesystem.
+
+        Args :
+            save (bool) : Persist the index after the scan, if the index has a file.
+
+        Returns:
+            stats (ScanStats) : Number of listed and reused directories.
+        """
+        start = time.perf_counter()
+        stats = ScanStats()
+        previous = self._directories
+        directories = dict()
+        parsed = dict()
+
+        stack = [(self.root_path, self._parse(self.root_path))]
+        while stack:
+            path, parsed_path = stack.pop()
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                continue
+
+            listing = previous.get(path)
+            if listing is not None and listing[0] == mtime_ns:
+                stats.reused += 1
+            else:
+                listing = self._list(path, mtime_ns)
+                if listing is None:
+                    continue
+                stats.listed += 1
+
+            directories[path] = listing
+            parsed[path] = parsed_path
+
+            for dir_name in listing[1]:
+                child_path = f"{path}/{dir_name}"
+                # Directories outside of the templates hierarchy are not indexed.
+                child_parsed = self._parse(child_path)
+                if child_parsed is not None:
+                    stack.append((child_path, child_parsed))
+
+        stats.removed = len(set(previous) - set(directories))
+        self._directories = directories
+        self._parsed = parsed
+
+        stats.duration = time.perf_counter() - start
+        logger.debug(f"Scanned '{self.root_path}' : {stats}.")
+
+        if save:
+            self.save()
+        return stats
+
+    def _parse(self, path: str):
+        if path in self._parsed:
+            return self._parsed[path]
+        return self.parser.parse(path)
+
+    @staticmethod
+    def _list(path: str, mtime_ns: int):
+        # A directory modified too recently is listed again on the next scan.
+        if time.time_ns() - mtime_ns < RACY_MTIME_DELAY_NS:
+            mtime_ns = -1
+
+        dirs = []
+        files = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.name)
+                    else:
+                        files.append(entry.name)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return (mtime_ns, sorted(dirs), sorted(files))
+
+    def __len__(self) -> int:
+        return len(self._directories)
+
+    def entities(self, template: str = None, **inputs):
+        """
+        Yield the indexed directories matching a template and inputs.
+
+        Args :
+            template (str) : Template name, like 'task_dir_path'. Default to every template.
+            inputs : Inputs values to match, like entity_type='props'.
+
+        Yields:
+            parsed (ParsedPath) : Parsed directory.
+        """
+        for parsed in self._parsed.values():
+            if parsed is None or (template and parsed.template != template):
+                continue
+            if all(parsed.inputs.get(key) == value for key, value in inputs.items()):
+                yield parsed
+
+    def files(self, path: str) -> list:
+        """Return the indexed files names of a directory."""
+        listing = self._directories.get(normalize_path(path))
+        return list(listing[2]) if listing else []
+
+    def versions(self, template: str = None, **inputs):
+        """
+        Yield every versioned file of the directories matching a template and inputs.
+        Reserved versions that are not published yet are skipped.
+
+        Yields:
+            parsed (ParsedPath) : Parsed file, with file_name and version set.
+        """
+        for path, parsed in self._parsed.items():
+            if parsed is None or (template and parsed.template != template):
+                continue
+            if not all(parsed.inputs.get(key) == value for key, value in inputs.items()):
+                continue
+
+            for file_name in self._directories[path][2]:
+                if file_name.endswith(RESERVATION_SUFFIX):
+                    continue
+                version = parse_version(file_name)
+                if version is not None:
+                    yield ParsedPath(parsed.template, parsed.group, dict(parsed.inputs), file_name, version,
+                                     f"{path}/{file_name}")
+
+    def tree_versions(self, path: str):
+        """
+        Yield every versioned file of an indexed directory and of its indexed sub directories.
+        Reserved versions that are not published yet are skipped.
+
+        Yields:
+            parsed (ParsedPath) : Parsed file, with file_name and version set.
+        """
+        stack = [normalize_path(path)]
+        while stack:
+            directory = stack.pop()
+            listing = self._directories.get(directory)
+            if listing is None:
+                continue
+            parsed = self._parsed.get(directory)
+
+            if parsed is not None:
+                for file_name in listing[2]:
+                    if file_name.endswith(RESERVATION_SUFFIX):
+                        continue
+                    version = parse_version(file_name)
+                    if version is not None:
+                        yield ParsedPath(parsed.template, parsed.group, dict(parsed.inputs), file_name, version,
+                                         f"{directory}/{file_name}")
+
+            stack.extend(f"{directory}/{dir_name}" for dir_name in listing[1])
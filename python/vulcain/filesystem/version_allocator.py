@@ -0,0 +1,219 @@
+import glob
+import os
+import socket
+from dataclasses import dataclass
+
+from vulcain.logger import Logger
+from vulcain.templates import parse_version
+from .version_index import RESERVATION_SUFFIX, VersionIndex, format_version
+
+logger = Logger(name="Version Allocator")
+
+# Consecutive taken versions probed before listing the folder again to jump ahead.
+COLLISIONS_BEFORE_REFRESH = 32
+
+# File of the publish folder holding the next free version of a publish name, suffixed with the name.
+# It is only a hint to start probing from.
+NEXT_VERSION_HINT_FILE_NAME = ".vulcain_next_version"
+
+# Writes of a hint overwritten by a concurrent, slower, allocator before giving up.
+HINT_WRITE_ATTEMPTS = 3
+
+
+class VersionAllocationError(RuntimeError):
+    pass
+
+
+def hint_path(directory: str, name: str) -> str:
+    return os.path.join(directory, f"{NEXT_VERSION_HINT_FILE_NAME}.{name}")
+
+
+def read_hint(directory: str, name: str):
+    """Return the next version hint of a publish name, None if there is none."""
+    try:
+        with open(hint_path(directory, name), "r") as hint_file:
+            return int(hint_file.read())
+    except (OSError, ValueError):
+        return None
+
+
+def advance_hint(directory: str, name: str, version: int) -> bool:
+    """
+    Move the next version hint of a publish name forward to 'version', never backward.
+
+    The hint is read again after every write : an allocator reading it before this write and
+    writing a lower one after it is overwritten again.
+
+    Returns:
+        advanced (bool) : True if the hint is at 'version' or after it.
+    """
+    path = hint_path(directory, name)
+    for _ in range(HINT_WRITE_ATTEMPTS):
+        current = read_hint(directory, name)
+        if current is not None and current >= version:
+            return True
+        # Written aside then renamed, concurrent readers never read a partial hint.
+        tmp_path = f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as hint_file:
+                hint_file.write(str(version))
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.debug(f"Could not write the next version hint of '{name}' in '{directory}'.")
+            return False
+    current = read_hint(directory, name)
+    return current is not None and current >= version
+
+
+@dataclass
+class VersionReservation:
+    directory: str
+    name: str
+    version: int
+    marker_path: str
+
+    def file_name(self, extension: str) -> str:
+        """Return the publish file name of the reserved version, like 'chair_modeling_v0003.ma'."""
+        return f"{self.name}_{format_version(self.version)}.{extension.lstrip('.')}"
+
+    def file_path(self, extension: str) -> str:
+        return os.path.join(self.directory, self.file_name(extension)).replace("\\", "/")
+
+    def commit(self) -> None:
+        """
+        Remove the marker once the version is published, its publish file now holds the version.
+
+        The marker is kept if the next version hint can not be moved past the version, it is then
+        the only thing keeping the version from being handed out again.
+        """
+        if not advance_hint(self.directory, self.name, self.version + 1):
+            logger.warning(f"Version : '{self.version}' of '{self.name}' is published but the next version "
+                           f"hint could not be written, its marker is kept.")
+            return
+        try:
+            os.remove(self.marker_path)
+        except FileNotFoundError:
+            pass
+
+    def release(self) -> None:
+        """Give the version back, when nothing has been published with it."""
+        try:
+            os.remove(self.marker_path)
+        except FileNotFoundError:
+            pass
+
+
+class VersionAllocator():
+    """
+    Reserve publish versions atomically, even between processes on different hosts.
+
+    A version is reserved by creating its marker file, 'name_v0003.reserved', with O_CREAT | O_EXCL :
+    only one process can create a given marker. Markers are ignored by the publish VersionIndex,
+    and removed once the version is published, see VersionReservation.commit.
+
+    The first candidate version comes from the next version hint file of the publish name, moved forward
+    after every reservation, or from a listing of the folder if there is no hint. The hint is only where
+    probing starts : once its marker is created, a version is still skipped if a publish file holds it,
+    since committed versions have no marker anymore. Taken versions are skipped by probing the next
+    markers, the folder is listed again only on repeated collisions.
+
+    Args :
+        directory (str) : Publish folder.
+        name (str) : Publish name, the file names are '<name>_v0001.<ext>'.
+        max_attempts (int) : Number of taken versions skipped before giving up.
+    """
+
+    def __init__(self, directory: str, name: str, max_attempts: int = 1000) -> None:
+        self.directory = directory
+        self.name = name
+        self.max_attempts = max_attempts
+        # Reservation markers are indexed too, they are taken versions.
+        self._index = VersionIndex(directory, name=name)
+        self._next_version = None
+
+    def _marker_path(self, version: int) -> str:
+        return os.path.join(self.directory, f"{self.name}_{format_version(version)}{RESERVATION_SUFFIX}")
+
+    def _is_published(self, version: int) -> bool:
+        pattern = os.path.join(glob.escape(self.directory), f"{glob.escape(self.name)}_{format_version(version)}.*")
+        return any(not file_path.endswith(RESERVATION_SUFFIX) for file_path in glob.iglob(pattern))
+
+    def allocate(self) -> VersionReservation:
+        """
+        Reserve the next free version of the publish name.
+
+        Raises:
+            VersionAllocationError : If no version could be reserved after max_attempts.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        # Read on every reservation, other allocators may have moved it since the last one.
+        hint = read_hint(self.directory, self.name)
+        if self._next_version is None and hint is None:
+            self._next_version = self._index.next_version()
+        version = max(self._next_version or 1, hint or 1)
+
+        for attempt in range(1, self.max_attempts + 1):
+            marker_path = self._marker_path(version)
+            try:
+                fd = os.open(marker_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                version += 1
+                if attempt % COLLISIONS_BEFORE_REFRESH == 0:
+                    self._index.refresh(force=True)
+                    version = max(version, self._index.next_version())
+                continue
+
+            with os.fdopen(fd, "w") as marker_file:
+                marker_file.write(f"{socket.gethostname()} {os.getpid()}\n")
+
+            # The marker of a committed version is removed, its publish file is what holds it then.
+            # The hint may also be older than that publish, or the file published without an allocator.
+            if self._is_published(version):
+                os.remove(marker_path)
+                self._index.refresh(force=True)
+                version = max(version + 1, self._index.next_version())
+                continue
+
+            self._next_version = version + 1
+            advance_hint(self.directory, self.name, self._next_version)
+            logger.debug(f"Reserved version : '{version}' of '{self.name}' in '{self.directory}'.")
+            return VersionReservation(self.directory, self.name, version, marker_path)
+
+        raise VersionAllocationError(f"Could not reserve a version of '{self.name}' in '{self.directory}' "
+                                     f"after {self.max_attempts} attempts.")
+
+    def remove_published_markers(self) -> list:
+        """
+        Remove the markers of the versions already published, left by publishes not committing their reservation.
+
+        Returns:
+            versions (list) : Versions whose marker was removed.
+        """
+        prefix = f"{self.name}_v"
+        markers = dict()
+        published = set()
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if not entry.name.startswith(prefix):
+                        continue
+                    version = parse_version(entry.name)
+                    if version is None:
+                        continue
+                    if entry.name.endswith(RESERVATION_SUFFIX):
+                        markers[version] = entry.path
+                    else:
+                        published.add(version)
+        except FileNotFoundError:
+            return []
+
+        versions = sorted(version for version in markers if version in published)
+        # The hint has to be past the versions before their markers are removed.
+        if not versions or not advance_hint(self.directory, self.name, versions[-1] + 1):
+            return []
+        for version in versions:
+            try:
+                os.remove(markers[version])
+            except FileNotFoundError:
+                pass
+        return versions
@@ -0,0 +1,152 @@
+import bisect
+import os
+import time
+from typing import NamedTuple
+
+from vulcain.templates import parse_version
+
+VERSION_PADDING = 4
+
+# Marker files of the versions reserved by a VersionAllocator, see version_allocator.
+RESERVATION_SUFFIX = ".reserved"
+
+# A folder modified less than this delay ago may still change within the same mtime tick
+# on network filesystems with a coarse mtime, its listing is not trusted for caching.
+RACY_MTIME_DELAY_NS = 2 * 10**9
+
+
+def format_version(version: int) -> str:
+    """Return the 'v0001' form of a version number."""
+    return f"v{str(version).rjust(VERSION_PADDING, '0')}"
+
+
+class VersionEntry(NamedTuple):
+    version: int
+    file_name: str
+
+
+class VersionIndex():
+    """
+    Versions of a publish folder, kept sorted to answer latest, next and range queries in O(log n).
+
+    The folder is listed again only when its mtime changed, publishes done by this process
+    can be registered with 'add' without any listing.
+
+    Args :
+        directory (str) : Publish folder.
+        extensions (tuple) : Only index files with one of these extensions, like ('.ma', '.mb').
+        ignored_suffixes (tuple) : File names ending with one of these suffixes are not indexed.
+        name (str) : Only index the files of this publish name, '<name>_v0001.<ext>'. Default to every file.
+    """
+
+    def __init__(self, directory: str, extensions: tuple = None, ignored_suffixes: tuple = (),
+                 name: str = None) -> None:
+        self.directory = directory
+        self.extensions = tuple(extensions) if extensions else None
+        self.ignored_suffixes = tuple(ignored_suffixes)
+        self.name_prefix = f"{name}_v" if name else None
+        self._versions = []
+        self._files = dict()
+        self._mtime_ns = None
+
+    def _accept(self, file_name: str) -> bool:
+        if self.name_prefix and not file_name.startswith(self.name_prefix):
+            return False
+        if self.ignored_suffixes and file_name.endswith(self.ignored_suffixes):
+            return False
+        if self.extensions and not file_name.endswith(self.extensions):
+            return False
+        return True
+
+    def refresh(self, force: bool = False) -> None:
+        """List the folder again if its mtime changed since the last listing."""
+        try:
+            mtime_ns = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = None
+
+        if not force and mtime_ns == self._mtime_ns and self._mtime_ns is not None:
+            return
+        racy = mtime_ns is not None and time.time_ns() - mtime_ns < RACY_MTIME_DELAY_NS
+        self._mtime_ns = None if racy else mtime_ns
+
+        files = dict()
+        if mtime_ns is not None:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if not entry.is_file() or not self._accept(entry.name):
+                        continue
+                    version = parse_version(entry.name)
+                    if version is None:
+                        continue
+                    # Several files of the same version : keep the first one by name.
+                    if version not in files or entry.name < files[version]:
+                        files[version] = entry.name
+
+        self._files = files
+        self._versions = sorted(files)
+
+    def add(self, file_name: str) -> None:
+        """Register a file published in the folder."""
+        version = parse_version(file_name)
+        if version is None or not self._accept(file_name):
+            return
+        if version not in self._files:
+            bisect.insort(self._versions, version)
+            self._files[version] = file_name
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._versions)
+
+    def __contains__(self, version: int) -> bool:
+        self.refresh()
+        return version in self._files
+
+    def latest(self):
+        """
+        Returns:
+            entry (VersionEntry) : Highest version of the folder, None if there is no version.
+        """
+        self.refresh()
+        if not self._versions:
+            return None
+        version = self._versions[-1]
+        return VersionEntry(version, self._files[version])
+
+    def next_version(self) -> int:
+        self.refresh()
+        return self._versions[-1] + 1 if self._versions else 1
+
+    def get(self, version: int):
+        self.refresh()
+        file_name = self._files.get(version)
+        return VersionEntry(version, file_name) if file_name else None
+
+    def range(self, start: int = None, stop: int = None) -> list:
+        """
+        Return the versions from 'start' included to 'stop' excluded, sorted.
+
+        Returns:
+            entries (list) : VersionEntry list.
+        """
+        self.refresh()
+        low = 0 if start is None else bisect.bisect_left(self._versions, start)
+        high = len(self._versions) if stop is None else bisect.bisect_left(self._versions, stop)
+        return [VersionEntry(version, self._files[version]) for version in self._versions[low:high]]
+
+
+_version_indexes = dict()
+
+
+def get_version_index(directory: str, extensions: tuple = None) -> VersionIndex:
+    """
+    Return the VersionIndex of the publishes of a folder, shared by the whole process.
+    Reserved versions that are not published yet are not part of it.
+    """
+    key = (os.path.normpath(directory), tuple(extensions) if extensions else None)
+    index = _version_indexes.get(key)
+    if index is None:
+        index = VersionIndex(directory, extensions, ignored_suffixes=(RESERVATION_SUFFIX,))
+        _version_indexes[key] = index
+    return index
@@ -0,0 +1,19 @@
+import dataclasses
+
+
+def add_slots(cls):
+    """
+    Return a copy of a dataclass with its fields as __slots__.
+
+    dataclass(slots=True) needs Python 3.10, Maya 2022 and 2023 ship Python 3.7 and 3.9.
+    Apply it above the dataclass decorator. Slotted instances have no __dict__, pickle them with __reduce__.
+    """
+    names = tuple(class_field.name for class_field in dataclasses.fields(cls))
+    namespace = dict(cls.__dict__)
+    namespace["__slots__"] = names
+    # The field defaults are class attributes clashing with the slots, __init__ already holds them.
+    for name in names:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
@@ -1,5 +1,6 @@
 import maya.cmds as cmds
-from helpers import getSceneName, version_increment
+from vulcain.helpers import getSceneName
+from vulcain.filesystem import get_version_index, VersionAllocator
 import os
 
 def publish(ext, pubFolder):
@@ -13,21 +14,23 @@ def publish(ext, pubFolder):
 	else:
 		os.makedirs(directory)
 
-	files = os.listdir(directory)
+	latest = get_version_index(directory).latest()
 
-	if not files :
+	if latest is None:
 		name = getSceneName.getName(filename)
-		name = name+"_pb_v0001.{0}".format(ext)
-		newPath = os.path.join(directory, name).replace("\\", "/")
+		name = name+"_pb"
 
 	else :
-		filename = files[-1]
+		name = getSceneName.getName(latest.file_name)
 
-		name = getSceneName.getName(filename)
-		verNb = version_increment.inc(filename)
+	#Reserve the version atomically, parallel publishes never get the same one.
+	allocator = VersionAllocator(directory, name)
+	#The publish file is written by the caller, markers of the previous publishes are removed here.
+	allocator.remove_published_markers()
+	reservation = allocator.allocate()
 
-		#Path to publish
-		name = name+"_v"+verNb+"."+ext
-		newPath = os.path.join(directory, name).replace("\\", "/")
+	#Path to publish
+	newPath = reservation.file_path(ext)
 
-	return newPath, path
\ No newline at end of file
+	#The caller commits the reservation once newPath is written, or releases it if the publish failed.
+	return newPath, path, reservation
\ No newline at end of file
@@ -1,7 +1,27 @@
-from .main import param, load_vulcain_file_path, load_project_file_path
+from .main import param, param_prefix, param_tree, param_many, resolve_params, \
+    get_param_store, get_param_cascade, compile_config, get_config_snapshot, load_path_templates, load_config, \
+    load_vulcain_file_path, load_project_file_path
+from .store import ParamLayer, ParamStore, ParamCascade, ResolvedParams
 
 __all__ = [
+    # main
     "param",
+    "param_prefix",
+    "param_tree",
+    "param_many",
+    "resolve_params",
+    "get_param_store",
+    "get_param_cascade",
+    "compile_config",
+    "get_config_snapshot",
+    "load_path_templates",
+    "load_config",
     "load_vulcain_file_path",
-    "load_project_file_path"
-]
\ No newline at end of file
+    "load_project_file_path",
+
+    # store
+    "ParamLayer",
+    "ParamStore",
+    "ParamCascade",
+    "ResolvedParams"
+]
@@ -0,0 +1,3 @@
+from .snapshot import main
+
+main()
@@ -2,21 +2,136 @@ import os
 
 import vulcain.configs.vulcain as configs_path
 import vulcain.helpers.json as json_helpers
+from .store import ParamLayer, ParamStore, ParamCascade, ResolvedParams
+from . import snapshot
 
-VULCAIN_PARAMS_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(configs_path.__file__)), "params.json")
-PROJECT_PARAMS_FILE_PATH = os.path.join(os.environ.get("VULCAIN_CONFIG_DIR_PATH"), "params.json")
+VULCAIN_CONFIG_DIR_PATH = os.path.dirname(os.path.abspath(configs_path.__file__))
+VULCAIN_PARAMS_FILE_PATH = os.path.join(VULCAIN_CONFIG_DIR_PATH, "params.json")
+VULCAIN_PATH_FILE_PATH = os.path.join(VULCAIN_CONFIG_DIR_PATH, "path.json")
+VULCAIN_CONFIG_FILE_PATH = os.path.join(VULCAIN_CONFIG_DIR_PATH, "config.json")
 
+PROJECT_CONFIG_DIR_PATH = os.environ.get("VULCAIN_CONFIG_DIR_PATH")
+PROJECT_PARAMS_FILE_PATH = os.path.join(PROJECT_CONFIG_DIR_PATH, "params.json") if PROJECT_CONFIG_DIR_PATH else None
+PROJECT_PATH_FILE_PATH = os.path.join(PROJECT_CONFIG_DIR_PATH, "path.json") if PROJECT_CONFIG_DIR_PATH else None
+PROJECT_CONFIG_FILE_PATH = os.path.join(PROJECT_CONFIG_DIR_PATH, "config.json") if PROJECT_CONFIG_DIR_PATH else None
 
-def param(key):
-    vulcain_params = load_vulcain_file_path()
-    project_params = load_project_file_path()
+CONFIG_SNAPSHOT_FILE_PATH = os.environ.get("VULCAIN_CONFIG_SNAPSHOT_PATH") or (
+    os.path.join(PROJECT_CONFIG_DIR_PATH, snapshot.SNAPSHOT_FILE_NAME) if PROJECT_CONFIG_DIR_PATH else None)
 
-    if key in project_params:
-        return project_params.get(key)
-    elif key in vulcain_params:
-        return vulcain_params.get(key)
-    else:
-        raise ValueError(f"Param key : '{key}' does not exists.")
+_param_store = None
+_param_cascade = None
+_config_snapshot = False
+
+
+def param(key, context=None):
+    return resolve_params(context).get(key)
+
+
+def param_prefix(prefix, context=None):
+    """Return every param under a dotted prefix, like 'maya', keyed by full param key."""
+    return resolve_params(context).get_prefix(prefix)
+
+
+def param_tree(prefix, context=None):
+    """Return the params under a dotted prefix as a nested dict, without the prefix."""
+    return resolve_params(context).get_tree(prefix)
+
+
+def param_many(keys, context=None):
+    return resolve_params(context).get_many(keys)
+
+
+def resolve_params(context=None) -> ResolvedParams:
+    """
+    Return the params of a context, with its episode, sequence and shot overrides.
+
+    Args :
+        context (VulcainContext) : If None, only the studio and project params are used.
+    """
+    if context is None:
+        return get_param_store().resolve()
+    return get_param_cascade().resolve(context)
+
+
+def get_param_store() -> ParamStore:
+    """Return the shared store of the studio params overridden by the project params."""
+    global _param_store
+    if _param_store is None:
+        layers = [
+            ParamLayer(VULCAIN_PARAMS_FILE_PATH),
+            ParamLayer(PROJECT_PARAMS_FILE_PATH, required=False)
+        ]
+
+        # Layers found in an up to date snapshot do not need to parse their json file.
+        config_snapshot = get_config_snapshot()
+        if config_snapshot:
+            for layer in layers:
+                snapshot_layer = config_snapshot.layer(layer.file_path)
+                if snapshot_layer:
+                    layer.prime(*snapshot_layer)
+
+        _param_store = ParamStore(layers)
+    return _param_store
+
+
+def get_param_cascade() -> ParamCascade:
+    """Return the shared resolver of the episode, sequence and shot params overrides."""
+    global _param_cascade
+    if _param_cascade is None:
+        _param_cascade = ParamCascade(get_param_store(), PROJECT_CONFIG_DIR_PATH)
+    return _param_cascade
+
+
+def config_sources() -> dict:
+    """Return the config files paths by section, from the lowest to the highest priority."""
+    return {
+        "params": [VULCAIN_PARAMS_FILE_PATH, PROJECT_PARAMS_FILE_PATH],
+        "path": [VULCAIN_PATH_FILE_PATH, PROJECT_PATH_FILE_PATH],
+        "config": [VULCAIN_CONFIG_FILE_PATH, PROJECT_CONFIG_FILE_PATH]
+    }
+
+
+def compile_config(output_path=None) -> snapshot.ConfigSnapshot:
+    """
+    Merge the studio and project params, path and config files into a single snapshot file.
+
+    Args :
+        output_path (str) : Snapshot file path, default to CONFIG_SNAPSHOT_FILE_PATH.
+    """
+    output_path = output_path or CONFIG_SNAPSHOT_FILE_PATH
+    if not output_path:
+        raise ValueError("No config snapshot path. Set VULCAIN_CONFIG_DIR_PATH or VULCAIN_CONFIG_SNAPSHOT_PATH.")
+    return snapshot.compile_snapshot(config_sources(), output_path)
+
+
+def get_config_snapshot():
+    """Return the config snapshot loaded once per process, or None if it is missing or out of date."""
+    global _config_snapshot
+    if _config_snapshot is False:
+        _config_snapshot = snapshot.load_snapshot(CONFIG_SNAPSHOT_FILE_PATH, config_sources())
+    return _config_snapshot
+
+
+def load_path_templates() -> dict:
+    """Return the studio path templates overridden by the project ones."""
+    config_snapshot = get_config_snapshot()
+    if config_snapshot:
+        return config_snapshot.path
+    return _load_live_section("path")
+
+
+def load_config() -> dict:
+    """Return the studio config overridden by the project one."""
+    config_snapshot = get_config_snapshot()
+    if config_snapshot:
+        return config_snapshot.config
+    return _load_live_section("config")
+
+
+def _load_live_section(section: str) -> dict:
+    layers = [json_helpers.load_data(file_path) for file_path in config_sources()[section]
+              if file_path and os.path.exists(file_path)]
+    return snapshot.merge_section(section, layers)
 
 
 def load_vulcain_file_path():
@@ -32,4 +147,4 @@ if __name__ == "__main__":
     print(VULCAIN_PARAMS_FILE_PATH)
     print(PROJECT_PARAMS_FILE_PATH)
     print(param('project.resolution.width'))
-    print(param('project.resolution.height'))
\ No newline at end of file
+    print(param('project.resolution.height'))
@@ -0,0 +1,200 @@
+"""
+Compiled config snapshot : every config json file (params, path, config) merged into one file,
+loaded with a single read on farm nodes.
+
+The snapshot records the source files paths, and the stat signature and the sha1 of every source file.
+A snapshot compiled from other source files, or whose sources changed, is discarded and the live
+json files are used instead.
+
+Usage :
+    python -m vulcain.parametric [--output SNAPSHOT_FILE_PATH]
+"""
+import argparse
+import hashlib
+import json
+import os
+
+import vulcain.helpers.json as json_helpers
+from vulcain.logger import Logger
+
+logger = Logger(name="Config Snapshot")
+
+# Increment when the snapshot layout changes, older snapshots are then ignored.
+SNAPSHOT_FORMAT_VERSION = 2
+SNAPSHOT_FILE_NAME = "vulcain_config.snapshot.json"
+
+# Config sections, each one made of json files ordered from the lowest to the highest priority.
+SECTIONS = ("params", "path", "config")
+
+
+def file_signature(file_path: str):
+    if not file_path:
+        return None
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def file_hash(file_path: str):
+    try:
+        with open(file_path, "rb") as read_file:
+            return hashlib.sha1(read_file.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def source_paths(sources: dict) -> dict:
+    """Return the source files paths by section, without the missing ones, in a comparable form."""
+    return {section: [file_path for file_path in sources.get(section, ()) if file_path] for section in SECTIONS}
+
+
+def merge_section(section: str, layers: list) -> dict:
+    merged = dict()
+    for data in layers:
+        if section != "path":
+            merged.update(data)
+            continue
+        # path.json is made of groups of templates, groups are merged one by one.
+        for group, templates in data.items():
+            merged.setdefault(group, dict()).update(templates)
+    return merged
+
+
+class ConfigSnapshot():
+    """
+    Loaded snapshot content.
+
+    Args :
+        data (dict) : Snapshot file content.
+        signatures (dict) : Current stat signature of every source file, by file path.
+    """
+
+    def __init__(self, data: dict, signatures: dict) -> None:
+        self.data = data
+        self.signatures = signatures
+
+    def layer(self, file_path: str):
+        """Return the (data, stat signature) of a source file, or None if it is not part of the snapshot."""
+        if file_path not in self.signatures:
+            return None
+        return self.data["layers"][file_path], self.signatures[file_path]
+
+    @property
+    def params(self) -> dict:
+        return self.data["params"]
+
+    @property
+    def path(self) -> dict:
+        return self.data["path"]
+
+    @property
+    def config(self) -> dict:
+        return self.data["config"]
+
+
+def compile_snapshot(sources: dict, output_path: str) -> ConfigSnapshot:
+    """
+    Merge the config sources and write them as a snapshot file.
+
+    Args :
+        sources (dict) : Source files paths by section, like {'params': [studio_path, project_path], ...}.
+                         Missing or None files are recorded as empty layers.
+        output_path (str) : Snapshot file path.
+
+    Returns:
+        snapshot (ConfigSnapshot) : Compiled snapshot.
+    """
+    data = {"format_version": SNAPSHOT_FORMAT_VERSION, "source_paths": source_paths(sources), "sources": [],
+            "layers": dict()}
+    signatures = dict()
+
+    for section in SECTIONS:
+        layers = []
+        for file_path in sources.get(section, ()):
+            if not file_path:
+                continue
+            signature = file_signature(file_path)
+            layer = json_helpers.load_data(file_path) if signature else dict()
+            layers.append(layer)
+
+            data["layers"][file_path] = layer
+            data["sources"].append({"path": file_path,
+                                    "signature": signature,
+                                    "sha1": file_hash(file_path) if signature else None})
+            signatures[file_path] = signature
+
+        data[section] = merge_section(section, layers)
+
+    # Written aside then renamed, so workers never read a partial snapshot.
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as write_file:
+        json.dump(data, write_file)
+    os.replace(tmp_path, output_path)
+
+    logger.info(f"Config snapshot compiled to : '{output_path}'.")
+    return ConfigSnapshot(data, signatures)
+
+
+def load_snapshot(file_path: str, sources: dict = None):
+    """
+    Load a snapshot file if it is still up to date with its sources.
+
+    A source whose stat signature changed is hashed, the snapshot is kept if its content did not change.
+
+    Args :
+        file_path (str) : Snapshot file path.
+        sources (dict) : Current source files paths by section, see compile_snapshot. A snapshot compiled
+                         from other files, like for another project, is discarded. None to skip this check.
+
+    Returns:
+        snapshot (ConfigSnapshot) : None if there is no snapshot or if its sources changed.
+    """
+    if not file_path:
+        return None
+    try:
+        data = json_helpers.load_data(file_path)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        logger.warning(f"Config snapshot : '{file_path}' is corrupted. Using live config files.")
+        return None
+
+    if data.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        logger.info(f"Config snapshot : '{file_path}' has an old format. Using live config files.")
+        return None
+
+    if sources is not None and data["source_paths"] != source_paths(sources):
+        logger.info(f"Config snapshot : '{file_path}' was compiled from other config files. "
+                    "Using live config files.")
+        return None
+
+    signatures = dict()
+    for source in data["sources"]:
+        source_path = source["path"]
+        recorded = tuple(source["signature"]) if source["signature"] else None
+        signature = file_signature(source_path)
+
+        if signature != recorded and (signature is None or file_hash(source_path) != source["sha1"]):
+            logger.info(f"Config source : '{source_path}' changed since the snapshot. Using live config files.")
+            return None
+        signatures[source_path] = signature
+
+    return ConfigSnapshot(data, signatures)
+
+
+def main(argv=None):
+    from .main import CONFIG_SNAPSHOT_FILE_PATH, compile_config
+
+    parser = argparse.ArgumentParser(prog="python -m vulcain.parametric",
+                                     description="Compile the vulcain config files into a single snapshot file.")
+    parser.add_argument("--output", default=CONFIG_SNAPSHOT_FILE_PATH,
+                        help="Snapshot file path. Default to $VULCAIN_CONFIG_SNAPSHOT_PATH, "
+                             f"or {SNAPSHOT_FILE_NAME} in $VULCAIN_CONFIG_DIR_PATH.")
+    args = parser.parse_args(argv)
+
+    if not args.output:
+        parser.error("No output path, set VULCAIN_CONFIG_DIR_PATH or give --output.")
+
+    compile_config(args.output)
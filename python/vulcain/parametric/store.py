@@ -0,0 +1,371 @@
+import copy
+import os
+import time
+
+import vulcain.helpers.json as json_helpers
+from vulcain.logger import Logger
+
+logger = Logger(name="Param Store")
+
+# Minimum delay, in seconds, between two stat checks of the layer files.
+DEFAULT_CHECK_INTERVAL = 1.0
+
+
+class ParamLayer():
+    """
+    One params json file, loaded once and re-read only when its mtime or size changes.
+
+    Args :
+        file_path (str) : Path of the params json file.
+        required (bool) : If False, a missing file is considered as an empty layer.
+    """
+
+    def __init__(self, file_path: str, required: bool = True) -> None:
+        self.file_path = file_path
+        self.required = required
+        self._data = None
+        self._signature = None
+        # Incremented on every (re)load, lets resolved params know if they are stale.
+        self.generation = 0
+
+    def stat_signature(self):
+        if not self.file_path:
+            return None
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def refresh(self) -> bool:
+        """
+        Reload the layer if the file changed since the last load.
+
+        Returns:
+            changed (bool) : True if the layer data has been (re)loaded.
+        """
+        signature = self.stat_signature()
+        if self._data is not None and signature == self._signature:
+            return False
+
+        if signature is None:
+            if self.required:
+                raise FileNotFoundError(f"Params file : '{self.file_path}' does not exists.")
+            logger.debug(f"Params file : '{self.file_path}' does not exists. Using empty layer.")
+            data = dict()
+        else:
+            logger.debug(f"Loading params file : '{self.file_path}'.")
+            data = json_helpers.load_data(self.file_path)
+
+        self._data = data
+        self._signature = signature
+        self.generation += 1
+        return True
+
+    def prime(self, data: dict, signature) -> None:
+        """
+        Set already loaded data, like the one of a config snapshot.
+
+        Args :
+            data (dict) : Layer content.
+            signature (tuple) : Stat signature of the file the data comes from, see stat_signature.
+        """
+        self._data = data
+        self._signature = tuple(signature) if signature else None
+        self.generation += 1
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            self.refresh()
+        return self._data
+
+
+class ResolvedParams():
+    """
+    Read only view over merged params, with a dotted prefix index built on first prefix query.
+
+    Args :
+        values (dict) : Merged params. The dict must not be modified afterward.
+    """
+
+    def __init__(self, values: dict) -> None:
+        self._values = values
+        self._prefix_index = None
+
+    def _get_prefix_index(self) -> dict:
+        if self._prefix_index is None:
+            self._prefix_index = build_prefix_index(self._values)
+        return self._prefix_index
+
+    def override(self, values: dict) -> "ResolvedParams":
+        """Return new ResolvedParams with 'values' on top of these ones."""
+        merged = dict(self._values)
+        merged.update(values)
+        return ResolvedParams(merged)
+
+    def get(self, key: str):
+        try:
+            value = self._values[key]
+        except KeyError:
+            raise ValueError(f"Param key : '{key}' does not exists.") from None
+
+        # Cached containers are shared between calls, the caller gets its own copy.
+        if isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._values
+
+    def values(self) -> dict:
+        return copy.deepcopy(self._values)
+
+    def keys(self, prefix: str = "") -> list:
+        """
+        Return the param keys under a dotted prefix, or every key if no prefix is given.
+
+        Args :
+            prefix (str) : Dotted prefix, like 'maya' or 'project.resolution'.
+
+        Returns:
+            keys (list) : Full param keys, in params files order.
+        """
+        if not prefix:
+            return list(self._values)
+        return list(self._get_prefix_index().get(prefix, ()))
+
+    def get_prefix(self, prefix: str) -> dict:
+        """
+        Return every param under a dotted prefix in one lookup.
+
+        Args :
+            prefix (str) : Dotted prefix, like 'maya' or 'project.resolution'.
+
+        Returns:
+            params (dict) : Full param keys as keys, like {'maya.up_axis': 'Y', ...}.
+        """
+        values = self._values
+        return {key: copy.deepcopy(values[key]) for key in self._get_prefix_index().get(prefix, ())}
+
+    def get_tree(self, prefix: str = "") -> dict:
+        """
+        Return the params under a dotted prefix as a nested dict, without the prefix.
+
+        'project' gives {'resolution': {'width': 1920, 'height': 1080}, 'fps': 24}.
+
+        Raises:
+            ValueError : If a key is also the prefix of another key, like 'project.fps' and 'project.fps.ntsc'.
+        """
+        keys = self._get_prefix_index().get(prefix, ()) if prefix else self._values
+        start = len(prefix) + 1 if prefix else 0
+
+        tree = dict()
+        # Ids of the dicts built for the dotted levels, a param value can be a dict too.
+        branches = {id(tree)}
+        for key in keys:
+            *parents, leaf = key[start:].split(".")
+            node = tree
+            for depth, parent in enumerate(parents):
+                child = node.get(parent)
+                if child is None:
+                    child = node[parent] = dict()
+                    branches.add(id(child))
+                elif id(child) not in branches:
+                    parent_key = key[:start] + ".".join(parents[:depth + 1])
+                    raise ValueError(f"Param key : '{parent_key}' is also the prefix of '{key}'.")
+                node = child
+            if leaf in node:
+                child_key = next(other for other in keys if other.startswith(f"{key}."))
+                raise ValueError(f"Param key : '{key}' is also the prefix of '{child_key}'.")
+            node[leaf] = copy.deepcopy(self._values[key])
+        return tree
+
+    def get_many(self, keys) -> dict:
+        """
+        Return several params in one lookup.
+
+        Raises:
+            ValueError : If one of the keys does not exists.
+        """
+        values = self._values
+        missing = [key for key in keys if key not in values]
+        if missing:
+            raise ValueError(f"Param keys : {missing} does not exists.")
+        return {key: copy.deepcopy(values[key]) for key in keys}
+
+
+class ParamStore():
+    """
+    Merge several ParamLayer into a single dict. Last layers override first ones.
+
+    Layers files are stat at most once every 'check_interval' seconds,
+    so a lookup is a dict hit most of the time.
+
+    Args :
+        layers (list) : ParamLayer ordered from the lowest to the highest priority.
+        check_interval (float) : Minimum delay in seconds between two checks of the layers files.
+    """
+
+    def __init__(self, layers: list, check_interval: float = DEFAULT_CHECK_INTERVAL) -> None:
+        self.layers = list(layers)
+        self.check_interval = check_interval
+        self._resolved = None
+        self._last_check = 0.0
+
+    def refresh(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and self._resolved is not None and now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+
+        # Every layer has to be refreshed, not only until the first changed one.
+        changed = [layer.refresh() for layer in self.layers]
+        if self._resolved is None or any(changed):
+            values = dict()
+            for layer in self.layers:
+                values.update(layer.data)
+            self._resolved = ResolvedParams(values)
+
+    def invalidate(self) -> None:
+        """Force a stat check of every layer on the next lookup."""
+        self._last_check = 0.0
+        self._resolved = None
+
+    def resolve(self) -> ResolvedParams:
+        """Return the merged params, reloading changed layers first."""
+        self.refresh()
+        return self._resolved
+
+    def get(self, key: str):
+        return self.resolve().get(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.resolve()
+
+    def values(self) -> dict:
+        return self.resolve().values()
+
+    def keys(self, prefix: str = "") -> list:
+        return self.resolve().keys(prefix)
+
+    def get_prefix(self, prefix: str) -> dict:
+        return self.resolve().get_prefix(prefix)
+
+    def get_tree(self, prefix: str = "") -> dict:
+        return self.resolve().get_tree(prefix)
+
+    def get_many(self, keys) -> dict:
+        return self.resolve().get_many(keys)
+
+
+# VulcainContext fields carrying their own override file, from the broadest to the narrowest.
+CASCADE_LEVELS = ("episode", "sequence", "shot")
+
+
+class ParamCascade():
+    """
+    Resolve the params of a VulcainContext : the ParamStore params, overridden by the
+    episode, then the sequence, then the shot params files of the context.
+
+    Override files are looked for under the project config directory :
+        episodes/<episode>/params.json
+        episodes/<episode>/sequences/<sequence>/params.json
+        episodes/<episode>/sequences/<sequence>/shots/<shot>/params.json
+    Empty context fields are skipped, a missing override file is an empty layer.
+
+    Every level is resolved once and memoized, contexts with the same ancestors
+    share the same ResolvedParams. A level without overrides reuses its parent ResolvedParams.
+
+    Args :
+        store (ParamStore) : Studio and project params.
+        config_dir_path (str) : Project config directory. If None, contexts resolve to the store params.
+        check_interval (float) : Minimum delay in seconds between two checks of an override file.
+    """
+
+    def __init__(self, store: ParamStore, config_dir_path: str = None,
+                 check_interval: float = DEFAULT_CHECK_INTERVAL) -> None:
+        self.store = store
+        self.config_dir_path = config_dir_path
+        self.check_interval = check_interval
+        self._layers = dict()
+        self._last_checks = dict()
+        self._resolved = dict()
+
+    @staticmethod
+    def cascade_key(context) -> tuple:
+        """Return the ((level, name), ...) chain of the context, from the broadest level."""
+        return tuple((level, getattr(context, level)) for level in CASCADE_LEVELS if getattr(context, level))
+
+    def layer_file_path(self, key: tuple) -> str:
+        parts = [self.config_dir_path]
+        for level, name in key:
+            parts.extend((f"{level}s", name))
+        parts.append("params.json")
+        return os.path.join(*parts)
+
+    def _get_layer(self, key: tuple) -> ParamLayer:
+        layer = self._layers.get(key)
+        if layer is None:
+            layer = ParamLayer(self.layer_file_path(key), required=False)
+            self._layers[key] = layer
+
+        now = time.monotonic()
+        if now - self._last_checks.get(key, 0.0) >= self.check_interval:
+            self._last_checks[key] = now
+            layer.refresh()
+        return layer
+
+    def _resolve_key(self, key: tuple) -> ResolvedParams:
+        if not key or not self.config_dir_path:
+            return self.store.resolve()
+
+        parent = self._resolve_key(key[:-1])
+        layer = self._get_layer(key)
+
+        cached = self._resolved.get(key)
+        if cached is not None and cached[0] is parent and cached[1] == layer.generation:
+            return cached[2]
+
+        if layer.data:
+            resolved = parent.override(layer.data)
+        else:
+            resolved = parent
+
+        self._resolved[key] = (parent, layer.generation, resolved)
+        return resolved
+
+    def resolve(self, context=None) -> ResolvedParams:
+        """
+        Return the params of the context.
+
+        Args :
+            context (VulcainContext) : Context to resolve. If None, the store params are returned.
+
+        Returns:
+            resolved (ResolvedParams) : Shared, read only, params of the context.
+        """
+        if context is None:
+            return self.store.resolve()
+        return self._resolve_key(self.cascade_key(context))
+
+    def clear(self) -> None:
+        """Forget every memoized level and override file."""
+        self._layers.clear()
+        self._last_checks.clear()
+        self._resolved.clear()
+
+
+def build_prefix_index(values: dict) -> dict:
+    """
+    Map every dotted prefix to the keys under it.
+
+    'project.resolution.width' is indexed under 'project' and 'project.resolution'.
+    """
+    index = dict()
+    for key in values:
+        position = key.find(".")
+        while position != -1:
+            index.setdefault(key[:position], []).append(key)
+            position = key.find(".", position + 1)
+    return index
@@ -0,0 +1,234 @@
+"""
+Headless launcher of a registered procedure over one or many contexts, for the farm.
+
+Usage :
+    python -m vulcain.procedure build_modelbase --software maya \\
+        --context section=assets asset=chair task=modeling --context section=assets asset=table task=modeling
+    python -m vulcain.procedure my.module:MyProcedure --contexts-file contexts.jsonl --events jsonl
+    python -m vulcain.procedure --list
+
+A context is given as KEY=VALUE pairs, or as a JSON object per line of a contexts file (or a JSON list).
+Keys of VulcainContext build the context, other keys and the 'input_args' object are the procedure input args.
+The exit code is the one of the most severe status, see EXIT_CODES. Bad arguments and --import modules
+failing to import exit with USAGE_EXIT_CODE, a software failing to start or stop with the EXECUTE_FAIL one.
+"""
+import argparse
+import dataclasses
+import importlib
+import json
+import sys
+import time
+import traceback
+from typing import List
+
+from vulcain.context import VulcainContext
+from vulcain.procedure.shared import BatchLauncher, BatchResult, ProcedureContext, ProcedureStatus, aggregate_status
+from vulcain.procedure.shared.registry import get_procedure, get_software, procedure_names, software_names
+
+EXIT_CODES = {
+    ProcedureStatus.SUCCESS: 0,
+    ProcedureStatus.CHECK_FAIL: 10,
+    ProcedureStatus.EXECUTE_FAIL: 11,
+    ProcedureStatus.REVERT_FAIL: 12,
+    ProcedureStatus.SKIPPED: 13,
+    ProcedureStatus.CANCELLED: 14,
+}
+# Bad arguments, like argparse, and interrupted by the user.
+USAGE_EXIT_CODE = 2
+INTERRUPTED_EXIT_CODE = 130
+
+DEFAULT_PROGRESS_INTERVAL = 2.0
+
+CONTEXT_FIELDS = {context_field.name: context_field for context_field in dataclasses.fields(VulcainContext)}
+
+
+def build_context(data: dict) -> ProcedureContext:
+    """
+    Build a ProcedureContext from a flat dict, like {'section': 'assets', 'asset': 'chair', 'force': '1'}.
+
+    Raises:
+        ValueError : If the dict has no 'section'.
+    """
+    data = dict(data)
+    input_args = dict(data.pop("input_args", None) or {})
+    context_values = dict()
+    for key, value in data.items():
+        if key not in CONTEXT_FIELDS:
+            input_args[key] = value
+        elif key == "version" and value not in (None, ""):
+            context_values[key] = int(value)
+        elif key == "labels" and isinstance(value, str):
+            context_values[key] = [label for label in value.split(",") if label]
+        else:
+            context_values[key] = value
+
+    if "section" not in context_values:
+        raise ValueError(f"Context : '{data}' has no 'section'.")
+    return ProcedureContext(VulcainContext(**context_values), input_args=input_args)
+
+
+def parse_pairs(pairs: List[str]) -> dict:
+    data = dict()
+    for pair in pairs:
+        key, separator, value = pair.partition("=")
+        if not separator:
+            raise ValueError(f"Context value : '{pair}' must be like KEY=VALUE.")
+        data[key] = value
+    return data
+
+
+def load_contexts_file(file_path: str) -> List[dict]:
+    """Return the contexts of a JSON list file, or of a JSON lines file."""
+    with open(file_path, "r") as contexts_file:
+        content = contexts_file.read()
+    if content.lstrip().startswith("["):
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+def context_data(context) -> dict:
+    if dataclasses.is_dataclass(context):
+        return dataclasses.asdict(context)
+    return {"context": str(context)}
+
+
+class EventStream():
+    """
+    Report the progress of a batch on a stream.
+
+    In 'text' mode, progress lines are printed at most once per interval, failures as soon as they happen.
+    In 'jsonl' mode, a JSON object is printed per event : 'start', 'result' per context and 'end'.
+    """
+
+    def __init__(self, mode: str = "text", interval: float = DEFAULT_PROGRESS_INTERVAL, stream=None) -> None:
+        self.mode = mode
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.start_time = 0.0
+        self.last_print = 0.0
+
+    def _write(self, line: str) -> None:
+        self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def _event(self, event: str, **data) -> None:
+        self._write(json.dumps({"event": event, "time": time.time(), **data}, default=str))
+
+    def start(self, procedure_name: str, total: int) -> None:
+        self.total = total
+        self.start_time = self.last_print = time.perf_counter()
+        if self.mode == "jsonl":
+            self._event("start", procedure=procedure_name, total=total)
+        else:
+            self._write(f"{procedure_name} : {total} contexts.")
+
+    def result(self, index: int, result: BatchResult) -> None:
+        self.done += 1
+        self.failed += result.status != ProcedureStatus.SUCCESS
+
+        if self.mode == "jsonl":
+            self._event("result", index=index, status=result.status.name, duration=result.duration,
+                        context=context_data(result.context), error=result.error)
+            return
+
+        if result.status != ProcedureStatus.SUCCESS:
+            self._write(f"{result.status.name} : {context_data(result.context)}")
+
+        now = time.perf_counter()
+        if now - self.last_print >= self.interval or self.done == self.total:
+            self.last_print = now
+            self._write(self.progress_line(now))
+
+    def progress_line(self, now: float) -> str:
+        elapsed = now - self.start_time
+        rate = self.done / elapsed if elapsed else 0.0
+        remaining = (self.total - self.done) / rate if rate else 0.0
+        return (f"[{self.done}/{self.total}] {self.done - self.failed} succeeded, {self.failed} failed, "
+                f"{rate:.1f}/s, {remaining:.0f}s left")
+
+    def end(self, status: ProcedureStatus, duration: float, error: str = "") -> None:
+        if self.mode == "jsonl":
+            self._event("end", status=status.name, done=self.done, failed=self.failed, duration=duration,
+                        exit_code=EXIT_CODES[status], error=error)
+        else:
+            self._write(f"{status.name} : {self.done - self.failed} succeeded, {self.failed} failed "
+                        f"in {duration:.2f}s.")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m vulcain.procedure", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("procedure", nargs="?", help="Registered procedure name, or 'module:Class'.")
+    parser.add_argument("--context", action="append", nargs="+", default=[], metavar="KEY=VALUE",
+                        help="One context, repeat the option for many contexts.")
+    parser.add_argument("--contexts-file", help="JSON list or JSON lines file of contexts.")
+    parser.add_argument("--software", default="default",
+                        help=f"Registered software, or 'module:Class'. One of {software_names()}.")
+    parser.add_argument("--import", dest="imports", action="append", default=[], metavar="MODULE",
+                        help="Module to import before launching, like one registering procedures.")
+    parser.add_argument("--events", choices=("text", "jsonl"), default="text", help="Output format.")
+    parser.add_argument("--progress-interval", type=float, default=DEFAULT_PROGRESS_INTERVAL,
+                        help="Minimum seconds between two text progress lines.")
+    parser.add_argument("--list", action="store_true", help="List the registered procedures and exit.")
+    return parser
+
+
+def main(argv=None) -> int:
+    """
+    Returns:
+        exit_code (int) : Exit code of the most severe status of the contexts.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    for module_name in args.imports:
+        try:
+            importlib.import_module(module_name)
+        except ImportError as err:
+            print(f"Error : module : '{module_name}' can't be imported, {err}.", file=sys.stderr)
+            return USAGE_EXIT_CODE
+
+    if args.list:
+        print("\n".join(procedure_names()))
+        return 0
+    if not args.procedure:
+        parser.print_usage(sys.stderr)
+        print("A procedure is required.", file=sys.stderr)
+        return USAGE_EXIT_CODE
+
+    try:
+        procedure_factory = get_procedure(args.procedure)
+        software_factory = get_software(args.software)
+        contexts_data = [parse_pairs(pairs) for pairs in args.context]
+        if args.contexts_file:
+            contexts_data += load_contexts_file(args.contexts_file)
+        contexts = [build_context(data) for data in contexts_data]
+    except (ValueError, OSError, ImportError) as err:
+        print(f"Error : {err}", file=sys.stderr)
+        return USAGE_EXIT_CODE
+
+    if not contexts:
+        print("Error : no context given, use --context or --contexts-file.", file=sys.stderr)
+        return USAGE_EXIT_CODE
+
+    events = EventStream(args.events, args.progress_interval)
+    events.start(args.procedure, len(contexts))
+    start = time.perf_counter()
+    try:
+        report = BatchLauncher(procedure_factory, dcc=software_factory()).launch(contexts, on_result=events.result)
+    except KeyboardInterrupt:
+        events.end(ProcedureStatus.CANCELLED, time.perf_counter() - start)
+        return INTERRUPTED_EXIT_CODE
+    except Exception:
+        # The software failed to build, start or stop, the procedures never raise out of the batch.
+        error = traceback.format_exc()
+        print(error, file=sys.stderr)
+        events.end(ProcedureStatus.EXECUTE_FAIL, time.perf_counter() - start, error=error)
+        return EXIT_CODES[ProcedureStatus.EXECUTE_FAIL]
+
+    status = aggregate_status(result.status for result in report.results)
+    events.end(status, time.perf_counter() - start)
+    return EXIT_CODES[status]
@@ -9,7 +9,7 @@ class MayaProcedure(Procedure):
         pass
 
     def check(self):
-        pass
+        self.run_checks()
 
     def post_check(self):
         pass
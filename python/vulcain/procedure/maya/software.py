@@ -1,4 +1,5 @@
 import maya.standalone
+import maya.cmds as cmds
 
 from vulcain.procedure.shared.software import Software
 
@@ -8,4 +9,7 @@ class Maya(Software):
         maya.standalone.initialize()
 
     def stop(self):
-        maya.standalone.unitialize()
\ No newline at end of file
+        maya.standalone.uninitialize()
+
+    def reset(self):
+        cmds.file(new=True, force=True)
\ No newline at end of file
@@ -1,20 +1,98 @@
-from .procedure import ProcedureContext, Procedure
+from .procedure import ProcedureContext, ProcedureStatus, PhaseTimeout, Procedure
+from .instrumentation import (PhaseMetrics, ProcedureMetrics, MetricsExporter, LoggerExporter,
+                              JsonLinesExporter, PhaseStats, MetricsAggregate, add_exporter, remove_exporter)
+from .context_codec import (ContextCodecError, context_to_dict, context_from_dict, encode, decode,
+                            encode_many, decode_many, encode_json, decode_json, content_hash)
+from .cache import ProcedureInputs, CachedResult, FileFingerprinter, ResultStore, fingerprint
+from .checks import CheckLevel, CheckResult, RegisteredCheck, CheckReport, CheckRunner
+from .checkpoint import Checkpoint, CheckpointStore
+from .staging import StagingError, StagedOutputs, remove_stale_staging
+from .process import Process
+from .expander import Expander, DefaultExpander, FieldExpander
+from .executor import ProcessResult, ExecutionReport, Executor, ProcessExecutor, aggregate_status
+from .scheduler import ScheduleError, ScheduledNode, NodeRun, ScheduleReport, ProcedureScheduler
+from .batch import BatchResult, BatchReport, BatchLauncher
+from .worker_pool import WorkerError, Worker, WorkerPool
+from .registry import (register_procedure, get_procedure, procedure_names, register_software,
+                       get_software, software_names)
 from .software import Software, DefaultSoftware
-from .vulcain_path import VulcainPath
+from .vulcain_path import VulcainEntity, VulcainPath, VulcainPathColumns, VulcainPathQuery
 from .ui import *
 
 
 __all__ = [
     "Expander",
     "DefaultExpander",
+    "FieldExpander",
+    "ProcessResult",
+    "ExecutionReport",
     "Executor",
     "ProcessExecutor",
+    "aggregate_status",
     "ProcedureContext",
+    "ProcedureStatus",
+    "PhaseTimeout",
     "Procedure",
     "Process",
+    "StagingError",
+    "StagedOutputs",
+    "remove_stale_staging",
+    "CheckLevel",
+    "CheckResult",
+    "RegisteredCheck",
+    "CheckReport",
+    "CheckRunner",
+    "Checkpoint",
+    "CheckpointStore",
+    "ContextCodecError",
+    "context_to_dict",
+    "context_from_dict",
+    "encode",
+    "decode",
+    "encode_many",
+    "decode_many",
+    "encode_json",
+    "decode_json",
+    "content_hash",
+    "ProcedureInputs",
+    "CachedResult",
+    "FileFingerprinter",
+    "ResultStore",
+    "fingerprint",
+    "PhaseMetrics",
+    "ProcedureMetrics",
+    "MetricsExporter",
+    "LoggerExporter",
+    "JsonLinesExporter",
+    "PhaseStats",
+    "MetricsAggregate",
+    "add_exporter",
+    "remove_exporter",
+    "ScheduleError",
+    "ScheduledNode",
+    "NodeRun",
+    "ScheduleReport",
+    "ProcedureScheduler",
+    "BatchResult",
+    "BatchReport",
+    "BatchLauncher",
+    "WorkerError",
+    "Worker",
+    "WorkerPool",
+    "register_procedure",
+    "get_procedure",
+    "procedure_names",
+    "register_software",
+    "get_software",
+    "software_names",
     "Software",
     "DefaultSoftware",
+    "VulcainEntity",
     "VulcainPath",
+    "VulcainPathColumns",
+    "VulcainPathQuery",
     "TerminalUI",
+    "NullUI",
+    "ProgressReporter",
     "ProcedureUI"
 ]
\ No newline at end of file
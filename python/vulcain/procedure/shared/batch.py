@@ -0,0 +1,150 @@
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List
+
+from vulcain.logger import Logger
+from vulcain.procedure.shared.instrumentation import MetricsAggregate, ProcedureMetrics
+from vulcain.procedure.shared.procedure import Procedure, ProcedureStatus
+from vulcain.procedure.shared.software import Software, DefaultSoftware
+from vulcain.procedure.shared.ui.procedure_ui import ProcedureUI
+
+logger = Logger(name="Batch Procedure")
+
+
+@dataclass
+class BatchResult:
+    context: Any
+    status: ProcedureStatus
+    return_value: Any = None
+    duration: float = 0.0
+    error: str = ""
+    metrics: ProcedureMetrics = None
+    # Reset of the DCC before the procedure, part of the duration.
+    reset_duration: float = 0.0
+
+
+@dataclass
+class BatchReport:
+    results: List[BatchResult] = field(default_factory=list)
+    start_duration: float = 0.0
+    stop_duration: float = 0.0
+    duration: float = 0.0
+
+    @property
+    def reset_duration(self) -> float:
+        return sum(result.reset_duration for result in self.results)
+
+    @property
+    def saved_duration(self) -> float:
+        """
+        DCC start and stop time saved compared to one launch() per context, minus the resets between
+        two contexts. Negative if resetting the DCC is slower than starting and stopping it.
+        """
+        return (self.start_duration + self.stop_duration) * max(len(self.results) - 1, 0) - self.reset_duration
+
+    @property
+    def succeeded(self) -> List[BatchResult]:
+        return [result for result in self.results if result.status == ProcedureStatus.SUCCESS]
+
+    @property
+    def failed(self) -> List[BatchResult]:
+        return [result for result in self.results if result.status != ProcedureStatus.SUCCESS]
+
+    def aggregate_metrics(self) -> MetricsAggregate:
+        """Return the phases metrics of every procedure run, to find the slowest ones."""
+        return MetricsAggregate(result.metrics for result in self.results)
+
+    def status_counts(self) -> dict:
+        counts = dict()
+        for result in self.results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        return counts
+
+
+class BatchLauncher():
+    """
+    Run one procedure over many contexts in a single DCC session.
+
+    The DCC is started once, reset between two contexts and stopped at the end.
+    A failing context does not stop the batch, its failure is recorded in its BatchResult.
+
+    Args :
+        procedure_factory (callable) : Build the procedure of a context, like a Procedure subclass.
+        ui (ProcedureUI) : UI given to every procedure.
+        dcc (Software) : Software shared by every procedure.
+    """
+
+    def __init__(self, procedure_factory: Callable[[Any], Procedure], ui: ProcedureUI = None,
+                 dcc: Software = None) -> None:
+        self.procedure_factory = procedure_factory
+        self.ui = ui
+        self.dcc = dcc or DefaultSoftware()
+
+    def launch(self, contexts: Iterable, on_result: Callable[[int, BatchResult], None] = None) -> BatchReport:
+        """
+        Args :
+            contexts (iterable) : Contexts of the procedures.
+            on_result (callable) : Called with the index and the result of every context once it ran.
+        """
+        report = BatchReport()
+        batch_start = time.perf_counter()
+
+        start = time.perf_counter()
+        self.dcc.start()
+        report.start_duration = time.perf_counter() - start
+
+        try:
+            for index, context in enumerate(contexts):
+                result = run_procedure(self.procedure_factory, context, self.dcc, self.ui, reset=index > 0)
+                report.results.append(result)
+                if on_result is not None:
+                    on_result(index, result)
+        finally:
+            stop = time.perf_counter()
+            self.dcc.stop()
+            report.stop_duration = time.perf_counter() - stop
+            report.duration = time.perf_counter() - batch_start
+
+        logger.info(f"Batch of {len(report.results)} contexts done in {report.duration:.2f}s, "
+                    f"{len(report.failed)} failed, {report.saved_duration:.2f}s of DCC startup saved.")
+        return report
+
+
+def run_procedure(procedure_factory: Callable[[Any], Procedure], context, dcc: Software, ui: ProcedureUI = None,
+                  reset: bool = False) -> BatchResult:
+    """
+    Run the procedure of a context in an already started DCC, without letting any exception out.
+
+    Args :
+        procedure_factory (callable) : Build the procedure of the context, like a Procedure subclass.
+        context : Context of the procedure.
+        dcc (Software) : Started software given to the procedure.
+        ui (ProcedureUI) : If given, replace the procedure UI.
+        reset (bool) : Reset the DCC before building the procedure.
+
+    Returns:
+        result (BatchResult) : Status of the procedure, EXECUTE_FAIL with the traceback if it raised.
+    """
+    start = time.perf_counter()
+    reset_duration = 0.0
+    procedure = None
+    try:
+        if reset:
+            try:
+                dcc.reset()
+            finally:
+                reset_duration = time.perf_counter() - start
+        procedure = procedure_factory(context)
+        procedure.dcc = dcc
+        if ui is not None:
+            procedure.ui = ui
+        return_value = procedure.run()
+    except Exception:
+        logger.exception(f"Exception occured while running the procedure on context : '{context}'.")
+        return BatchResult(context, ProcedureStatus.EXECUTE_FAIL, duration=time.perf_counter() - start,
+                           error=traceback.format_exc(), metrics=getattr(procedure, "metrics", None),
+                           reset_duration=reset_duration)
+
+    return BatchResult(context, procedure.status, return_value, time.perf_counter() - start,
+                       metrics=procedure.metrics, reset_duration=reset_duration)
@@ -0,0 +1,254 @@
+import dataclasses
+import hashlib
+import json
+import os
+import pickle
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable
+
+from vulcain.logger import Logger
+
+logger = Logger(name="Procedure Cache")
+
+# Increment when the fingerprint content changes, older stored results are then never hit.
+FINGERPRINT_VERSION = 2
+
+HASH_CHUNK_SIZE = 1024 * 1024
+RESULT_SUFFIX = ".result"
+
+
+@dataclass
+class ProcedureInputs:
+    """
+    Inputs a procedure result only depends on. Two runs with the same inputs give the same result.
+
+    Args :
+        files (iterable) : Files read by the procedure, fingerprinted by content.
+        params (iterable) : Param keys read by the procedure, resolved with the procedure context.
+        context (bool) : The procedure context is an input.
+        extra : Any other JSON serializable input, like the procedure code version.
+    """
+    files: Iterable[str] = ()
+    params: Iterable[str] = ()
+    context: bool = True
+    extra: Any = None
+
+
+@dataclass
+class CachedResult:
+    fingerprint: str
+    procedure: str
+    return_value: Any = None
+    created: float = 0.0
+
+
+class FileFingerprinter():
+    """
+    Content hash of files, computed again only when their mtime or size changed.
+
+    A file modified too recently to trust its mtime is hashed on every call.
+    """
+
+    def __init__(self) -> None:
+        # Path -> ((mtime_ns, size), sha1).
+        self._hashes: Dict[str, tuple] = dict()
+
+    def hash(self, file_path: str) -> str:
+        """Return the sha1 of a file content, None if it does not exist."""
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            self._hashes.pop(file_path, None)
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._hashes.get(file_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        sha1 = hashlib.sha1()
+        with open(file_path, "rb") as read_file:
+            for chunk in iter(lambda: read_file.read(HASH_CHUNK_SIZE), b""):
+                sha1.update(chunk)
+        digest = sha1.hexdigest()
+
+        # Imported here, vulcain.filesystem loads the path templates and the whole config.
+        from vulcain.filesystem.version_index import RACY_MTIME_DELAY_NS
+        if time.time_ns() - stat.st_mtime_ns > RACY_MTIME_DELAY_NS:
+            self._hashes[file_path] = (signature, digest)
+        return digest
+
+
+_file_fingerprinter = FileFingerprinter()
+
+
+def _context_data(context) -> Any:
+    # Imported here, the codec imports the procedure module which imports this one.
+    from vulcain.procedure.shared.context_codec import ContextCodecError, context_to_dict
+    try:
+        data = context_to_dict(context)
+    except ContextCodecError:
+        return dataclasses.asdict(context) if dataclasses.is_dataclass(context) else context
+    # The return value is the procedure output, not one of its inputs.
+    data.pop("return_value", None)
+    return data
+
+
+def fingerprint(procedure_name: str, inputs: ProcedureInputs, context=None,
+                fingerprinter: FileFingerprinter = None) -> str:
+    """
+    Return the fingerprint of a procedure inputs : a sha1 of the procedure name, the files contents,
+    the params values and the context.
+
+    Args :
+        procedure_name (str) : Procedure class name, two procedures never share a fingerprint.
+        inputs (ProcedureInputs) : Declared inputs of the procedure.
+        context : Context the params are resolved with, and fingerprinted if inputs.context.
+        fingerprinter (FileFingerprinter) : Keeps the files hashes. Default to one shared by the process.
+    """
+    fingerprinter = fingerprinter or _file_fingerprinter
+    data = {
+        "version": FINGERPRINT_VERSION,
+        "procedure": procedure_name,
+        "files": {file_path: fingerprinter.hash(file_path) for file_path in sorted(inputs.files)},
+        "extra": inputs.extra
+    }
+
+    params = sorted(inputs.params)
+    if params:
+        from vulcain.parametric import param_many
+        # The params cascade only knows about VulcainContext, a ProcedureContext gives its own.
+        vulcain_context = getattr(context, "context", context)
+        data["params"] = param_many(params, vulcain_context)
+
+    if inputs.context:
+        data["context"] = _context_data(context)
+
+    # default=repr keeps unserializable values fingerprintable, as long as their repr is stable.
+    encoded = json.dumps(data, sort_keys=True, default=repr, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+class ResultStore():
+    """
+    Results of procedures by inputs fingerprint, evicting the least recently used ones.
+
+    Results are kept in memory, and pickled in a directory if one is given so they are shared
+    between processes and sessions. The recency of a stored file is its mtime, touched on every hit.
+
+    Args :
+        directory (str) : Where results are pickled. None to keep them in memory only.
+        max_entries (int) : Number of results kept.
+        max_bytes (int) : Size of the pickled results kept in the directory.
+    """
+
+    def __init__(self, directory: str = None, max_entries: int = 1000, max_bytes: int = 256 * 2**20) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Fingerprint -> stored size in bytes, from the least to the most recently used.
+        self._entries: OrderedDict = OrderedDict()
+        self._memory: Dict[str, CachedResult] = dict()
+        self._size = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load_directory()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{RESULT_SUFFIX}")
+
+    def _load_directory(self) -> None:
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(RESULT_SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, entry.name[:-len(RESULT_SUFFIX)], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._size += size
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> CachedResult:
+        """Return the stored result of a fingerprint, None if there is none."""
+        result = self._memory.get(key)
+        if result is None and self.directory:
+            # The result may have been stored by another process since the directory was loaded.
+            try:
+                with open(self._path(key), "rb") as result_file:
+                    result = pickle.load(result_file)
+                    size = result_file.tell()
+                os.utime(self._path(key))
+            except FileNotFoundError:
+                self._discard(key)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                logger.warning(f"Stored result : '{key}' can't be read, it is discarded.")
+                self._discard(key)
+                result = None
+            else:
+                if key not in self._entries:
+                    self._entries[key] = size
+                    self._size += size
+
+        if result is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        self._memory[key] = result
+        self._evict()
+        return result
+
+    def put(self, result: CachedResult) -> None:
+        key = result.fingerprint
+        self._discard(key)
+
+        size = 0
+        if self.directory:
+            try:
+                data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                logger.warning(f"Result of procedure : '{result.procedure}' can't be pickled, it is not stored.")
+                return
+            tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as result_file:
+                result_file.write(data)
+            os.replace(tmp_path, self._path(key))
+            size = len(data)
+
+        self._entries[key] = size
+        self._memory[key] = result
+        self._size += size
+        self._evict()
+
+    def _discard(self, key: str) -> None:
+        size = self._entries.pop(key, None)
+        self._memory.pop(key, None)
+        if size is None:
+            return
+        self._size -= size
+        if self.directory:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+            self._discard(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self._discard(key)
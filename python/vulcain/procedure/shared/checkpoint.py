@@ -0,0 +1,81 @@
+import os
+import pickle
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+from vulcain.logger import Logger
+
+logger = Logger(name="Procedure Checkpoint")
+
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+# Checkpoints older than this are not resumed from, the procedure starts over.
+DEFAULT_MAX_AGE = 7 * 24 * 3600.0
+
+
+@dataclass
+class Checkpoint:
+    procedure: str
+    # Checkpoint name -> state saved with it, in the order they were reached.
+    states: Dict[str, Any] = field(default_factory=dict)
+    updated: float = 0.0
+
+    @property
+    def last(self) -> str:
+        return next(reversed(self.states), None)
+
+
+class CheckpointStore():
+    """
+    Checkpoints of unfinished procedure runs, pickled in a directory, one file per run key.
+
+    Args :
+        directory (str) : Where checkpoints are saved, shared between sessions.
+        max_age (float) : Seconds after which a checkpoint is discarded instead of resumed.
+    """
+
+    def __init__(self, directory: str, max_age: float = DEFAULT_MAX_AGE) -> None:
+        self.directory = directory
+        self.max_age = max_age
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{CHECKPOINT_SUFFIX}")
+
+    def load(self, key: str) -> Checkpoint:
+        """Return the checkpoint of a run key, None if there is none or it is too old."""
+        try:
+            with open(self._path(key), "rb") as checkpoint_file:
+                checkpoint = pickle.load(checkpoint_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            logger.warning(f"Checkpoint : '{key}' can't be read, the procedure starts over.")
+            self.clear(key)
+            return None
+
+        if time.time() - checkpoint.updated > self.max_age:
+            logger.info(f"Checkpoint : '{key}' is too old, the procedure starts over.")
+            self.clear(key)
+            return None
+        return checkpoint
+
+    def save(self, key: str, checkpoint: Checkpoint) -> None:
+        """
+        Raises:
+            TypeError, PicklingError : If a state can't be pickled, nothing is written then.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        checkpoint.updated = time.time()
+        # Pickled before anything is written, an unpicklable state leaves no temporary file.
+        data = pickle.dumps(checkpoint, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as checkpoint_file:
+            checkpoint_file.write(data)
+        os.replace(tmp_path, self._path(key))
+
+    def clear(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,196 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, List
+
+from vulcain.logger import Logger
+
+logger = Logger(name="Procedure Checks")
+
+# Where a check runs : in the calling thread, like the DCC checks, on a thread pool for the I/O
+# bound ones, or on a process pool for the CPU bound ones.
+INLINE = "inline"
+THREAD = "thread"
+PROCESS = "process"
+POOLS = (INLINE, THREAD, PROCESS)
+
+DEFAULT_MAX_THREADS = 16
+
+
+class CheckLevel(Enum):
+    OK = "ok"
+    WARNING = "warning"
+    ERROR = "error"
+
+
+@dataclass
+class CheckResult:
+    name: str
+    level: CheckLevel
+    message: str = ""
+    duration: float = 0.0
+
+    def __str__(self) -> str:
+        return f"{self.name} : {self.message}" if self.message else self.name
+
+
+@dataclass
+class RegisteredCheck:
+    name: str
+    function: Callable[[Any], Any]
+    cost: float = 1.0
+    pool: str = THREAD
+
+
+@dataclass
+class CheckReport:
+    results: List[CheckResult] = field(default_factory=list)
+    # Checks without a result because an error stopped the checks first, in fail fast mode.
+    cancelled: List[str] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def errors(self) -> List[CheckResult]:
+        return [result for result in self.results if result.level == CheckLevel.ERROR]
+
+    @property
+    def warnings(self) -> List[CheckResult]:
+        return [result for result in self.results if result.level == CheckLevel.WARNING]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def _run_check(function: Callable[[Any], Any], context) -> tuple:
+    """
+    Run one check and return its (level, message, duration).
+
+    A check returns None or True when it is right, False or an error message when it is wrong,
+    or a (CheckLevel, message) tuple. A check raising is wrong, the exception is its message.
+    """
+    start = time.perf_counter()
+    try:
+        value = function(context)
+    except Exception as err:
+        level, message = CheckLevel.ERROR, f"{type(err).__name__}: {err}"
+    else:
+        if value is None or value is True:
+            level, message = CheckLevel.OK, ""
+        elif value is False:
+            level, message = CheckLevel.ERROR, ""
+        elif isinstance(value, str):
+            level, message = CheckLevel.ERROR, value
+        elif isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], CheckLevel):
+            level, message = value[0], str(value[1])
+        else:
+            level, message = CheckLevel.ERROR, f"Check returned an unexpected value : {value!r}."
+    return level, message, time.perf_counter() - start
+
+
+class CheckRunner():
+    """
+    Independent checks of a procedure, run concurrently and reported all together.
+
+    The most costly checks are started first, so the slowest one does not start last.
+    Inline checks run in the calling thread while the pooled ones run.
+    Process pool checks and their context are pickled, they must be module level functions.
+
+    Args :
+        fail_fast (bool) : Stop at the first ERROR, checks not started yet are cancelled.
+            Checks already running finish in the background.
+        max_threads (int) : Size of the thread pool.
+        max_processes (int) : Size of the process pool. Default to the CPU count.
+    """
+
+    def __init__(self, fail_fast: bool = False, max_threads: int = DEFAULT_MAX_THREADS,
+                 max_processes: int = None) -> None:
+        self.fail_fast = fail_fast
+        self.max_threads = max_threads
+        self.max_processes = max_processes or os.cpu_count() or 1
+        self.checks: List[RegisteredCheck] = []
+
+    def __len__(self) -> int:
+        return len(self.checks)
+
+    def register(self, name: str, function: Callable[[Any], Any], cost: float = 1.0,
+                 pool: str = THREAD) -> RegisteredCheck:
+        """
+        Args :
+            name (str) : Name of the check, reported in the wrong checks.
+            function (callable) : Check called with the context, see _run_check for what it returns.
+            cost (float) : Estimated duration, only compared to the other checks costs.
+            pool (str) : INLINE, THREAD or PROCESS.
+        """
+        if pool not in POOLS:
+            raise ValueError(f"Check : '{name}' pool must be one of {POOLS}, not : '{pool}'.")
+        if any(check.name == name for check in self.checks):
+            raise ValueError(f"Check : '{name}' is already registered.")
+        check = RegisteredCheck(name, function, cost, pool)
+        self.checks.append(check)
+        return check
+
+    def run(self, context=None, fail_fast: bool = None) -> CheckReport:
+        """
+        Run every registered check on the context.
+
+        Returns:
+            report (CheckReport) : Results in the registration order.
+        """
+        fail_fast = self.fail_fast if fail_fast is None else fail_fast
+        start = time.perf_counter()
+        results = dict()
+        checks = sorted(self.checks, key=lambda check: check.cost, reverse=True)
+
+        pools = dict()
+        pooled = [check for check in checks if check.pool != INLINE]
+        if any(check.pool == THREAD for check in pooled):
+            pools[THREAD] = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="check")
+        if any(check.pool == PROCESS for check in pooled):
+            pools[PROCESS] = ProcessPoolExecutor(max_workers=self.max_processes)
+
+        stopped = False
+        futures = dict()
+        try:
+            futures = {pools[check.pool].submit(_run_check, check.function, context): check for check in pooled}
+
+            for check in checks:
+                if check.pool != INLINE:
+                    continue
+                results[check.name] = CheckResult(check.name, *_run_check(check.function, context))
+                if fail_fast and results[check.name].level == CheckLevel.ERROR:
+                    stopped = True
+                    break
+
+            pending = set(futures)
+            while pending and not stopped:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    check = futures[future]
+                    try:
+                        results[check.name] = CheckResult(check.name, *future.result())
+                    except Exception as err:
+                        # Raised by the pool, like an unpicklable check.
+                        results[check.name] = CheckResult(check.name, CheckLevel.ERROR, f"{type(err).__name__}: {err}")
+                    if fail_fast and results[check.name].level == CheckLevel.ERROR:
+                        stopped = True
+        finally:
+            if stopped:
+                # Checks not started yet are dropped, shutdown(cancel_futures=True) needs Python 3.9.
+                for future in futures:
+                    future.cancel()
+            for pool in pools.values():
+                pool.shutdown(wait=not stopped)
+
+        report = CheckReport(duration=time.perf_counter() - start)
+        for check in self.checks:
+            if check.name in results:
+                report.results.append(results[check.name])
+            else:
+                report.cancelled.append(check.name)
+
+        if report.cancelled:
+            logger.info(f"Checks stopped at the first error, without result : {report.cancelled}.")
+        return report
@@ -0,0 +1,266 @@
+"""
+Wire format of VulcainContext and ProcedureContext, to store contexts or hand them to other programs.
+
+Two codecs share the same canonical dict, holding only the values differing from the defaults :
+    JSON : encode_json / decode_json, readable, one context or a list.
+    Binary : encode / decode and encode_many / decode_many, compact and fast for thousands of contexts.
+
+The binary format is columnar : a JSON string table, then one array of string codes per field,
+so contexts sharing their section, episode or task share their strings.
+The input_args, any_context and return_value of a ProcedureContext must be JSON serializable.
+
+The executors and the scheduler ship contexts to their workers pickled, one per job : pickling a slotted
+context is faster than both codecs, see vulcain.benchmarks.context_codec. The binary codec is smaller,
+for batches of contexts written to a file or sent over the network.
+"""
+import dataclasses
+import hashlib
+import json
+import struct
+import sys
+from array import array
+from operator import attrgetter
+from typing import Iterable, List, Union
+
+from vulcain.context import VulcainContext
+from vulcain.procedure.shared.procedure import ProcedureContext
+
+MAGIC = b"VCTX"
+CODEC_VERSION = 1
+
+# Magic, codec version, contexts count, string codes typecode, string table size in bytes.
+HEADER = struct.Struct("<4sBIcI")
+
+VULCAIN_KIND = "vulcain"
+PROCEDURE_KIND = "procedure"
+
+# Kind column values. A ProcedureContext may have no VulcainContext.
+KIND_VULCAIN = 0
+KIND_PROCEDURE = 1
+KIND_PROCEDURE_WITHOUT_CONTEXT = 2
+
+VULCAIN_FIELDS = tuple(context_field.name for context_field in dataclasses.fields(VulcainContext))
+VULCAIN_DEFAULTS = {context_field.name: (context_field.default_factory() if context_field.default_factory
+                                         is not dataclasses.MISSING else context_field.default)
+                    for context_field in dataclasses.fields(VulcainContext)
+                    if context_field.default is not dataclasses.MISSING
+                    or context_field.default_factory is not dataclasses.MISSING}
+PROCEDURE_FIELDS = ("input_args", "any_context", "return_value")
+
+# Columns of the string codes, the version has its own column.
+STRING_FIELDS = tuple(name for name in VULCAIN_FIELDS if name != "version")
+# Version column value of a None version.
+NO_VERSION = -2**63
+LABELS_SEPARATOR = "\x1f"
+_string_values = attrgetter(*STRING_FIELDS)
+
+Context = Union[VulcainContext, ProcedureContext]
+
+
+class ContextCodecError(ValueError):
+    pass
+
+
+# json.dumps() builds a new encoder per call when given arguments, this one is shared.
+_encoder = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+_dumps = _encoder.encode
+
+
+def context_to_dict(context: Context) -> dict:
+    """Return the canonical dict of a context, without its default values."""
+    if isinstance(context, VulcainContext):
+        data = {"kind": VULCAIN_KIND, "section": context.section}
+        for name, default in VULCAIN_DEFAULTS.items():
+            value = getattr(context, name)
+            if value != default:
+                data[name] = list(value) if name == "labels" else value
+        return data
+
+    if isinstance(context, ProcedureContext):
+        data = {"kind": PROCEDURE_KIND}
+        if context.context is not None:
+            data["context"] = context_to_dict(context.context)
+        if context.input_args:
+            data["input_args"] = context.input_args
+        if context.any_context:
+            data["any_context"] = context.any_context
+        # A falsy return value, like 0 or False, is still a return value, as in encode_many.
+        if context.return_value is not None:
+            data["return_value"] = context.return_value
+        return data
+
+    raise ContextCodecError(f"Context : '{context}' is not a VulcainContext or a ProcedureContext.")
+
+
+def context_from_dict(data: dict) -> Context:
+    data = dict(data)
+    kind = data.pop("kind", VULCAIN_KIND)
+    if kind == VULCAIN_KIND:
+        return VulcainContext(**data)
+
+    if kind == PROCEDURE_KIND:
+        vulcain_context = data.pop("context", None)
+        return ProcedureContext(context_from_dict(vulcain_context) if vulcain_context is not None else None,
+                                input_args=data.get("input_args") or {},
+                                any_context=data.get("any_context") or {},
+                                return_value=data.get("return_value"))
+
+    raise ContextCodecError(f"Context kind : '{kind}' is unknown.")
+
+
+def encode_json(context: Union[Context, Iterable[Context]]) -> str:
+    """Encode a context, or a list of contexts, as compact JSON."""
+    if isinstance(context, (VulcainContext, ProcedureContext)):
+        return _dumps(context_to_dict(context))
+    return _dumps([context_to_dict(item) for item in context])
+
+
+def decode_json(text: str) -> Union[Context, List[Context]]:
+    data = json.loads(text)
+    if isinstance(data, list):
+        return [context_from_dict(item) for item in data]
+    return context_from_dict(data)
+
+
+def content_hash(context: Context) -> str:
+    """
+    Return a sha1 of the context content, stable between processes, sessions and Python versions.
+    The return value of a ProcedureContext is an output, it is not hashed. Fields left to their
+    default are not hashed, so adding a field with a default keeps the previous hashes.
+    """
+    data = context_to_dict(context)
+    data.pop("return_value", None)
+    return hashlib.sha1(_dumps(data).encode("utf-8")).hexdigest()
+
+
+def encode(context: Context) -> bytes:
+    return encode_many((context,))
+
+
+def decode(data: bytes) -> Context:
+    contexts = decode_many(data)
+    if len(contexts) != 1:
+        raise ContextCodecError(f"Encoded data holds {len(contexts)} contexts, not one.")
+    return contexts[0]
+
+
+def encode_many(contexts: Iterable[Context]) -> bytes:
+    """Encode contexts in the columnar binary format."""
+    strings = [""]
+    codes = {"": 0}
+
+    def code(value: str) -> int:
+        result = codes.get(value)
+        if result is None:
+            result = codes[value] = len(strings)
+            strings.append(value)
+        return result
+
+    kinds = array("B")
+    versions = array("q")
+    string_columns = {name: [] for name in STRING_FIELDS + PROCEDURE_FIELDS}
+    vulcain_columns = [string_columns[name] for name in STRING_FIELDS]
+    labels_index = STRING_FIELDS.index("labels")
+    empty_context = VulcainContext("")
+
+    for context in contexts:
+        if isinstance(context, ProcedureContext):
+            vulcain_context = context.context
+            kinds.append(KIND_PROCEDURE if vulcain_context is not None else KIND_PROCEDURE_WITHOUT_CONTEXT)
+            try:
+                string_columns["input_args"].append(code(_dumps(context.input_args) if context.input_args else ""))
+                string_columns["any_context"].append(code(_dumps(context.any_context) if context.any_context else ""))
+                string_columns["return_value"].append(
+                    code(_dumps(context.return_value) if context.return_value is not None else ""))
+            except TypeError as err:
+                raise ContextCodecError(f"Procedure context values are not JSON serializable : {err}.") from None
+            vulcain_context = vulcain_context or empty_context
+        elif isinstance(context, VulcainContext):
+            vulcain_context = context
+            kinds.append(KIND_VULCAIN)
+            for name in PROCEDURE_FIELDS:
+                string_columns[name].append(0)
+        else:
+            raise ContextCodecError(f"Context : '{context}' is not a VulcainContext or a ProcedureContext.")
+
+        values = list(_string_values(vulcain_context))
+        values[labels_index] = LABELS_SEPARATOR.join(values[labels_index])
+        for column, value in zip(vulcain_columns, values):
+            column.append(code(value))
+        versions.append(NO_VERSION if vulcain_context.version is None else vulcain_context.version)
+
+    # The smallest codes fitting the string table.
+    typecode = "B" if len(strings) <= 0xFF else "H" if len(strings) <= 0xFFFF else "I"
+    string_table = _dumps(strings).encode("utf-8")
+
+    columns = [kinds, versions] + [array(typecode, string_columns[name]) for name in STRING_FIELDS + PROCEDURE_FIELDS]
+    if sys.byteorder == "big":
+        for column in columns:
+            column.byteswap()
+
+    header = HEADER.pack(MAGIC, CODEC_VERSION, len(kinds), typecode.encode("ascii"), len(string_table))
+    return b"".join([header, string_table] + [column.tobytes() for column in columns])
+
+
+def decode_many(data: bytes) -> List[Context]:
+    """
+    Decode contexts encoded by encode_many.
+
+    Raises:
+        ContextCodecError : If the data is not in the binary format or of another codec version.
+    """
+    try:
+        magic, version, count, typecode, table_size = HEADER.unpack_from(data)
+    except struct.error:
+        raise ContextCodecError("Encoded contexts are truncated.") from None
+    if magic != MAGIC:
+        raise ContextCodecError("Data are not encoded contexts.")
+    if version != CODEC_VERSION:
+        raise ContextCodecError(f"Encoded contexts codec version : '{version}' is not supported.")
+
+    offset = HEADER.size
+    strings = json.loads(data[offset:offset + table_size].decode("utf-8"))
+    offset += table_size
+
+    def read_column(column_typecode: str) -> array:
+        nonlocal offset
+        column = array(column_typecode)
+        size = column.itemsize * count
+        if offset + size > len(data):
+            raise ContextCodecError("Encoded contexts are truncated.")
+        column.frombytes(data[offset:offset + size])
+        if sys.byteorder == "big":
+            column.byteswap()
+        offset += size
+        return column
+
+    typecode = typecode.decode("ascii")
+    kinds = read_column("B")
+    versions = read_column("q")
+    string_columns = [[strings[code] for code in read_column(typecode)] for _ in STRING_FIELDS]
+    procedure_columns = [read_column(typecode) for _ in PROCEDURE_FIELDS]
+
+    labels_index = STRING_FIELDS.index("labels")
+    version_index = VULCAIN_FIELDS.index("version")
+    contexts = []
+    for index, row in enumerate(zip(*string_columns)):
+        row = list(row)
+        labels = row[labels_index]
+        row[labels_index] = labels.split(LABELS_SEPARATOR) if labels else []
+        version = versions[index]
+        row.insert(version_index, None if version == NO_VERSION else version)
+        # Positional arguments, in the VulcainContext fields order.
+        vulcain_context = VulcainContext(*row)
+
+        kind = kinds[index]
+        if kind == KIND_VULCAIN:
+            contexts.append(vulcain_context)
+            continue
+
+        # Decoded for every context, two contexts never share their dicts.
+        input_args, any_context, return_value = (strings[column[index]] for column in procedure_columns)
+        contexts.append(ProcedureContext(vulcain_context if kind == KIND_PROCEDURE else None,
+                                         input_args=json.loads(input_args) if input_args else {},
+                                         any_context=json.loads(any_context) if any_context else {},
+                                         return_value=json.loads(return_value) if return_value else None))
+    return contexts
@@ -0,0 +1,197 @@
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor as _ProcessPool
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Iterable, List
+
+from vulcain.logger import Logger
+from vulcain.procedure.shared.expander import Expander, DefaultExpander
+from vulcain.procedure.shared.procedure import ProcedureContext, ProcedureStatus
+from vulcain.procedure.shared.process import Process
+
+logger = Logger(name="Executor")
+
+# From the least to the most severe, the status of many runs is the most severe one.
+STATUS_SEVERITY = (ProcedureStatus.SUCCESS, ProcedureStatus.SKIPPED, ProcedureStatus.CANCELLED,
+                   ProcedureStatus.CHECK_FAIL, ProcedureStatus.EXECUTE_FAIL, ProcedureStatus.REVERT_FAIL)
+
+
+def aggregate_status(statuses: Iterable[ProcedureStatus]) -> ProcedureStatus:
+    """Return the most severe status, SUCCESS if there is none."""
+    return max(statuses, key=STATUS_SEVERITY.index, default=ProcedureStatus.SUCCESS)
+
+
+@dataclass
+class ProcessResult:
+    context: ProcedureContext
+    status: ProcedureStatus
+    duration: float = 0.0
+    failed_process: str = ""
+    error: str = ""
+
+
+@dataclass
+class ExecutionReport:
+    results: List[ProcessResult] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def status(self) -> ProcedureStatus:
+        return aggregate_status(result.status for result in self.results)
+
+    @property
+    def failed(self) -> List[ProcessResult]:
+        return [result for result in self.results if result.status != ProcedureStatus.SUCCESS]
+
+
+def run_processes(processes: List[Process], context: ProcedureContext) -> ProcessResult:
+    """
+    Check every process, then execute them in order, on one context.
+
+    Each process gets the context returned by the previous one. If a check or an execute fails,
+    the processes already executed and the failing one are reverted, in the reverse order.
+
+    Returns:
+        result (ProcessResult) : Status and last context, never raises.
+    """
+    start = time.perf_counter()
+    status = ProcedureStatus.SUCCESS
+    failed_process = ""
+    error = ""
+    to_revert = []
+
+    for phase, fail_status in (("check", ProcedureStatus.CHECK_FAIL), ("execute", ProcedureStatus.EXECUTE_FAIL)):
+        for process in processes:
+            if phase == "execute":
+                to_revert.append(process)
+            try:
+                context = getattr(process, phase)(context) or context
+            except Exception:
+                status = fail_status
+                failed_process = process.name
+                error = traceback.format_exc()
+                break
+        if status != ProcedureStatus.SUCCESS:
+            break
+
+    if status != ProcedureStatus.SUCCESS:
+        for process in reversed(to_revert):
+            try:
+                context = process.revert(context) or context
+            except Exception:
+                status = ProcedureStatus.REVERT_FAIL
+                error += f"\nRevert of '{process.name}' failed :\n{traceback.format_exc()}"
+
+    return ProcessResult(context, status, time.perf_counter() - start, failed_process, error)
+
+
+class Executor():
+    """
+    Run processes on every child context of an expander, one context after the other.
+
+    Args :
+        processes (list) : Processes run in order on each context.
+        expander (Expander) : Turns the executed context into child contexts. Default keeps it as it is.
+    """
+
+    def __init__(self, processes: List[Process], expander: Expander = None) -> None:
+        self.processes = list(processes)
+        self.expander = expander or DefaultExpander()
+
+    def execute(self, context: ProcedureContext) -> ExecutionReport:
+        """
+        Expand the context and run the processes on every child.
+
+        Returns:
+            report (ExecutionReport) : Results in the order of the children and their aggregated status.
+        """
+        start = time.perf_counter()
+        contexts = self.expander.expand(context)
+        report = ExecutionReport(results=self._run(contexts))
+        report.duration = time.perf_counter() - start
+
+        logger.info(f"{len(report.results)} contexts executed in {report.duration:.2f}s, "
+                    f"{len(report.failed)} failed, status : '{report.status.name}'.")
+        return report
+
+    def _run(self, contexts: List[ProcedureContext]) -> List[ProcessResult]:
+        return [run_processes(self.processes, context) for context in contexts]
+
+
+class ProcessExecutor(Executor):
+    """
+    Run processes on every child context of an expander concurrently, on a pool of processes.
+
+    Processes and contexts are pickled to the pool workers. Results are collected in the order of
+    the children whatever order they finish in. A worker dying breaks the pool : the contexts without
+    a result are run again one at a time on a new pool, so only the context killing its worker fails.
+
+    Args :
+        processes (list) : Processes run in order on each context.
+        expander (Expander) : Turns the executed context into child contexts. Default keeps it as it is.
+        max_workers (int) : Maximum number of contexts run at the same time. Default to the CPU count.
+    """
+
+    def __init__(self, processes: List[Process], expander: Expander = None, max_workers: int = None) -> None:
+        super().__init__(processes, expander)
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def _run(self, contexts: List[ProcedureContext]) -> List[ProcessResult]:
+        if len(contexts) <= 1:
+            return super()._run(contexts)
+
+        results = [None] * len(contexts)
+        broken = []
+        with _ProcessPool(max_workers=min(self.max_workers, len(contexts))) as pool:
+            futures = []
+            try:
+                for context in contexts:
+                    futures.append(pool.submit(run_processes, self.processes, context))
+            except BrokenProcessPool:
+                # A worker died before every context was submitted, the rest runs one at a time below.
+                pass
+            broken.extend(range(len(futures), len(contexts)))
+
+            for index, future in enumerate(futures):
+                try:
+                    results[index] = self._result(contexts[index], future)
+                except BrokenProcessPool:
+                    broken.append(index)
+
+        if broken:
+            logger.warning(f"A worker process died, {len(broken)} contexts are run again one at a time.")
+            self._run_isolated(contexts, sorted(broken), results)
+        return results
+
+    def _run_isolated(self, contexts: List[ProcedureContext], indexes: List[int], results: list) -> None:
+        """Run contexts one at a time on a single worker, the context running when it dies is the one killing it."""
+        pool = _ProcessPool(max_workers=1)
+        try:
+            for index in indexes:
+                context = contexts[index]
+                try:
+                    results[index] = self._result(context, pool.submit(run_processes, self.processes, context))
+                except BrokenProcessPool:
+                    logger.error(f"A worker process died while running the processes on context : '{context}'.")
+                    results[index] = ProcessResult(context, ProcedureStatus.EXECUTE_FAIL,
+                                                   error="The worker process running the context died.")
+                    pool.shutdown(wait=False)
+                    pool = _ProcessPool(max_workers=1)
+        finally:
+            pool.shutdown()
+
+    def _result(self, context: ProcedureContext, future) -> ProcessResult:
+        """
+        Raises:
+            BrokenProcessPool : If a worker of the pool died before the result was sent.
+        """
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            raise
+        except Exception:
+            # Raised by the pool, like an unpicklable process.
+            logger.exception(f"Processes could not run on context : '{context}'.")
+            return ProcessResult(context, ProcedureStatus.EXECUTE_FAIL, error=traceback.format_exc())
@@ -0,0 +1,51 @@
+import copy
+import dataclasses
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, List, Union
+
+from vulcain.procedure.shared.procedure import ProcedureContext
+
+
+class Expander(ABC):
+    """Turn one context into the child contexts an Executor runs its processes on."""
+
+    @abstractmethod
+    def expand(self, context: ProcedureContext) -> List[ProcedureContext]:
+        """"""
+
+
+class DefaultExpander(Expander):
+    """Keep the context as it is, processes run once."""
+
+    def expand(self, context: ProcedureContext) -> List[ProcedureContext]:
+        return [context]
+
+
+class FieldExpander(Expander):
+    """
+    One child context per value of a VulcainContext field, like a sequence into its shots.
+
+    Children are copies of the context, their input_args and any_context dicts are not shared.
+
+    Args :
+        field (str) : VulcainContext field set on the children, like 'shot'.
+        values (iterable or callable) : Values of the field, or a function returning them from the context.
+
+    Example :
+        FieldExpander("shot", lambda context: list_shots(context.context.episode, context.context.sequence))
+    """
+
+    def __init__(self, field: str, values: Union[Iterable, Callable[[ProcedureContext], Iterable]]) -> None:
+        self.field = field
+        self.values = values
+
+    def expand(self, context: ProcedureContext) -> List[ProcedureContext]:
+        if context.context is None:
+            raise ValueError(f"Can't expand '{self.field}' of a procedure context without VulcainContext.")
+
+        values = self.values(context) if callable(self.values) else self.values
+        return [dataclasses.replace(context,
+                                    context=dataclasses.replace(context.context, **{self.field: value}),
+                                    input_args=copy.deepcopy(context.input_args),
+                                    any_context=copy.deepcopy(context.any_context))
+                for value in values]
@@ -0,0 +1,213 @@
+import json
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+from vulcain.logger import Logger
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows.
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = Logger(name="Procedure Metrics")
+
+
+def peak_rss() -> int:
+    """Return the peak resident memory of the process lifetime in bytes, 0 if it can't be read."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS.
+        return peak if sys.platform == "darwin" else peak * 1024
+    if psutil is not None:
+        memory = psutil.Process().memory_info()
+        return getattr(memory, "peak_wset", memory.rss)
+    return 0
+
+
+@dataclass
+class PhaseMetrics:
+    phase: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    # Peak resident memory of the whole process lifetime at the end of the phase, not of the phase alone :
+    # in a long lived worker it is the peak of every job before, and stays the same once reached.
+    process_peak_rss: int = 0
+    # How much the phase raised the process peak. A phase using less memory than an earlier peak gives 0.
+    peak_rss_growth: int = 0
+    failed: bool = False
+
+
+@dataclass
+class ProcedureMetrics:
+    procedure: str
+    phases: List[PhaseMetrics] = field(default_factory=list)
+
+    @property
+    def wall_time(self) -> float:
+        return sum(phase.wall_time for phase in self.phases)
+
+    @property
+    def cpu_time(self) -> float:
+        return sum(phase.cpu_time for phase in self.phases)
+
+    @property
+    def process_peak_rss(self) -> int:
+        return max((phase.process_peak_rss for phase in self.phases), default=0)
+
+    @property
+    def peak_rss_growth(self) -> int:
+        """How much the run raised the process peak resident memory."""
+        return sum(phase.peak_rss_growth for phase in self.phases)
+
+    def phase(self, phase: str) -> PhaseMetrics:
+        """Return the metrics of a phase, like 'execute'. Raise ValueError if it did not run."""
+        for metrics in self.phases:
+            if metrics.phase == phase:
+                return metrics
+        raise ValueError(f"Procedure : '{self.procedure}' has no metrics for phase : '{phase}'.")
+
+    @contextmanager
+    def measure(self, phase: str):
+        """Record the wall time, CPU time and process peak RSS growth of the code run in the with block."""
+        metrics = PhaseMetrics(phase)
+        rss_start = peak_rss()
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        try:
+            yield metrics
+        except BaseException:
+            metrics.failed = True
+            raise
+        finally:
+            metrics.wall_time = time.perf_counter() - start
+            metrics.cpu_time = time.process_time() - cpu_start
+            metrics.process_peak_rss = peak_rss()
+            metrics.peak_rss_growth = metrics.process_peak_rss - rss_start
+            self.phases.append(metrics)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["wall_time"] = self.wall_time
+        data["cpu_time"] = self.cpu_time
+        data["process_peak_rss"] = self.process_peak_rss
+        data["peak_rss_growth"] = self.peak_rss_growth
+        return data
+
+
+class MetricsExporter(ABC):
+    """Receive the metrics of every procedure run once it ended."""
+
+    @abstractmethod
+    def export(self, metrics: ProcedureMetrics) -> None:
+        """"""
+
+
+class LoggerExporter(MetricsExporter):
+    def export(self, metrics: ProcedureMetrics) -> None:
+        phases = ", ".join(f"{phase.phase} {phase.wall_time * 1000:.1f}ms" for phase in metrics.phases)
+        logger.info(f"Procedure : '{metrics.procedure}' ran in {metrics.wall_time:.3f}s "
+                    f"(cpu {metrics.cpu_time:.3f}s, process peak rss {metrics.process_peak_rss / 2**20:.1f} MiB, "
+                    f"raised by {metrics.peak_rss_growth / 2**20:.1f} MiB) : {phases}.")
+
+
+class JsonLinesExporter(MetricsExporter):
+    """Append the metrics of every procedure run to a file, one JSON object per line."""
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+
+    def export(self, metrics: ProcedureMetrics) -> None:
+        data = metrics.to_dict()
+        data["pid"] = os.getpid()
+        data["time"] = time.time()
+        with open(self.file_path, "a") as metrics_file:
+            metrics_file.write(json.dumps(data) + "\n")
+
+
+_exporters: List[MetricsExporter] = []
+
+
+def add_exporter(exporter: MetricsExporter) -> None:
+    """Export the metrics of every procedure run of the process to the exporter."""
+    if exporter not in _exporters:
+        _exporters.append(exporter)
+
+
+def remove_exporter(exporter: MetricsExporter) -> None:
+    if exporter in _exporters:
+        _exporters.remove(exporter)
+
+
+def export(metrics: ProcedureMetrics) -> None:
+    """Send metrics to every added exporter. A failing exporter never fails the procedure."""
+    for exporter in list(_exporters):
+        try:
+            exporter.export(metrics)
+        except Exception:
+            logger.exception(f"Metrics exporter : '{type(exporter).__name__}' failed.")
+
+
+@dataclass
+class PhaseStats:
+    procedure: str
+    phase: str
+    count: int = 0
+    wall_time: float = 0.0
+    max_wall_time: float = 0.0
+    cpu_time: float = 0.0
+    process_peak_rss: int = 0
+    max_peak_rss_growth: int = 0
+    failures: int = 0
+
+    @property
+    def mean_wall_time(self) -> float:
+        return self.wall_time / self.count if self.count else 0.0
+
+
+class MetricsAggregate():
+    """Metrics of many procedure runs, summed by procedure and phase."""
+
+    def __init__(self, metrics: Iterable[ProcedureMetrics] = ()) -> None:
+        self.stats: Dict[Tuple[str, str], PhaseStats] = dict()
+        self.runs = 0
+        for procedure_metrics in metrics:
+            self.add(procedure_metrics)
+
+    def add(self, metrics: ProcedureMetrics) -> None:
+        if metrics is None:
+            return
+        self.runs += 1
+        for phase in metrics.phases:
+            key = (metrics.procedure, phase.phase)
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = PhaseStats(*key)
+            stats.count += 1
+            stats.wall_time += phase.wall_time
+            stats.max_wall_time = max(stats.max_wall_time, phase.wall_time)
+            stats.cpu_time += phase.cpu_time
+            stats.process_peak_rss = max(stats.process_peak_rss, phase.process_peak_rss)
+            stats.max_peak_rss_growth = max(stats.max_peak_rss_growth, phase.peak_rss_growth)
+            stats.failures += phase.failed
+
+    def slowest(self, count: int = 10) -> List[PhaseStats]:
+        """Return the phases with the most total wall time first."""
+        return sorted(self.stats.values(), key=lambda stats: stats.wall_time, reverse=True)[:count]
+
+    def format(self, count: int = 10) -> str:
+        lines = [f"{'procedure':<30} {'phase':<14} {'runs':>6} {'total':>10} {'mean':>10} {'max':>10} {'cpu':>10}"]
+        for stats in self.slowest(count):
+            lines.append(f"{stats.procedure:<30} {stats.phase:<14} {stats.count:>6} {stats.wall_time:>9.3f}s "
+                         f"{stats.mean_wall_time:>9.3f}s {stats.max_wall_time:>9.3f}s {stats.cpu_time:>9.3f}s")
+        return "\n".join(lines)
@@ -1,11 +1,22 @@
+import asyncio
+import inspect
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, List
 from enum import Enum, auto
 
 from vulcain.context import VulcainContext
+from vulcain.helpers.slots import add_slots
 from vulcain.logger import Logger
+from vulcain.procedure.shared import instrumentation
+from vulcain.procedure.shared.checks import THREAD, CheckReport, CheckRunner
+from vulcain.procedure.shared.checkpoint import Checkpoint, CheckpointStore
+from vulcain.procedure.shared.cache import CachedResult, ProcedureInputs, ResultStore, fingerprint
+from vulcain.procedure.shared.instrumentation import ProcedureMetrics
+from vulcain.procedure.shared.staging import StagedOutputs
 from vulcain.procedure.shared.ui.procedure_ui import ProcedureUI
+from vulcain.procedure.shared.ui.progress import ProgressReporter
 from vulcain.procedure.shared.software import Software, DefaultSoftware
 from vulcain.context import VulcainContext
 
@@ -13,41 +24,208 @@ from vulcain.context import VulcainContext
 logger = Logger(name="Procedure")
 
 
+@add_slots
 @dataclass
 class ProcedureContext:
-    context = VulcainContext
-    input_args: dict = {}
-    any_context: dict = {}
+    context: VulcainContext = None
+    input_args: dict = field(default_factory=dict)
+    any_context: dict = field(default_factory=dict)
     return_value: Any = None
 
+    def __reduce__(self):
+        return (self.__class__, (self.context, self.input_args, self.any_context, self.return_value))
+
 
 class ProcedureStatus(Enum):
     CHECK_FAIL = auto()
     EXECUTE_FAIL = auto()
     REVERT_FAIL = auto()
     SUCCESS = auto()
+    # Not run, because a procedure it depends on failed.
+    SKIPPED = auto()
+    # Cancelled while running as a coroutine, then reverted.
+    CANCELLED = auto()
+
+
+class PhaseTimeout(TimeoutError):
+    pass
 
 
 class Procedure(ABC):
+    # Results of the procedure by inputs fingerprint. Set it on a subclass declaring its inputs to cache it.
+    result_store: ResultStore = None
+    # Checkpoints of the unfinished runs. Set it on a subclass marking checkpoints to resume its runs.
+    checkpoint_store: CheckpointStore = None
+    # Seconds allowed to the coroutine phases run by arun(), like {'execute': 60}. Set a new dict on a subclass.
+    phase_timeouts: dict = None
+
     def __init__(self, context: VulcainContext, ui: ProcedureUI = None, dcc: Software = None) -> None:
         self.context = context
         self.ui = ui
         self.dcc = dcc or DefaultSoftware()
         self.wrong_checks: list = []
         self.status: ProcedureStatus = ProcedureStatus.SUCCESS
+        self.metrics: ProcedureMetrics = None
+        self.fingerprint: str = None
+        self.cached = False
+        self.run_key: str = None
+        self._checkpoint: Checkpoint = None
+        self.checks = CheckRunner()
+        self._progress: ProgressReporter = None
+        self._outputs: StagedOutputs = None
+        self.check_report: CheckReport = None
 
     class CheckFailed(Exception):
         def __init__(self, message, wrong_checks: list) -> None:
             super().__init__(message)
             self.wrong_checks = wrong_checks
 
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    @property
+    def progress(self) -> ProgressReporter:
+        """
+        Progress reporter of the procedure, sending coalesced updates to its UI, like :
+            self.progress.update("export", total=len(nodes))
+            self.progress.advance()
+        """
+        if self._progress is None or self._progress.ui is not self.ui:
+            self._progress = ProgressReporter(self.ui, self.name)
+        return self._progress
+
+    @property
+    def outputs(self) -> StagedOutputs:
+        """
+        Staged output files of the procedure. Write them at self.outputs.path(target_path) :
+        they are moved to their targets once executed, or discarded before revert() on failure,
+        so revert() has no file to clean up. The outputs staged before a checkpoint are moved when
+        it is reached, a run resuming after it does not write them again.
+        """
+        if self._outputs is None:
+            self._outputs = StagedOutputs(self.name)
+        return self._outputs
+
+    def _commit_outputs(self) -> None:
+        if self._outputs:
+            with self.metrics.measure("commit_outputs"):
+                self._outputs.commit()
+
+    def _discard_outputs(self) -> None:
+        if self._outputs:
+            with self.metrics.measure("discard_outputs"):
+                self._outputs.discard()
+
+    def register_check(self, name: str, function, cost: float = 1.0, pool: str = THREAD) -> None:
+        """
+        Register an independent check run by run_checks(), called with the procedure context.
+        Checks calling the DCC must run INLINE, the DCC is not thread safe.
+        See CheckRunner.register for the arguments.
+        """
+        self.checks.register(name, function, cost, pool)
+
+    def run_checks(self, fail_fast: bool = None) -> CheckReport:
+        """
+        Run the registered checks concurrently, usually from check().
+
+        Raises:
+            CheckFailed : With every wrong check, or the first one in fail fast mode.
+        """
+        self.check_report = self.checks.run(self.context, fail_fast)
+        for warning in self.check_report.warnings:
+            logger.warning(f"Check warning : {warning}.")
+
+        errors = self.check_report.errors
+        if errors:
+            raise self.CheckFailed(f"{len(errors)} checks are wrong.", [str(error) for error in errors])
+        return self.check_report
+
+    def inputs(self) -> ProcedureInputs:
+        """Return the inputs the procedure result only depends on, None if it can't be cached."""
+        return None
+
+    def checkpoint(self, name: str, state: Any = None) -> None:
+        """
+        Mark a step of execute() as done, with the state needed to resume after it.
+        A later run on the same context skips the steps already reached, see reached().
+        The state must be picklable, like the path of an intermediate scene. The outputs staged so far
+        are committed, they are not discarded if a later step fails. revert() still runs
+        after a failure, it must keep what the saved states point to, reached() tells what they are.
+        """
+        if self._checkpoint is None:
+            return
+        # Committed before the checkpoint is saved, it is never reached without its outputs.
+        self._commit_outputs()
+        self._checkpoint.states[name] = state
+        self.checkpoint_store.save(self.run_key, self._checkpoint)
+        logger.debug(f"Checkpoint : '{name}' of '{self.name}' saved.")
+
+    def reached(self, name: str) -> bool:
+        """Return True if a previous run on the same context already reached the checkpoint."""
+        return self._checkpoint is not None and name in self._checkpoint.states
+
+    def checkpoint_state(self, name: str = None) -> Any:
+        """Return the state saved with a checkpoint, by default with the last one reached."""
+        if self._checkpoint is None:
+            return None
+        name = name or self._checkpoint.last
+        return self._checkpoint.states.get(name)
+
+    def _load_checkpoint(self) -> None:
+        # The run key only depends on the procedure and its context, before check() can change it.
+        self.run_key = fingerprint(self.name, ProcedureInputs(), self.context)
+        self._checkpoint = self.checkpoint_store.load(self.run_key)
+        if self._checkpoint is None:
+            self._checkpoint = Checkpoint(self.name)
+        elif self._checkpoint.states:
+            logger.info(f"Resuming '{self.name}' after checkpoint : '{self._checkpoint.last}'.")
+
     def launch(self) -> Any:
-    
+        """Start the DCC, run the procedure and stop the DCC. A stored result is returned without starting it."""
+        self.metrics = ProcedureMetrics(self.name)
+        cached = self._start_run(export_metrics=False)
+        if cached is not None:
+            return self._end_run(cached.return_value, export_metrics=True)
+
         if self.dcc:
-            self.dcc.start()
+            with self.metrics.measure("dcc_start"):
+                self.dcc.start()
 
         try:
-            self.context = self.check()
+            return self._run_phases(export_metrics=False)
+        finally:
+            if self.dcc:
+                with self.metrics.measure("dcc_stop"):
+                    self.dcc.stop()
+            instrumentation.export(self.metrics)
+
+    def run(self, export_metrics: bool = True) -> Any:
+        """
+        Check, execute and revert if needed, in an already started DCC.
+
+        Every phase, with its pre_ and post_ hooks, is measured in self.metrics.
+
+        Args :
+            export_metrics (bool) : Send the metrics to the added exporters at the end.
+        """
+        cached = self._start_run(export_metrics)
+        if cached is not None:
+            return self._end_run(cached.return_value, export_metrics)
+        return self._run_phases(export_metrics)
+
+    def _run_phases(self, export_metrics: bool) -> Any:
+        measure = self.metrics.measure
+
+        try:
+            with measure("pre_check"):
+                self.pre_check()
+            with measure("check"):
+                context = self.check()
+            if context is not None:
+                self.context = context
+            with measure("post_check"):
+                self.post_check()
         except self.CheckFailed as err:
             self.wrong_checks = err.wrong_checks
             self.status = ProcedureStatus.CHECK_FAIL
@@ -57,24 +235,213 @@ class Procedure(ABC):
 
         if self.status != ProcedureStatus.CHECK_FAIL:
             try:
-                self.execute()
+                with measure("pre_execute"):
+                    self.pre_execute()
+                with measure("execute"):
+                    self.execute()
+                with measure("post_execute"):
+                    self.post_execute()
+                self._commit_outputs()
             except Exception:
                 logger.exception("Exception occured while executing the procedure.")
                 self.status = ProcedureStatus.EXECUTE_FAIL
 
         if self.status == ProcedureStatus.CHECK_FAIL or self.status == ProcedureStatus.EXECUTE_FAIL:
+            self._discard_outputs()
             try:
-                self.revert()
+                with measure("pre_revert"):
+                    self.pre_revert()
+                with measure("revert"):
+                    self.revert()
+                with measure("post_revert"):
+                    self.post_revert()
             except Exception:
                 logger.exception("Exception occured while reverting the procedure.")
                 self.status = ProcedureStatus.REVERT_FAIL
 
-        self.end_launch()
+        return self._finish_run(export_metrics)
+
+    async def alaunch(self, timeouts: dict = None) -> Any:
+        """
+        Start the DCC, run the procedure as a coroutine with arun() and stop the DCC.
+        A stored result is returned without starting it.
+        """
+        self.metrics = ProcedureMetrics(self.name)
+        timeouts = {**(self.phase_timeouts or {}), **(timeouts or {})}
+        cached = self._start_run(export_metrics=False)
+        if cached is not None:
+            return self._end_run(cached.return_value, export_metrics=True)
 
         if self.dcc:
-            self.dcc.stop()
+            await self._aphase("dcc_start", self.dcc.start, timeouts)
+
+        try:
+            return await self._arun_phases(export_metrics=False, timeouts=timeouts)
+        finally:
+            if self.dcc:
+                await self._aphase("dcc_stop", self.dcc.stop, timeouts)
+            instrumentation.export(self.metrics)
+
+    async def arun(self, export_metrics: bool = True, timeouts: dict = None) -> Any:
+        """
+        Check, execute and revert if needed like run(), awaiting the phases written as coroutines.
+
+        Phases and hooks can be 'async def' methods, they are awaited with their timeout and let
+        the event loop run other procedures meanwhile. Other phases are called directly and block the loop,
+        they can't time out.
+
+        If the task is cancelled during the check or the execution, the procedure is reverted,
+        its status is CANCELLED and the CancelledError is raised again once reverted.
+
+        Args :
+            export_metrics (bool) : Send the metrics to the added exporters at the end.
+            timeouts (dict) : Seconds allowed per phase, like {'execute': 60}, over the phase_timeouts.
+                A phase timing out fails like a phase raising.
+
+        Raises:
+            CancelledError : If the task was cancelled, after the revert.
+        """
+        timeouts = {**(self.phase_timeouts or {}), **(timeouts or {})}
+        cached = self._start_run(export_metrics)
+        if cached is not None:
+            return self._end_run(cached.return_value, export_metrics)
+        return await self._arun_phases(export_metrics, timeouts)
+
+    async def _arun_phases(self, export_metrics: bool, timeouts: dict) -> Any:
+        cancelled = None
+        try:
+            await self._acheck_and_execute(timeouts)
+        except asyncio.CancelledError as err:
+            logger.warning(f"Procedure : '{self.name}' was cancelled, it is reverted.")
+            cancelled = err
+            self.status = ProcedureStatus.CANCELLED
+
+        if self.status in (ProcedureStatus.CHECK_FAIL, ProcedureStatus.EXECUTE_FAIL, ProcedureStatus.CANCELLED):
+            # Shielded, cancelling the task again does not stop the revert.
+            await asyncio.shield(self._arevert(timeouts))
+
+        return_value = self._finish_run(export_metrics)
+        if cancelled is not None:
+            raise cancelled
+        return return_value
+
+    async def _acheck_and_execute(self, timeouts: dict) -> None:
+        try:
+            await self._aphase("pre_check", self.pre_check, timeouts)
+            context = await self._aphase("check", self.check, timeouts)
+            if context is not None:
+                self.context = context
+            await self._aphase("post_check", self.post_check, timeouts)
+        except self.CheckFailed as err:
+            self.wrong_checks = err.wrong_checks
+            self.status = ProcedureStatus.CHECK_FAIL
+        except asyncio.CancelledError:
+            # A subclass of Exception before Python 3.8, it must reach arun().
+            raise
+        except Exception:
+            logger.exception("Exception occured while checking before execution.")
+            self.status = ProcedureStatus.CHECK_FAIL
+
+        if self.status != ProcedureStatus.CHECK_FAIL:
+            try:
+                await self._aphase("pre_execute", self.pre_execute, timeouts)
+                await self._aphase("execute", self.execute, timeouts)
+                await self._aphase("post_execute", self.post_execute, timeouts)
+                self._commit_outputs()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Exception occured while executing the procedure.")
+                self.status = ProcedureStatus.EXECUTE_FAIL
 
-        return self.context.return_value
+    async def _arevert(self, timeouts: dict) -> None:
+        self._discard_outputs()
+        try:
+            await self._aphase("pre_revert", self.pre_revert, timeouts)
+            await self._aphase("revert", self.revert, timeouts)
+            await self._aphase("post_revert", self.post_revert, timeouts)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Exception occured while reverting the procedure.")
+            self.status = ProcedureStatus.REVERT_FAIL
+
+    async def _aphase(self, phase: str, function, timeouts: dict) -> Any:
+        with self.metrics.measure(phase):
+            result = function()
+            if not inspect.isawaitable(result):
+                return result
+
+            timeout = timeouts.get(phase)
+            try:
+                return await asyncio.wait_for(result, timeout)
+            except asyncio.TimeoutError:
+                raise PhaseTimeout(f"Phase : '{phase}' of '{self.name}' timed out after {timeout}s.") from None
+
+    def _start_run(self, export_metrics: bool) -> CachedResult:
+        """Prepare the metrics and the checkpoints of a run. Return the stored result if the run can be skipped."""
+        # Run from launch(), the metrics already hold the DCC start and are exported by launch().
+        if export_metrics or self.metrics is None:
+            self.metrics = ProcedureMetrics(self.name)
+
+        self.cached = False
+        self.fingerprint = None
+        if self.result_store is not None:
+            with self.metrics.measure("fingerprint"):
+                cached = self._cached_result()
+            if cached is not None:
+                return cached
+
+        self._checkpoint = None
+        if self.checkpoint_store is not None:
+            self._load_checkpoint()
+        return None
+
+    def _finish_run(self, export_metrics: bool) -> Any:
+        # Checkpoints are kept after a failure, the next run on the same context resumes from them.
+        if self._checkpoint is not None and self.status == ProcedureStatus.SUCCESS:
+            self.checkpoint_store.clear(self.run_key)
+
+        return_value = getattr(self.context, "return_value", None)
+        if self.fingerprint is not None and self.status == ProcedureStatus.SUCCESS:
+            self.result_store.put(CachedResult(self.fingerprint, self.name, return_value, time.time()))
+
+        return self._end_run(return_value, export_metrics)
+
+    def _cached_result(self) -> CachedResult:
+        """Fingerprint the declared inputs and return the stored result of the same inputs, if any."""
+        inputs = self.inputs()
+        if inputs is None:
+            return None
+
+        try:
+            self.fingerprint = fingerprint(self.name, inputs, self.context)
+        except Exception:
+            logger.exception("Exception occured while fingerprinting the inputs, the procedure is not cached.")
+            return None
+
+        cached = self.result_store.get(self.fingerprint)
+        if cached is None:
+            return None
+
+        logger.info(f"Inputs of '{self.name}' did not change, its stored result is used : '{self.fingerprint}'.")
+        self.cached = True
+        self.status = ProcedureStatus.SUCCESS
+        if hasattr(self.context, "return_value"):
+            self.context.return_value = cached.return_value
+        return cached
+
+    def _end_run(self, return_value: Any, export_metrics: bool) -> Any:
+        if self._progress is not None:
+            self._progress.flush()
+
+        with self.metrics.measure("end_launch"):
+            self.end_launch()
+
+        if export_metrics:
+            instrumentation.export(self.metrics)
+
+        return return_value
 
     @abstractmethod
     def pre_check(self):
@@ -113,25 +480,36 @@ class Procedure(ABC):
         """"""
 
     def end_launch(self):
+        if not self.ui:
+            return
+
         if self.status == ProcedureStatus.CHECK_FAIL and self.status != ProcedureStatus.REVERT_FAIL:
             wrong_checks = "\n- ".join(self.wrong_checks)
             message = f"Some checks are wrong. Execution can't start.\n{wrong_checks}"
-            self.ui.show_end_fail_message(self.context.name, message)
+            self.ui.show_end_fail_message(self.name, message)
 
         elif self.status == ProcedureStatus.CHECK_FAIL and self.status == ProcedureStatus.REVERT_FAIL:
             message = f"Revert procedure failed after a check fail."
-            self.ui.show_end_fail_message(self.context.name)
+            self.ui.show_end_fail_message(self.name, message)
 
         elif self.status == ProcedureStatus.EXECUTE_FAIL and self.status != ProcedureStatus.REVERT_FAIL:
             message = f"Execution has failed."
-            self.ui.show_end_fail_message(self.context.name)
+            self.ui.show_end_fail_message(self.name, message)
 
         elif self.status == ProcedureStatus.EXECUTE_FAIL and self.status == ProcedureStatus.REVERT_FAIL:
             message = f"Revert procedure failed after an execution fail."
-            self.ui.show_end_fail_message(self.context.name, message)
+            self.ui.show_end_fail_message(self.name, message)
+
+        elif self.status == ProcedureStatus.REVERT_FAIL:
+            message = f"Revert procedure failed."
+            self.ui.show_end_fail_message(self.name, message)
+
+        elif self.status == ProcedureStatus.CANCELLED:
+            message = f"Procedure was cancelled and reverted."
+            self.ui.show_end_fail_message(self.name, message)
 
         else:
-            self.ui.show_end_success_message(self.context.name)
+            self.ui.show_end_success_message(self.name)
 
 
 if __name__ == "__main__":
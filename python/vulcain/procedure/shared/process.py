@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+
+from vulcain.procedure.shared.procedure import ProcedureContext
+
+
+class Process(ABC):
+    """
+    One step of a procedure, run on a ProcedureContext by an Executor.
+
+    Every method receives the context of the previous step and returns the context of the next one,
+    or None to keep it unchanged. Processes are sent to other processes by a ProcessExecutor,
+    they must be picklable.
+    """
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    @abstractmethod
+    def check(self, context: ProcedureContext) -> ProcedureContext:
+        """"""
+
+    @abstractmethod
+    def execute(self, context: ProcedureContext) -> ProcedureContext:
+        """"""
+
+    @abstractmethod
+    def revert(self, context: ProcedureContext) -> ProcedureContext:
+        """"""
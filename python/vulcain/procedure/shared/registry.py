@@ -0,0 +1,81 @@
+import importlib
+from typing import Callable, Dict, Union
+
+# Name -> class, or its 'module:attribute' path imported on first use, so the DCC
+# procedures can be registered without importing the DCC modules.
+_procedures: Dict[str, Union[type, str]] = {
+    "build_modelbase": "vulcain.procedure.maya.modelbase.build:BuildModelbase",
+}
+
+_softwares: Dict[str, Union[type, str]] = {
+    "default": "vulcain.procedure.shared.software:DefaultSoftware",
+    "maya": "vulcain.procedure.maya.software:Maya",
+}
+
+
+def import_object(path: str):
+    """Import an object from its 'module:attribute' path."""
+    module_name, separator, attribute = path.partition(":")
+    if not separator:
+        raise ValueError(f"Object path : '{path}' must be like 'module:attribute'.")
+    module = importlib.import_module(module_name)
+    try:
+        return getattr(module, attribute)
+    except AttributeError:
+        raise ValueError(f"Object path : '{path}', module '{module_name}' has no '{attribute}'.") from None
+
+
+def _register(registry: dict, name: str, value):
+    if value is None:
+        # Used as a decorator.
+        def decorator(cls):
+            registry[name] = cls
+            return cls
+        return decorator
+    registry[name] = value
+    return value
+
+
+def _get(registry: dict, name: str, kind: str):
+    value = registry.get(name)
+    if value is None:
+        if ":" in name:
+            return import_object(name)
+        raise ValueError(f"{kind} : '{name}' is not registered. Registered ones : {sorted(registry)}.")
+    if isinstance(value, str):
+        value = registry[name] = import_object(value)
+    return value
+
+
+def register_procedure(name: str, procedure: Union[type, str] = None):
+    """
+    Register a procedure class, or its 'module:attribute' path, under a name.
+    Without procedure, returns a class decorator.
+    """
+    return _register(_procedures, name, procedure)
+
+
+def get_procedure(name: str) -> Callable:
+    """
+    Return a registered procedure class, or the one of a 'module:attribute' path.
+
+    Raises:
+        ValueError : If the procedure is not registered.
+    """
+    return _get(_procedures, name, "Procedure")
+
+
+def procedure_names() -> list:
+    return sorted(_procedures)
+
+
+def register_software(name: str, software: Union[type, str] = None):
+    return _register(_softwares, name, software)
+
+
+def get_software(name: str) -> Callable:
+    return _get(_softwares, name, "Software")
+
+
+def software_names() -> list:
+    return sorted(_softwares)
@@ -0,0 +1,295 @@
+import heapq
+import json
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from multiprocessing.util import Finalize
+from typing import Any, Callable, Dict, Iterable, List
+
+from vulcain.logger import Logger
+from vulcain.procedure.shared.batch import run_procedure
+from vulcain.procedure.shared.executor import aggregate_status
+from vulcain.procedure.shared.instrumentation import MetricsAggregate, ProcedureMetrics
+from vulcain.procedure.shared.procedure import Procedure, ProcedureStatus
+from vulcain.procedure.shared.software import Software, DefaultSoftware
+
+logger = Logger(name="Procedure Scheduler")
+
+# Statuses of an upstream node skipping every node depending on it.
+FAILED_STATUSES = (ProcedureStatus.CHECK_FAIL, ProcedureStatus.EXECUTE_FAIL,
+                   ProcedureStatus.REVERT_FAIL, ProcedureStatus.SKIPPED, ProcedureStatus.CANCELLED)
+
+# Software of the scheduler worker process, started once and reset between two nodes.
+_worker_software = None
+_worker_jobs = 0
+
+
+class ScheduleError(ValueError):
+    pass
+
+
+@dataclass
+class ScheduledNode:
+    name: str
+    procedure_factory: Callable[[Any], Procedure]
+    context: Any
+    depends_on: tuple = ()
+    cost: float = 1.0
+
+
+@dataclass
+class NodeRun:
+    name: str
+    status: ProcedureStatus
+    return_value: Any = None
+    # Seconds since the epoch, comparable between the worker processes.
+    start: float = 0.0
+    end: float = 0.0
+    worker: int = 0
+    error: str = ""
+    metrics: ProcedureMetrics = None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class ScheduleReport:
+    runs: Dict[str, NodeRun] = field(default_factory=dict)
+    start: float = 0.0
+    end: float = 0.0
+
+    @property
+    def status(self) -> ProcedureStatus:
+        return aggregate_status(run.status for run in self.runs.values())
+
+    @property
+    def skipped(self) -> List[str]:
+        return [name for name, run in self.runs.items() if run.status == ProcedureStatus.SKIPPED]
+
+    def aggregate_metrics(self) -> MetricsAggregate:
+        return MetricsAggregate(run.metrics for run in self.runs.values())
+
+    def timeline(self) -> List[dict]:
+        """Return the node runs ordered by start, times in seconds from the schedule start."""
+        return [{"name": run.name,
+                 "status": run.status.name,
+                 "worker": run.worker,
+                 "start": run.start - self.start,
+                 "end": run.end - self.start}
+                for run in sorted(self.runs.values(), key=lambda run: (run.start, run.name))]
+
+    def export_timeline(self, file_path: str) -> None:
+        """
+        Write the timeline in the Chrome trace event format, one row per worker process.
+        It can be opened in chrome://tracing or https://ui.perfetto.dev.
+        """
+        events = []
+        for run in self.runs.values():
+            if run.status == ProcedureStatus.SKIPPED:
+                continue
+            events.append({"name": run.name,
+                           "cat": "procedure",
+                           "ph": "X",
+                           "ts": (run.start - self.start) * 1e6,
+                           "dur": run.duration * 1e6,
+                           "pid": 0,
+                           "tid": run.worker,
+                           "args": {"status": run.status.name}})
+
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as trace_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_file, indent=1)
+        os.replace(tmp_path, file_path)
+
+
+def _start_worker_software(software_factory: Callable[[], Software]) -> None:
+    global _worker_software
+    _worker_software = software_factory()
+    _worker_software.start()
+    # Stopped when the pool shuts the worker down.
+    Finalize(_worker_software, _worker_software.stop, exitpriority=10)
+
+
+def _run_node(procedure_factory: Callable[[Any], Procedure], context) -> tuple:
+    global _worker_jobs
+    start = time.time()
+    # The first node of a worker runs in a freshly started software.
+    result = run_procedure(procedure_factory, context, _worker_software, reset=_worker_jobs > 0)
+    _worker_jobs += 1
+    return result.status, result.return_value, start, time.time(), os.getpid(), result.error, result.metrics
+
+
+class ProcedureScheduler():
+    """
+    Run procedures depending on each other, independent branches in parallel on worker processes.
+
+    When several nodes are ready, the one starting the longest chain of remaining cost runs first,
+    so the critical path is never waiting behind shorter branches.
+    A node whose dependency failed is not run, it is SKIPPED, as well as every node after it.
+    A worker process dying breaks the pool : the nodes running on it fail and the next nodes run on a new pool.
+
+    Each worker process starts its software once and resets it between two nodes. Procedure factories,
+    contexts and return values are pickled to and from the workers.
+
+    Args :
+        max_workers (int) : Maximum number of procedures run at the same time. Default to the CPU count.
+        software_factory (callable) : Build the software of a worker, like a Software subclass.
+
+    Example :
+        scheduler = ProcedureScheduler(max_workers=2)
+        scheduler.add("modelbase", BuildModelbase, context, cost=30)
+        scheduler.add("publish", PublishModelbase, context, depends_on=["modelbase"], cost=5)
+        report = scheduler.run()
+    """
+
+    def __init__(self, max_workers: int = None, software_factory: Callable[[], Software] = DefaultSoftware) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.software_factory = software_factory
+        self.nodes: Dict[str, ScheduledNode] = dict()
+
+    def add(self, name: str, procedure_factory: Callable[[Any], Procedure], context,
+            depends_on: Iterable[str] = (), cost: float = 1.0) -> ScheduledNode:
+        """
+        Args :
+            name (str) : Unique name of the node.
+            procedure_factory (callable) : Build the procedure of the node, like a Procedure subclass.
+            context : Context of the procedure.
+            depends_on (iterable) : Names of the nodes run before this one.
+            cost (float) : Estimated duration, only compared to the other nodes costs.
+        """
+        if name in self.nodes:
+            raise ScheduleError(f"Scheduled node : '{name}' already exists.")
+        node = ScheduledNode(name, procedure_factory, context, tuple(depends_on), cost)
+        self.nodes[name] = node
+        return node
+
+    def _dependents(self) -> Dict[str, List[str]]:
+        dependents = {name: [] for name in self.nodes}
+        for node in self.nodes.values():
+            for dependency in node.depends_on:
+                if dependency not in self.nodes:
+                    raise ScheduleError(f"Scheduled node : '{node.name}' depends on unknown node : '{dependency}'.")
+                dependents[dependency].append(node.name)
+        return dependents
+
+    def topological_order(self) -> List[str]:
+        """
+        Raises:
+            ScheduleError : If a dependency is unknown or the dependencies make a cycle.
+        """
+        dependents = self._dependents()
+        remaining = {name: len(node.depends_on) for name, node in self.nodes.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(self.nodes):
+            cycle = sorted(name for name, count in remaining.items() if count > 0)
+            raise ScheduleError(f"Scheduled nodes dependencies make a cycle between : {cycle}.")
+        return order
+
+    def critical_path_costs(self) -> Dict[str, float]:
+        """Return, for every node, the cost of the longest chain of nodes starting with it."""
+        dependents = self._dependents()
+        costs = dict()
+        for name in reversed(self.topological_order()):
+            costs[name] = self.nodes[name].cost + max((costs[dependent] for dependent in dependents[name]),
+                                                      default=0.0)
+        return costs
+
+    def _start_pool(self, size: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=size, initializer=_start_worker_software,
+                                   initargs=(self.software_factory,))
+
+    def _restart_pool(self, pool: ProcessPoolExecutor, size: int) -> ProcessPoolExecutor:
+        logger.warning("Scheduler process pool is broken, a new one is started.")
+        pool.shutdown(wait=False)
+        return self._start_pool(size)
+
+    def run(self) -> ScheduleReport:
+        """
+        Run every node once its dependencies succeeded.
+
+        Returns:
+            report (ScheduleReport) : Run of every node, with its worker and its start and end times.
+        """
+        dependents = self._dependents()
+        priorities = self.critical_path_costs()
+        remaining = {name: len(node.depends_on) for name, node in self.nodes.items()}
+        ready = [(-priorities[name], name) for name, count in remaining.items() if count == 0]
+        heapq.heapify(ready)
+
+        report = ScheduleReport(start=time.time())
+        running = dict()
+
+        def skip(name: str) -> None:
+            now = time.time()
+            report.runs[name] = NodeRun(name, ProcedureStatus.SKIPPED, start=now, end=now)
+            logger.warning(f"Scheduled node : '{name}' is skipped, a node it depends on failed.")
+
+        def done(name: str) -> None:
+            failed = report.runs[name].status in FAILED_STATUSES
+            for dependent in dependents[name]:
+                if dependent in report.runs:
+                    continue
+                if failed:
+                    skip(dependent)
+                    done(dependent)
+                    continue
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    heapq.heappush(ready, (-priorities[dependent], dependent))
+
+        pool_size = min(self.max_workers, max(len(self.nodes), 1))
+        pool = self._start_pool(pool_size)
+        try:
+            while ready or running:
+                while ready and len(running) < self.max_workers:
+                    priority, name = heapq.heappop(ready)
+                    node = self.nodes[name]
+                    try:
+                        future = pool.submit(_run_node, node.procedure_factory, node.context)
+                    except BrokenProcessPool:
+                        # The pool broke since the last results, the node never started.
+                        heapq.heappush(ready, (priority, name))
+                        pool = self._restart_pool(pool, pool_size)
+                        continue
+                    running[future] = (name, pool)
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name, future_pool = running.pop(future)
+                    try:
+                        report.runs[name] = NodeRun(name, *future.result())
+                    except BrokenProcessPool:
+                        # Every node running on the pool fails, the one killing its worker can't be told apart.
+                        logger.error(f"Scheduled node : '{name}' failed, a worker process of the pool died.")
+                        now = time.time()
+                        report.runs[name] = NodeRun(name, ProcedureStatus.EXECUTE_FAIL, start=now, end=now,
+                                                    error="A worker process of the pool died while it was running.")
+                        if future_pool is pool:
+                            pool = self._restart_pool(pool, pool_size)
+                    except Exception:
+                        logger.exception(f"Scheduled node : '{name}' could not run.")
+                        now = time.time()
+                        report.runs[name] = NodeRun(name, ProcedureStatus.EXECUTE_FAIL, start=now, end=now,
+                                                    error=traceback.format_exc())
+                    done(name)
+        finally:
+            pool.shutdown()
+
+        report.end = time.time()
+        logger.info(f"{len(report.runs)} scheduled nodes done in {report.end - report.start:.2f}s, "
+                    f"{len(report.skipped)} skipped, status : '{report.status.name}'.")
+        return report
@@ -9,6 +9,9 @@ class Software(ABC):
     def stop(self):
         """"""
 
+    def reset(self):
+        """Bring the started software back to a clean state between two procedures."""
+
 
 class DefaultSoftware(Software):
     def start(self):
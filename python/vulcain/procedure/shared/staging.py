@@ -0,0 +1,145 @@
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List
+
+from vulcain.logger import Logger
+
+logger = Logger(name="Staged Outputs")
+
+STAGING_PREFIX = ".vulcain_staging_"
+
+# Staging directories older than this are left by dead processes, see remove_stale_staging().
+STALE_STAGING_AGE = 24 * 3600.0
+
+
+class StagingError(RuntimeError):
+
+    def __init__(self, message: str, committed: List[str] = (), pending: List[str] = ()) -> None:
+        super().__init__(message)
+        self.committed = list(committed)
+        self.pending = list(pending)
+
+
+class StagedOutputs():
+    """
+    Output files of a procedure, written in staging directories and moved to their targets on commit.
+
+    A staging directory is created next to each target directory, on the same filesystem, so the
+    commit is an atomic rename per file : readers see the previous file or the new one, never a
+    partial one. Discarding the outputs removes the staging directories, targets are never touched.
+    Staging directories left there by dead processes are removed when a new one is created next to them.
+
+    Args :
+        procedure_name (str) : Name used in the staging directories names.
+    """
+
+    def __init__(self, procedure_name: str = "procedure") -> None:
+        self.procedure_name = procedure_name
+        # Target directory -> its staging directory.
+        self._staging_dirs: Dict[str, str] = dict()
+        # Target path -> staged path.
+        self._staged: Dict[str, str] = dict()
+
+    def __len__(self) -> int:
+        return len(self._staged)
+
+    def __bool__(self) -> bool:
+        return bool(self._staged)
+
+    @property
+    def targets(self) -> List[str]:
+        return list(self._staged)
+
+    def path(self, target_path: str) -> str:
+        """
+        Return the path to write instead of a target path. It is moved to the target on commit.
+
+        Args :
+            target_path (str) : Final path of the output, like a publish file.
+        """
+        target_path = os.path.abspath(target_path)
+        staged_path = self._staged.get(target_path)
+        if staged_path is not None:
+            return staged_path
+
+        target_dir = os.path.dirname(target_path)
+        staging_dir = self._staging_dirs.get(target_dir)
+        if staging_dir is None:
+            os.makedirs(target_dir, exist_ok=True)
+            remove_stale_staging(target_dir)
+            staging_dir = tempfile.mkdtemp(prefix=f"{STAGING_PREFIX}{self.procedure_name}_", dir=target_dir)
+            self._staging_dirs[target_dir] = staging_dir
+
+        staged_path = os.path.join(staging_dir, os.path.basename(target_path))
+        self._staged[target_path] = staged_path
+        return staged_path
+
+    def commit(self) -> List[str]:
+        """
+        Move every staged file to its target, replacing the existing ones.
+
+        Returns:
+            targets (list) : Committed target paths.
+
+        Raises:
+            StagingError : If a staged file was not written, nothing is moved then. Or if a staged file
+                could not be moved, the files moved before it stay committed and the others stay staged,
+                to commit again or discard.
+        """
+        missing = [target for target, staged in self._staged.items() if not os.path.exists(staged)]
+        if missing:
+            raise StagingError(f"Staged outputs of '{self.procedure_name}' were not written : {missing}.",
+                               pending=self.targets)
+
+        committed = []
+        for target_path, staged_path in self._staged.items():
+            try:
+                os.replace(staged_path, target_path)
+            except OSError as err:
+                for target in committed:
+                    del self._staged[target]
+                pending = self.targets
+                raise StagingError(f"Staged output : '{target_path}' of '{self.procedure_name}' could not be "
+                                   f"committed, {err}. Committed : {committed}, pending : {pending}.",
+                                   committed=committed, pending=pending) from err
+            committed.append(target_path)
+
+        self._remove_staging_dirs()
+        logger.debug(f"{len(committed)} outputs of '{self.procedure_name}' committed.")
+        return committed
+
+    def discard(self) -> None:
+        """Remove the staged files, the targets are left as they were."""
+        if self._staged:
+            logger.debug(f"{len(self._staged)} outputs of '{self.procedure_name}' discarded.")
+        self._remove_staging_dirs()
+
+    def _remove_staging_dirs(self) -> None:
+        for staging_dir in self._staging_dirs.values():
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        self._staging_dirs.clear()
+        self._staged.clear()
+
+
+def remove_stale_staging(directory: str, max_age: float = STALE_STAGING_AGE) -> List[str]:
+    """
+    Remove the staging directories of a directory left by processes that died before committing.
+
+    Returns:
+        removed (list) : Removed staging directories.
+    """
+    removed = []
+    now = time.time()
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return removed
+
+    for entry in entries:
+        if entry.name.startswith(STAGING_PREFIX) and entry.is_dir(follow_symlinks=False):
+            if now - entry.stat(follow_symlinks=False).st_mtime > max_age:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed.append(entry.path)
+    return removed
@@ -1,7 +1,11 @@
 from .procedure_ui import ProcedureUI
 from .terminal import TerminalUI
+from .null import NullUI
+from .progress import ProgressReporter
 
 __all__ = [
     "ProcedureUI",
-    "TerminalUI"
-]
\ No newline at end of file
+    "TerminalUI",
+    "NullUI",
+    "ProgressReporter"
+]
@@ -0,0 +1,11 @@
+from vulcain.procedure.shared.ui.procedure_ui import ProcedureUI
+
+class NullUI(ProcedureUI):
+    def show_end_success_message(self, procedure_name: str) -> None:
+        pass
+
+    def show_end_fail_message(self, procedure_name: str, message: str = "") -> None:
+        pass
+
+    def show_progress(self, procedure_name: str, stage: str, done: int, total: int = None, message: str = "") -> None:
+        pass
@@ -2,9 +2,20 @@ from abc import ABC, abstractmethod
 
 class ProcedureUI(ABC):
     @abstractmethod
-    def show_end_success_message(procedure_name: str) -> None:
+    def show_end_success_message(self, procedure_name: str) -> None:
         """"""
 
     @abstractmethod
-    def show_end_fail_message(procedure_name: str, message: str) -> None:
+    def show_end_fail_message(self, procedure_name: str, message: str = "") -> None:
         """"""
+
+    def show_progress(self, procedure_name: str, stage: str, done: int, total: int = None, message: str = "") -> None:
+        """
+        Show the progress of a procedure. Called by a ProgressReporter, at most a few times per second.
+
+        Args :
+            stage (str) : Current step of the procedure, like 'export'.
+            done (int) : Items done in the stage.
+            total (int) : Items of the stage, None if unknown.
+            message (str) : Last message of the stage.
+        """
@@ -0,0 +1,83 @@
+from time import perf_counter
+
+from vulcain.procedure.shared.ui.procedure_ui import ProcedureUI
+
+# Seconds between two progress updates sent to the UI.
+DEFAULT_PROGRESS_INTERVAL = 0.1
+
+
+class ProgressReporter():
+    """
+    Coalesce the progress updates of a procedure and send the latest one to the UI at most once per interval.
+
+    Updates are cheap, they only store the new state, so they can be called for every item of a loop.
+    A stage change, the last item of a stage and flush() are sent right away.
+
+    Args :
+        ui (ProcedureUI) : UI receiving the updates, None to drop them.
+        procedure_name (str) : Name given to the UI.
+        interval (float) : Minimum seconds between two updates sent to the UI.
+    """
+
+    __slots__ = ("ui", "procedure_name", "interval", "stage", "done", "total", "message",
+                 "_next_time", "_pending", "sent")
+
+    def __init__(self, ui: ProcedureUI, procedure_name: str, interval: float = DEFAULT_PROGRESS_INTERVAL) -> None:
+        self.ui = ui
+        self.procedure_name = procedure_name
+        self.interval = interval
+        self.stage = ""
+        self.done = 0
+        self.total = None
+        self.message = ""
+        self._next_time = 0.0
+        self._pending = False
+        # Updates sent to the UI.
+        self.sent = 0
+
+    def update(self, stage: str = None, done: int = None, total: int = None, message: str = None) -> None:
+        """Set the progress state, the arguments left to None are kept. A new stage starts at 0."""
+        if stage is not None and stage != self.stage:
+            self.stage = stage
+            self.done = 0
+            self.total = total
+            self.message = ""
+            self._next_time = 0.0
+        elif total is not None:
+            self.total = total
+        if done is not None:
+            self.done = done
+        if message is not None:
+            self.message = message
+        self._pending = True
+        self._maybe_send()
+
+    def advance(self, count: int = 1) -> None:
+        """Mark count more items of the stage as done."""
+        # Inlined _maybe_send(), this is called for every item of the procedure loops.
+        self.done += count
+        self._pending = True
+        if self.done == self.total:
+            self.flush()
+        elif perf_counter() >= self._next_time:
+            self._send(perf_counter())
+
+    def _maybe_send(self) -> None:
+        if self.done == self.total:
+            self.flush()
+            return
+        now = perf_counter()
+        if now >= self._next_time:
+            self._send(now)
+
+    def _send(self, now: float) -> None:
+        self._pending = False
+        self._next_time = now + self.interval
+        if self.ui is not None:
+            self.sent += 1
+            self.ui.show_progress(self.procedure_name, self.stage, self.done, self.total, self.message)
+
+    def flush(self) -> None:
+        """Send the latest state if it was not sent yet."""
+        if self._pending:
+            self._send(perf_counter())
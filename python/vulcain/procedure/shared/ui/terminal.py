@@ -1,8 +1,19 @@
-from vulcain.python.procedure.shared.uis.procedure_ui import ProcedureUI
+import sys
+
+from vulcain.procedure.shared.ui.procedure_ui import ProcedureUI
 
 class TerminalUI(ProcedureUI):
-    def show_end_success_message(procedure_name: str) -> None:
-        print(f"End of {procedure_name}")
+    def __init__(self, stream=None) -> None:
+        self.stream = stream
+
+    def show_end_success_message(self, procedure_name: str) -> None:
+        print(f"End of {procedure_name}", file=self.stream)
+
+    def show_end_fail_message(self, procedure_name: str, message: str = "") -> None:
+        print(f"Error while executing '{procedure_name}'\n'{message}'", file=self.stream)
 
-    def show_end_fail_message(procedure_name: str, message: str) -> None:
-        print(f"Error while executing '{procedure_name}'\n'{message}'")
\ No newline at end of file
+    def show_progress(self, procedure_name: str, stage: str, done: int, total: int = None, message: str = "") -> None:
+        stream = self.stream or sys.stdout
+        progress = f"{done}/{total} ({done * 100 // total}%)" if total else f"{done}"
+        stream.write(f"{procedure_name} [{stage}] {progress}{f' {message}' if message else ''}\n")
+        stream.flush()
@@ -1,4 +1,10 @@
+import sys
+from array import array
 from enum import Enum
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from typing import Iterable, Iterator
+
 
 class VulcainEntity(Enum):
     ASSET = "asset"
@@ -11,50 +17,264 @@ class VulcainEntity(Enum):
 
 
 class VulcainPath():
+    """
+    Entity path like 'asset~props/chair/modeling/v0001', parsed once.
+
+    Parts are interned, so paths of the same entities share their strings.
+    Paths are hashable and can be used in sets or as dict keys.
+    """
+
+    __slots__ = ("kind", "parts")
+
     def __init__(self, param):
-        self.param = param
-        self.entity = self.param.split("~")[1]
+        kind, separator, entity = param.partition("~")
+        if not separator:
+            raise ValueError(f"Vulcain path : '{param}' has no '~' separator.")
+        self.kind = sys.intern(kind)
+        self.parts = tuple(map(sys.intern, entity.split("/")))
+
+    @property
+    def param(self):
+        return f"{self.kind}~{self.entity}"
+
+    @property
+    def entity(self):
+        return "/".join(self.parts)
+
+    def __eq__(self, other):
+        if not isinstance(other, VulcainPath):
+            return NotImplemented
+        return self.kind == other.kind and self.parts == other.parts
+
+    def __hash__(self):
+        return hash((self.kind, self.parts))
+
+    def __repr__(self):
+        return f"VulcainPath('{self.kind}~{self.entity}')"
+
+    def __str__(self):
+        return self.param
 
     def is_asset(self):
-        return self.param.split("~")[0] == "asset"
+        return self.kind == "asset"
 
     def get_vulcain_path_entity(self):
-        entity = self.path.split("/")[0]
-        if entity == VulcainEntity.ASSET:
-            pass
-        elif entity == VulcainEntity.SETDRESS:
-            pass
-        elif entity == VulcainEntity.EPISODE:
-            pass
-        elif entity == VulcainEntity.SEQUENCE:
-            pass
-        elif entity == VulcainEntity.SHOT:
-            pass
-        else:
-            raise ValueError()
+        try:
+            return VulcainEntity(self.kind)
+        except ValueError:
+            raise ValueError(f"Vulcain path : '{self.param}' has an unknown entity : '{self.kind}'.") from None
 
     def is_asset_task(self):
-        return len(self.entity.split("/")) >= 3
+        return len(self.parts) >= 3
 
     def is_asset_version(self):
-        return len(self.entity.split("/")) >= 4
+        return len(self.parts) >= 4
 
     def get_entity_type(self):
         if self.is_asset():
-            return self.entity.split("/")[0] 
+            return self.parts[0]
         return None
 
     def get_entity_name(self):
         if self.is_asset():
-            return self.entity.split("/")[1]
+            return self.parts[1]
         return None
 
     def get_entity_task(self):
         if self.is_asset() and self.is_asset_task():
-            return self.entity.split("/")[2]
+            return self.parts[2]
         return None
 
     def get_entity_version(self):
         if self.is_asset() and self.is_asset_version():
-            return self.entity.split("/")[3]
+            return self.parts[3]
         return None
+
+
+@lru_cache(maxsize=65536)
+def parse(param: str) -> VulcainPath:
+    """Return the VulcainPath of a string, shared between the calls with the same string."""
+    return VulcainPath(param)
+
+
+class VulcainPathColumns():
+    """
+    Many VulcainPath stored by column. Every column is dictionary encoded :
+    a table of the distinct values and an array of 32 bits codes, one per path.
+
+    Columns are the kind then the first entity parts, named after the asset parts.
+    Parts after the version are kept joined in the 'extra' column.
+    """
+
+    COLUMNS = ("kind", "entity_type", "entity_name", "task", "version", "extra")
+
+    def __init__(self) -> None:
+        self.codes = {column: array("I") for column in self.COLUMNS}
+        # Code 0 is reserved for missing values.
+        self.values = {column: [None] for column in self.COLUMNS}
+        self._lookups = {column: {None: 0} for column in self.COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.codes["kind"])
+
+    def append(self, param: str) -> None:
+        self.extend((param,))
+
+    def extend(self, params: Iterable[str]) -> None:
+        column_count = len(self.COLUMNS)
+        lookups = [self._lookups[column] for column in self.COLUMNS]
+        tables = [self.values[column] for column in self.COLUMNS]
+        codes = [self.codes[column] for column in self.COLUMNS]
+        padding = [None] * column_count
+
+        # Rows are encoded one by one and never kept, to not keep millions of objects alive.
+        for param in params:
+            kind, separator, entity = param.partition("~")
+            if not separator:
+                raise ValueError(f"Vulcain path : '{param}' has no '~' separator.")
+            row = [kind] + entity.split("/", 4)
+            row += padding[len(row):]
+
+            for value, lookup, table, column_codes in zip(row, lookups, tables, codes):
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(table)
+                    table.append(value)
+                column_codes.append(code)
+
+    def __getitem__(self, index: int) -> VulcainPath:
+        return VulcainPath(self.param(index))
+
+    def param(self, index: int) -> str:
+        kind = self.values["kind"][self.codes["kind"][index]]
+        parts = [self.values[column][self.codes[column][index]] for column in self.COLUMNS[1:]]
+        return f"{kind}~{'/'.join(part for part in parts if part is not None)}"
+
+    def column(self, column: str) -> list:
+        """Return the decoded values of a column, one per path."""
+        values = self.values[column]
+        return [values[code] for code in self.codes[column]]
+
+    def where(self, **values) -> list:
+        """
+        Return the indices of the paths having the given columns values, like entity_type='props'.
+        Values are compared on their codes, without decoding the columns.
+        """
+        indices = None
+        for column, value in values.items():
+            code = self._lookups[column].get(value)
+            if code is None:
+                return []
+            codes = self.codes[column]
+            candidates = range(len(codes)) if indices is None else indices
+            indices = [index for index in candidates if codes[index] == code]
+        return list(range(len(self))) if indices is None else indices
+
+
+def parse_many(params: Iterable[str]) -> VulcainPathColumns:
+    """Parse many entity strings into a columnar VulcainPathColumns."""
+    columns = VulcainPathColumns()
+    columns.extend(params)
+    return columns
+
+
+# Version selector of a query matching only the highest version of each task.
+LATEST = "latest"
+
+# Step whose versions a query selects by default. Work and publish versions are numbered apart.
+DEFAULT_STEP = "publish"
+
+# Path templates and inputs of the asset parts, from the entity type to the task.
+ASSET_TEMPLATES = ("entity_type_dir_path", "entity_name_dir_path", "task_dir_path")
+ASSET_INPUTS = ("entity_type", "entity_name", "task")
+
+
+class VulcainPathQuery():
+    """
+    Vulcain path with glob wildcards on its parts and an optional 'latest' version selector,
+    like 'asset~props/*/modeling/latest' or 'asset~chars/hero/*'.
+    Versions are selected in one step directory of the task, the publish one by default.
+
+    Queries are evaluated against an index instead of the filesystem. The index provides :
+        entities(template, **inputs) : yields the ParsedPath of a template matching the exact inputs.
+        tree_versions(path) : yields the versioned ParsedPath under an entity path.
+    EntityIndex is such an index. Only asset paths are supported.
+
+    Args :
+        pattern (str) : Query, like 'asset~props/*/modeling/latest'.
+        step (str) : Step directory the versions are selected in. None to select them in every step,
+            'latest' is then the highest version number of any step.
+    """
+
+    __slots__ = ("kind", "parts", "step")
+
+    def __init__(self, pattern: str, step: str = DEFAULT_STEP) -> None:
+        kind, separator, entity = pattern.partition("~")
+        if not separator:
+            raise ValueError(f"Vulcain path query : '{pattern}' has no '~' separator.")
+        if kind != VulcainEntity.ASSET.value:
+            raise ValueError(f"Vulcain path query : '{pattern}' is not supported, only assets can be queried.")
+
+        self.kind = kind
+        self.parts = tuple(entity.split("/"))
+        self.step = step
+        if not 1 <= len(self.parts) <= 4:
+            raise ValueError(f"Vulcain path query : '{pattern}' must have 1 to 4 parts.")
+        if LATEST in self.parts[:3]:
+            raise ValueError(f"Vulcain path query : '{pattern}', '{LATEST}' can only select a version.")
+
+    def __repr__(self) -> str:
+        return f"VulcainPathQuery('{self.kind}~{'/'.join(self.parts)}')"
+
+    def matches(self, path: VulcainPath) -> bool:
+        """Return True if the path matches the query. 'latest' matches any version."""
+        if path.kind != self.kind or len(path.parts) != len(self.parts):
+            return False
+        return all(pattern == LATEST or fnmatchcase(part, pattern) for part, pattern in zip(path.parts, self.parts))
+
+    def select(self, index) -> Iterator[VulcainPath]:
+        """
+        Yield the VulcainPath matching the query, as soon as they are found in the index.
+
+        Args :
+            index : Entities index, see the class documentation.
+        """
+        # Imported here, vulcain.filesystem loads the path templates and the whole config.
+        from vulcain.filesystem import format_version
+
+        depth = min(len(self.parts), len(ASSET_INPUTS))
+        input_names = ASSET_INPUTS[:depth]
+        patterns = self.parts[:depth]
+
+        # Exact parts narrow the index lookup, wildcard ones are matched afterward.
+        exact_inputs = {name: part for name, part in zip(input_names, patterns) if not is_glob(part)}
+
+        for parsed in index.entities(ASSET_TEMPLATES[depth - 1], **exact_inputs):
+            values = [parsed.inputs[name] for name in input_names]
+            if not all(fnmatchcase(value, pattern) for value, pattern in zip(values, patterns)):
+                continue
+
+            entity = "/".join(values)
+            if len(self.parts) == depth:
+                yield VulcainPath(f"{self.kind}~{entity}")
+                continue
+
+            versions = sorted({versioned.version for versioned in index.tree_versions(parsed.path)
+                               if self.step is None or versioned.inputs.get("step") == self.step})
+            selector = self.parts[depth]
+            if selector == LATEST:
+                versions = versions[-1:]
+
+            for version in versions:
+                version_name = format_version(version)
+                if selector == LATEST or fnmatchcase(version_name, selector):
+                    yield VulcainPath(f"{self.kind}~{entity}/{version_name}")
+
+
+def is_glob(part: str) -> bool:
+    return any(char in part for char in "*?[")
+
+
+def select(pattern: str, index, step: str = DEFAULT_STEP) -> Iterator[VulcainPath]:
+    """Yield the VulcainPath matching a query pattern, like 'asset~props/*/modeling/latest'."""
+    return VulcainPathQuery(pattern, step).select(index)
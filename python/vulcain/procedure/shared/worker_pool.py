@@ -0,0 +1,325 @@
+import multiprocessing
+import os
+import time
+import traceback
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Any, Callable, Iterable, List
+
+from vulcain.logger import Logger
+from vulcain.procedure.shared.batch import BatchResult, BatchReport, run_procedure
+from vulcain.procedure.shared.procedure import Procedure, ProcedureStatus
+from vulcain.procedure.shared.software import Software, DefaultSoftware
+
+logger = Logger(name="Worker Pool")
+
+# Seconds a worker has to answer a health check ping.
+HEALTH_CHECK_TIMEOUT = 10.0
+
+# Messages sent to the workers.
+PING = "ping"
+JOB = "job"
+STOP = "stop"
+
+
+class WorkerError(RuntimeError):
+    pass
+
+
+def _worker_main(connection, software_factory: Callable[[], Software]) -> None:
+    """
+    Loop of a worker process : start the software once, then run the jobs received on the connection.
+
+    Messages are (PING,), (JOB, procedure_factory, context, reset) or (STOP,).
+    Answers are ("pong", pid) and ("result", BatchResult).
+    """
+    software = software_factory()
+    try:
+        software.start()
+    except Exception:
+        connection.send(("error", traceback.format_exc()))
+        connection.close()
+        return
+    connection.send(("ready", os.getpid()))
+
+    try:
+        while True:
+            try:
+                message = connection.recv()
+            except (EOFError, OSError):
+                break
+
+            kind = message[0]
+            if kind == PING:
+                connection.send(("pong", os.getpid()))
+            elif kind == JOB:
+                _, procedure_factory, context, reset = message
+                result = run_procedure(procedure_factory, context, software, reset=reset)
+                try:
+                    connection.send(("result", result))
+                except Exception:
+                    # The return value can not be sent back, the status is still worth sending.
+                    result.error = f"Return value could not be sent back :\n{traceback.format_exc()}"
+                    result.return_value = None
+                    connection.send(("result", result))
+            elif kind == STOP:
+                break
+    finally:
+        try:
+            software.stop()
+        finally:
+            connection.close()
+
+
+class Worker():
+    """
+    Long lived process holding a started software. Built and driven by a WorkerPool.
+
+    Args :
+        software_factory (callable) : Build the software of the worker, like a Software subclass.
+        start_timeout (float) : Seconds the software has to start.
+    """
+
+    def __init__(self, software_factory: Callable[[], Software], start_timeout: float = None) -> None:
+        self.connection, child_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_worker_main, args=(child_connection, software_factory),
+                                               daemon=True)
+        self.jobs_done = 0
+        self.current_job = None
+        self.job_start = 0.0
+
+        self.process.start()
+        child_connection.close()
+
+        if not self.connection.poll(start_timeout):
+            self.kill()
+            raise WorkerError(f"Worker software did not start in {start_timeout}s.")
+        try:
+            kind, value = self.connection.recv()
+        except EOFError:
+            self.kill()
+            raise WorkerError("Worker died while starting its software.") from None
+        if kind != "ready":
+            self.kill()
+            raise WorkerError(f"Worker software failed to start :\n{value}")
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def busy(self) -> bool:
+        return self.current_job is not None
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def ping(self, timeout: float = HEALTH_CHECK_TIMEOUT) -> bool:
+        """Return True if the idle worker answers a ping before the timeout."""
+        if not self.is_alive():
+            return False
+        try:
+            self.connection.send((PING,))
+            if not self.connection.poll(timeout):
+                return False
+            return self.connection.recv()[0] == "pong"
+        except (EOFError, OSError):
+            return False
+
+    def submit(self, job, procedure_factory: Callable[[Any], Procedure], context, reset: bool) -> None:
+        self.connection.send((JOB, procedure_factory, context, reset))
+        self.current_job = job
+        self.job_start = time.perf_counter()
+
+    def receive(self) -> BatchResult:
+        """Return the result of the current job. Raise EOFError if the worker died."""
+        _, result = self.connection.recv()
+        self.current_job = None
+        self.jobs_done += 1
+        return result
+
+    def stop(self, timeout: float = 10.0) -> None:
+        try:
+            self.connection.send((STOP,))
+        except OSError:
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.kill()
+        self.connection.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class WorkerPool():
+    """
+    Pool of long lived worker processes, each holding a started software, running procedure jobs.
+
+    Successive jobs of a worker skip the software startup, the software is only reset between them.
+    Workers are recycled after max_jobs_per_worker jobs to get rid of the software memory leaks,
+    and replaced when they die or do not answer a health check.
+    Jobs are sent to the workers by pickling, procedure factories must be importable module level
+    classes or functions and contexts and return values picklable.
+
+    Using the DefaultSoftware, the default, the pool runs without any DCC.
+
+    Args :
+        software_factory (callable) : Build the software of a worker, like a Software subclass.
+        size (int) : Number of workers.
+        max_jobs_per_worker (int) : Jobs run by a worker before it is replaced. None to never recycle.
+        job_timeout (float) : Seconds a job can run before its worker is killed. None for no timeout.
+        start_timeout (float) : Seconds a worker software has to start. None for no timeout.
+    """
+
+    def __init__(self, software_factory: Callable[[], Software] = DefaultSoftware, size: int = None,
+                 max_jobs_per_worker: int = 100, job_timeout: float = None, start_timeout: float = None) -> None:
+        self.software_factory = software_factory
+        self.size = size or os.cpu_count() or 1
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.job_timeout = job_timeout
+        self.start_timeout = start_timeout
+        self.workers: List[Worker] = []
+        self.recycled_count = 0
+        self.replaced_count = 0
+
+    def __enter__(self) -> "WorkerPool":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _spawn(self) -> Worker:
+        worker = Worker(self.software_factory, self.start_timeout)
+        logger.debug(f"Worker started : '{worker.pid}'.")
+        return worker
+
+    def _replace(self, worker: Worker, recycle: bool = False) -> Worker:
+        if recycle:
+            worker.stop()
+            self.recycled_count += 1
+            logger.debug(f"Worker recycled after {worker.jobs_done} jobs : '{worker.pid}'.")
+        else:
+            worker.kill()
+            self.replaced_count += 1
+            logger.warning(f"Worker replaced : '{worker.pid}'.")
+
+        new_worker = self._spawn()
+        self.workers[self.workers.index(worker)] = new_worker
+        return new_worker
+
+    def start(self) -> None:
+        while len(self.workers) < self.size:
+            self.workers.append(self._spawn())
+
+    def close(self) -> None:
+        for worker in self.workers:
+            worker.stop()
+        self.workers = []
+
+    def health_check(self, timeout: float = HEALTH_CHECK_TIMEOUT) -> dict:
+        """
+        Ping every idle worker and replace the ones not answering.
+
+        Returns:
+            health (dict) : Health of every checked worker pid.
+        """
+        health = dict()
+        for worker in list(self.workers):
+            if worker.busy:
+                continue
+            healthy = worker.ping(timeout)
+            health[worker.pid] = healthy
+            if not healthy:
+                self._replace(worker)
+        return health
+
+    def launch(self, procedure_factory: Callable[[Any], Procedure], contexts: Iterable) -> BatchReport:
+        """
+        Run the procedure of every context on the workers.
+
+        A failing context, or a worker dying on it, does not stop the others, its failure is
+        recorded in its BatchResult. Results are in the order of the contexts.
+
+        Args :
+            procedure_factory (callable) : Build the procedure of a context, like a Procedure subclass.
+            contexts (iterable) : Contexts of the procedures.
+
+        Returns:
+            report (BatchReport) : Results of every context. Workers startups are not part of the durations.
+        """
+        self.start()
+        batch_start = time.perf_counter()
+
+        pending = deque(enumerate(contexts))
+        results = [None] * len(pending)
+
+        while pending or any(worker.busy for worker in self.workers):
+            for worker in list(self.workers):
+                if not pending:
+                    break
+                if worker.busy:
+                    continue
+                if not worker.is_alive():
+                    worker = self._replace(worker)
+                index, context = pending.popleft()
+                try:
+                    # The first job of a worker runs in a freshly started software.
+                    worker.submit((index, context), procedure_factory, context, reset=worker.jobs_done > 0)
+                except (EOFError, OSError):
+                    # The worker died since is_alive(), the job never reached it.
+                    pending.appendleft((index, context))
+                    self._replace(worker)
+
+            busy_workers = {worker.connection: worker for worker in self.workers if worker.busy}
+            if not busy_workers:
+                # Every submit failed, waiting on no connection would block forever.
+                continue
+            for connection in wait(list(busy_workers), timeout=self._wait_timeout(busy_workers.values())):
+                worker = busy_workers[connection]
+                index, context = worker.current_job
+                try:
+                    results[index] = worker.receive()
+                except (EOFError, OSError):
+                    results[index] = self._worker_failure(worker, context, "Worker died while running the job.")
+                    worker.current_job = None
+                    self._replace(worker)
+                    continue
+
+                if self.max_jobs_per_worker and worker.jobs_done >= self.max_jobs_per_worker:
+                    self._replace(worker, recycle=True)
+
+            self._kill_timed_out(busy_workers.values(), results)
+
+        report = BatchReport(results=results, duration=time.perf_counter() - batch_start)
+        logger.info(f"Pool batch of {len(results)} contexts done in {report.duration:.2f}s "
+                    f"on {self.size} workers, {len(report.failed)} failed.")
+        return report
+
+    def _wait_timeout(self, busy_workers) -> float:
+        if self.job_timeout is None:
+            return None
+        now = time.perf_counter()
+        remaining = [worker.job_start + self.job_timeout - now for worker in busy_workers]
+        return max(min(remaining, default=0.0), 0.0)
+
+    def _kill_timed_out(self, busy_workers, results: list) -> None:
+        if self.job_timeout is None:
+            return
+        now = time.perf_counter()
+        for worker in busy_workers:
+            if worker.busy and now - worker.job_start >= self.job_timeout:
+                index, context = worker.current_job
+                results[index] = self._worker_failure(worker, context,
+                                                      f"Job timed out after {self.job_timeout}s.")
+                worker.current_job = None
+                self._replace(worker)
+
+    @staticmethod
+    def _worker_failure(worker: Worker, context, error: str) -> BatchResult:
+        logger.error(f"{error} Worker : '{worker.pid}', context : '{context}'.")
+        return BatchResult(context, ProcedureStatus.EXECUTE_FAIL,
+                           duration=time.perf_counter() - worker.job_start, error=error)
@@ -0,0 +1,16 @@
+from .resolver import PathTemplateError, CompiledTemplate, PathTemplates, context_inputs, get_path_templates
+from .parser import ParsedPath, PathParser, parse_version
+
+__all__ = [
+    # resolver
+    "PathTemplateError",
+    "CompiledTemplate",
+    "PathTemplates",
+    "context_inputs",
+    "get_path_templates",
+
+    # parser
+    "ParsedPath",
+    "PathParser",
+    "parse_version"
+]
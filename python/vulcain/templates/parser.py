@@ -0,0 +1,155 @@
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterable
+
+from vulcain.context import VulcainContext
+from .resolver import CONTEXT_INPUTS, PathTemplates
+
+# Publish files are suffixed with their version : 'chair_modeling_v0003.ma'.
+VERSION_PATTERN = re.compile(r"_v(\d+)(?:\.[^._]*)*$")
+
+# Default regex of a template input : one path component.
+DEFAULT_INPUT_PATTERN = "[^/]+"
+
+
+def parse_version(file_name: str):
+    """Return the version number of a '_v0001' suffixed file name, or None."""
+    match = VERSION_PATTERN.search(file_name)
+    return int(match.group(1)) if match else None
+
+
+@dataclass
+class ParsedPath:
+    template: str
+    group: str
+    inputs: dict
+    file_name: str = ""
+    version: int = None
+    path: str = ""
+
+    def to_context(self) -> VulcainContext:
+        """Return the VulcainContext of the path. The template group gives the context section."""
+        values = {attribute: self.inputs[input_name]
+                  for input_name, attribute in CONTEXT_INPUTS.items() if input_name in self.inputs}
+        if self.version is not None:
+            values["version"] = self.version
+        return VulcainContext(section=self.group.lower(), **values)
+
+
+class PathParser():
+    """
+    Parse directories paths back to their template inputs with one regex match.
+
+    Every template is compiled to an anchored regex and all of them are joined in a
+    single alternation, the deepest templates first.
+
+    Args :
+        templates (PathTemplates) : Compiled templates.
+        names (list) : Templates to match, default to every template.
+        input_patterns (dict) : Regex by input name, default to one path component.
+                                Use '.+?' for an input that can contain '/', like an unfixed project_path.
+        fixed_inputs : Known inputs, like project_path or exec_env, matched literally.
+    """
+
+    def __init__(self, templates: PathTemplates, names: list = None, input_patterns: dict = None,
+                 **fixed_inputs) -> None:
+        self.templates = templates
+        self.fixed_inputs = {key: normalize_path(str(value)) for key, value in fixed_inputs.items()}
+        input_patterns = input_patterns or dict()
+
+        compiled = [templates[name] for name in (names or templates.names())]
+        compiled.sort(key=lambda template: len(template.parts), reverse=True)
+
+        self._groups = dict()
+        alternatives = []
+        for index, template in enumerate(compiled):
+            template_group = f"t{index}"
+            inputs_groups = []
+            seen = set()
+            body = []
+            for is_input, text in template.parts:
+                if not is_input:
+                    body.append(re.escape(text))
+                elif text in self.fixed_inputs:
+                    body.append(re.escape(self.fixed_inputs[text]))
+                elif text in seen:
+                    body.append(f"(?P={template_group}_{text})")
+                else:
+                    seen.add(text)
+                    inputs_groups.append((f"{template_group}_{text}", text))
+                    body.append(f"(?P<{template_group}_{text}>{input_patterns.get(text, DEFAULT_INPUT_PATTERN)})")
+
+            alternatives.append(f"(?P<{template_group}>{''.join(body)})")
+            self._groups[template_group] = (template, inputs_groups)
+
+        self._regex = re.compile("^(?:" + "|".join(alternatives) + ")$")
+
+    def parse(self, path: str):
+        """
+        Parse a directory path.
+
+        Returns:
+            parsed (ParsedPath) : None if the path matches no template.
+        """
+        path = normalize_path(path)
+        match = self._regex.match(path)
+        if not match:
+            return None
+
+        # The template group is the outermost one, so it is the last one closed.
+        template, inputs_groups = self._groups[match.lastgroup]
+        inputs = dict(self.fixed_inputs)
+        for group_name, input_name in inputs_groups:
+            inputs[input_name] = match.group(group_name)
+        return ParsedPath(template.name, template.group, inputs, path=path)
+
+    def parse_file(self, path: str):
+        """Parse a file path : its directory is parsed, the version comes from the file name."""
+        path = normalize_path(path)
+        directory, file_name = os.path.split(path)
+        parsed = self.parse(directory)
+        if parsed is None:
+            return None
+        parsed.path = path
+        parsed.file_name = file_name
+        parsed.version = parse_version(file_name)
+        return parsed
+
+    def parse_many(self, paths: Iterable[str], files: bool = True) -> list:
+        """
+        Parse many paths, like a whole directory listing. Each directory is matched only once.
+
+        Args :
+            paths (Iterable) : Paths to parse.
+            files (bool) : True if the paths are files, False if they are directories.
+
+        Returns:
+            parsed (list) : One ParsedPath, or None, by path.
+        """
+        if not files:
+            return [self.parse(path) for path in paths]
+
+        directories = dict()
+        results = []
+        for path in paths:
+            path = normalize_path(path)
+            directory, file_name = os.path.split(path)
+            if directory not in directories:
+                directories[directory] = self.parse(directory)
+
+            parsed_directory = directories[directory]
+            if parsed_directory is None:
+                results.append(None)
+                continue
+
+            results.append(ParsedPath(parsed_directory.template, parsed_directory.group,
+                                      dict(parsed_directory.inputs), file_name, parse_version(file_name), path))
+        return results
+
+
+def normalize_path(path: str) -> str:
+    path = path.replace("\\", "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+    return path
@@ -0,0 +1,230 @@
+import re
+from typing import Iterable, Mapping
+
+from vulcain.logger import Logger
+from vulcain.parametric import load_path_templates
+
+logger = Logger(name="Path Templates")
+
+# ${IN:name} is an input given at resolve time, ${name} a reference to another template.
+TOKEN_PATTERN = re.compile(r"\$\{(IN:)?([A-Za-z_][A-Za-z0-9_]*)\}")
+
+# Template input name -> VulcainContext attribute.
+# VulcainContext has no entity type field, it is carried by 'extra'.
+CONTEXT_INPUTS = {
+    "entity_type": "extra",
+    "episode": "episode",
+    "sequence": "sequence",
+    "shot": "shot",
+    "entity_name": "asset",
+    "task": "task",
+    "step": "step",
+    "version": "version",
+    "software": "software"
+}
+
+
+class PathTemplateError(ValueError):
+    pass
+
+
+class CompiledTemplate():
+    """
+    A template with every reference inlined, left with literal text and inputs only.
+
+    Args :
+        name (str) : Template name.
+        group (str) : path.json group of the template, like 'ASSETS'.
+        parts (tuple) : (is_input, text) parts. Text is the input name for inputs.
+    """
+
+    __slots__ = ("name", "group", "parts", "inputs", "_format")
+
+    def __init__(self, name: str, group: str, parts: tuple) -> None:
+        self.name = name
+        self.group = group
+        self.parts = parts
+        self.inputs = tuple(dict.fromkeys(text for is_input, text in parts if is_input))
+        self._format = "".join("{" + text + "}" if is_input else text.replace("{", "{{").replace("}", "}}")
+                               for is_input, text in parts)
+
+    def format(self, inputs: Mapping) -> str:
+        try:
+            return self._format.format_map(inputs)
+        except KeyError as err:
+            raise PathTemplateError(f"Missing input : '{err.args[0]}' to resolve template : '{self.name}'.") from None
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate({self.name!r}, {self._format!r})"
+
+
+class PathTemplates():
+    """
+    Every template of a path.json content, compiled once.
+
+    References between templates are resolved in topological order and inlined,
+    so resolving a template is a single str.format_map call.
+
+    Args :
+        templates (dict) : path.json content, groups of {template_name: template}.
+
+    Raises:
+        PathTemplateError : On duplicated template names, unknown references or reference cycles.
+    """
+
+    def __init__(self, templates: dict) -> None:
+        self.sources = dict()
+        self.groups = dict()
+        for group, group_templates in templates.items():
+            for name, template in group_templates.items():
+                if name in self.sources:
+                    raise PathTemplateError(f"Template : '{name}' is defined in '{self.groups[name]}' and '{group}'.")
+                self.sources[name] = template
+                self.groups[name] = group
+
+        self.order = self._sort()
+        self._compiled = dict()
+        for name in self.order:
+            self._compiled[name] = CompiledTemplate(name, self.groups[name], self._compile_parts(name))
+
+    @staticmethod
+    def references(template: str) -> list:
+        return [name for is_input, name in TOKEN_PATTERN.findall(template) if not is_input]
+
+    def _sort(self) -> list:
+        """Return the templates names, every template after the templates it references."""
+        order = []
+        visiting = []
+        done = set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                cycle = " -> ".join(visiting[visiting.index(name):] + [name])
+                raise PathTemplateError(f"Templates reference cycle : {cycle}.")
+
+            visiting.append(name)
+            for reference in self.references(self.sources[name]):
+                if reference not in self.sources:
+                    raise PathTemplateError(f"Template : '{name}' references unknown template : '{reference}'.")
+                visit(reference)
+            visiting.pop()
+
+            done.add(name)
+            order.append(name)
+
+        for name in self.sources:
+            visit(name)
+        return order
+
+    def _compile_parts(self, name: str) -> tuple:
+        template = self.sources[name]
+        parts = []
+        position = 0
+        for match in TOKEN_PATTERN.finditer(template):
+            if match.start() > position:
+                parts.append((False, template[position:match.start()]))
+            if match.group(1):
+                parts.append((True, match.group(2)))
+            else:
+                parts.extend(self._compiled[match.group(2)].parts)
+            position = match.end()
+        if position < len(template):
+            parts.append((False, template[position:]))
+
+        # Merge consecutive literal parts.
+        merged = []
+        for is_input, text in parts:
+            if merged and not is_input and not merged[-1][0]:
+                merged[-1] = (False, merged[-1][1] + text)
+            else:
+                merged.append((is_input, text))
+        return tuple(merged)
+
+    def __getitem__(self, name: str) -> CompiledTemplate:
+        try:
+            return self._compiled[name]
+        except KeyError:
+            raise PathTemplateError(f"Template : '{name}' does not exists.") from None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._compiled
+
+    def __iter__(self):
+        return iter(self._compiled.values())
+
+    def names(self) -> list:
+        return list(self.order)
+
+    def resolve(self, name: str, inputs: Mapping = None, **kwargs) -> str:
+        """
+        Resolve one template.
+
+        Args :
+            name (str) : Template name, like 'task_dir_path'.
+            inputs (Mapping) : Template inputs, like {'project_path': ..., 'entity_name': ...}.
+            kwargs : Extra inputs, override 'inputs'.
+
+        Returns:
+            path (str) : Resolved path.
+        """
+        if kwargs:
+            inputs = {**(inputs or {}), **kwargs}
+        return self[name].format(inputs or {})
+
+    def resolve_many(self, name: str, contexts: Iterable, **inputs) -> list:
+        """
+        Resolve one template for many contexts, one path per context.
+
+        Args :
+            name (str) : Template name, like 'task_dir_path'.
+            contexts (Iterable) : Inputs mappings or VulcainContext.
+            inputs : Inputs shared by every context, like project_path.
+
+        Raises:
+            PathTemplateError : If a context misses one of the template inputs.
+        """
+        format_map = self[name]._format.format_map
+        rows = (context if isinstance(context, Mapping) and not inputs
+                else {**inputs, **context} if isinstance(context, Mapping)
+                else context_inputs(context, **inputs)
+                for context in contexts)
+        try:
+            return [format_map(row) for row in rows]
+        except KeyError as err:
+            raise PathTemplateError(f"Missing input : '{err.args[0]}' to resolve template : '{name}'.") from None
+
+    def resolve_all(self, inputs: Mapping) -> dict:
+        """Resolve every template whose inputs are all given, by template name."""
+        return {template.name: template._format.format_map(inputs) for template in self
+                if all(input_name in inputs for input_name in template.inputs)}
+
+
+def context_inputs(context, **inputs) -> dict:
+    """
+    Return the template inputs of a VulcainContext. Empty context fields are skipped.
+
+    Args :
+        context (VulcainContext) : Context to read.
+        inputs : Inputs that are not part of the context, like project_path or entity_type.
+    """
+    values = dict()
+    for input_name, attribute in CONTEXT_INPUTS.items():
+        value = getattr(context, attribute, None)
+        if value not in (None, ""):
+            values[input_name] = value
+    values.update(inputs)
+    return values
+
+
+_path_templates = None
+
+
+def get_path_templates() -> PathTemplates:
+    """Return the studio and project path templates, compiled once per process."""
+    global _path_templates
+    if _path_templates is None:
+        _path_templates = PathTemplates(load_path_templates())
+        logger.debug(f"Compiled {len(_path_templates.order)} path templates.")
+    return _path_templates
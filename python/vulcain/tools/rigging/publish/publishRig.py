@@ -15,11 +15,16 @@ def pRig() :
 	cmds.file(save=True)
 
 	#Publish Script
-	newPath, path = publish.publish(ext, pubFolder)
+	newPath, path, reservation = publish.publish(ext, pubFolder)
 
 	#Save as to publish
-	cmds.file(rename=newPath)
-	cmds.file(type='mayaBinary', save=True)
+	try:
+		cmds.file(rename=newPath)
+		cmds.file(type='mayaBinary', save=True)
+	except Exception:
+		reservation.release()
+		raise
+	reservation.commit()
 	cmds.select(clear=True)
 
 	#import reference